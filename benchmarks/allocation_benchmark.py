@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Benchmark per-request memory allocation of the analysis pipeline.
+
+Runs ``MCPOrchestrator.analyze_conversation`` on example conversations with
+the NIM call replaced by an offline stub, and reports per request the peak
+traced memory, the memory still held by the response and workflow state
+afterwards, and the wall time. Two scenarios are measured: the NIM
+fallback (rule-based patterns are reported) and a NIM answer with red
+flags (AI patterns are reported, rule-based ones only as details).
+With ``--baseline REF`` the same measurement also runs on a temporary git
+worktree of REF, so before and after can be compared side by side.
+
+Usage:
+    python benchmarks/allocation_benchmark.py [--requests 200] [--baseline HEAD~1]
+"""
+
+import argparse
+import glob
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+AI_RED_FLAGS = [{
+    "type": "gaslighting",
+    "severity": "high",
+    "description": "Denies the other person's memory of events",
+    "evidence": "that never happened"
+}]
+
+
+def measure(root, requests):
+    """Measure the pipeline of the source tree at ``root`` for each scenario."""
+    sys.path.insert(0, root)
+    os.chdir(root)
+    import logging
+    logging.disable(logging.CRITICAL)
+    
+    from silent_signal.backend.core.mcp_orchestrator import MCPOrchestrator
+    
+    orchestrator = MCPOrchestrator("silent_signal/data/pattern_knowledge.json")
+    nimo_client = orchestrator.nimo_client
+    
+    def fallback(context):
+        return nimo_client._get_fallback_response("benchmark")
+    
+    def red_flags(context):
+        response = nimo_client._get_fallback_response("benchmark")
+        response.update(risk_level="concerning", confidence=0.8, red_flags=AI_RED_FLAGS)
+        return response
+    
+    conversations = []
+    for path in sorted(glob.glob("silent_signal/data/examples/*.txt")):
+        with open(path, 'r', encoding='utf-8') as f:
+            text = f.read()
+        conversations.append((text * (9000 // max(len(text), 1) + 1))[:9000])
+    
+    results = {}
+    for scenario, stub in (("rules", fallback), ("ai", red_flags)):
+        nimo_client.analyze_conversation = stub
+        for conversation in conversations:
+            orchestrator.analyze_conversation(conversation)
+        
+        peak = retained = 0
+        tracemalloc.start()
+        for i in range(requests):
+            if hasattr(orchestrator, "_reset_workflow_steps"):
+                # Trees with shared workflow steps hold the last request's results
+                orchestrator._reset_workflow_steps()
+            before, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            response = orchestrator.analyze_conversation(conversations[i % len(conversations)])
+            current, request_peak = tracemalloc.get_traced_memory()
+            peak += request_peak - before
+            retained += current - before
+            del response
+        tracemalloc.stop()
+        
+        # Time without tracing overhead
+        start = time.perf_counter()
+        for i in range(requests):
+            orchestrator.analyze_conversation(conversations[i % len(conversations)])
+        elapsed = time.perf_counter() - start
+        
+        results[scenario] = {
+            "peak_kib": peak / requests / 1024,
+            "retained_kib": retained / requests / 1024,
+            "ms": elapsed / requests * 1000
+        }
+    return results
+
+
+def measure_baseline(ref, requests):
+    """Run the measurement on a temporary worktree of ``ref``."""
+    with tempfile.TemporaryDirectory() as directory:
+        worktree = os.path.join(directory, "tree")
+        subprocess.run(["git", "-C", ROOT, "worktree", "add", "--detach", worktree, ref],
+                       check=True, capture_output=True)
+        try:
+            output = subprocess.run(
+                [sys.executable, os.path.abspath(__file__), "--root", worktree,
+                 "--requests", str(requests), "--json"],
+                check=True, capture_output=True, text=True
+            ).stdout
+            return json.loads(output.strip().splitlines()[-1])
+        finally:
+            subprocess.run(["git", "-C", ROOT, "worktree", "remove", "--force", worktree],
+                           check=True, capture_output=True)
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--baseline", help="git ref to compare against")
+    parser.add_argument("--root", default=ROOT, help=argparse.SUPPRESS)
+    parser.add_argument("--json", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    
+    if args.json:
+        print(json.dumps(measure(args.root, args.requests)))
+        return 0
+    
+    results = {}
+    if args.baseline:
+        results[args.baseline] = measure_baseline(args.baseline, args.requests)
+    results["working tree"] = measure(args.root, args.requests)
+    
+    print(f"🧪 Allocation per request ({args.requests} requests of ~9k characters)")
+    print("=" * 72)
+    print(f"{'tree':<16}{'scenario':<10}{'peak KiB':>12}{'retained KiB':>16}{'ms':>10}")
+    for name, scenarios in results.items():
+        for scenario, result in scenarios.items():
+            print(f"{name:<16}{scenario:<10}{result['peak_kib']:>12.1f}"
+                  f"{result['retained_kib']:>16.1f}{result['ms']:>10.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Measure how many analyses one event loop keeps in flight.
+
+Starts a local HTTP server that answers NIM chat completions after
+``--latency`` milliseconds, points the NIM client at it (direct HTTP path)
+and runs batches of concurrent analyses on a single event loop, the way
+the API's ``async def`` handlers do: once through
+``analyze_conversation_async`` and once through the blocking
+``analyze_conversation`` called from the loop. Reports throughput, the
+most analyses the server saw in flight at once, and how late a 10 ms
+heartbeat on the loop ran (the stall other clients would see).
+
+Usage:
+    python benchmarks/async_benchmark.py [--concurrency 1,10,100,500] [--latency 200]
+"""
+
+import argparse
+import asyncio
+import glob
+import json
+import os
+import sys
+import threading
+import time
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import logging
+logging.disable(logging.CRITICAL)
+
+from silent_signal.config.settings import settings
+from silent_signal.backend.core.mcp_orchestrator import MCPOrchestrator
+
+DATA_DIR = "silent_signal/data"
+
+NIM_ANSWER = {
+    "risk_level": "concerning",
+    "confidence": 0.8,
+    "red_flags": [],
+    "reasoning": "benchmark"
+}
+
+
+class FakeNim:
+    """Keep-alive HTTP server answering chat completions after a delay."""
+    
+    def __init__(self, latency):
+        self.latency = latency
+        self.in_flight = 0
+        self.peak = 0
+        self.port = None
+        self._ready = threading.Event()
+        threading.Thread(target=asyncio.run, args=(self._serve(),), daemon=True).start()
+        self._ready.wait()
+    
+    async def _serve(self):
+        server = await asyncio.start_server(self._connection, "127.0.0.1", 0, backlog=1024)
+        self.port = server.sockets[0].getsockname()[1]
+        self._ready.set()
+        await server.serve_forever()
+    
+    async def _connection(self, reader, writer):
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                length = 0
+                for line in head.decode("latin-1").split("\r\n"):
+                    if line.lower().startswith("content-length:"):
+                        length = int(line.split(":", 1)[1])
+                await reader.readexactly(length)
+                
+                self.in_flight += 1
+                self.peak = max(self.peak, self.in_flight)
+                await asyncio.sleep(self.latency)
+                self.in_flight -= 1
+                
+                body = json.dumps({
+                    "model": "benchmark",
+                    "choices": [{"message": {"role": "assistant", "content": json.dumps(NIM_ANSWER)}}]
+                }).encode()
+                writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+                             b"Content-Length: " + str(len(body)).encode() + b"\r\n\r\n" + body)
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+    
+    def reset(self):
+        self.peak = 0
+
+
+async def heartbeat(lags, stop):
+    """Record how late a 10 ms sleep on the loop wakes up."""
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(0.01)
+        lags.append(time.perf_counter() - start - 0.01)
+
+
+async def run(orchestrator, conversations, use_async):
+    """Analyze the conversations concurrently; returns (seconds, worst loop lag, failures)."""
+    async def analyze(conversation):
+        if use_async:
+            return await orchestrator.analyze_conversation_async(conversation)
+        return orchestrator.analyze_conversation(conversation)
+    
+    lags = []
+    stop = asyncio.Event()
+    beat = asyncio.create_task(heartbeat(lags, stop))
+    start = time.perf_counter()
+    responses = await asyncio.gather(*(analyze(conversation) for conversation in conversations))
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await beat
+    
+    failures = sum(response.analysis_details.get("fusion_details", {}).get("final_risk_level") is None
+                   or response.analysis_details["workflow_steps"][3]["status"] != "completed"
+                   or response.risk_level.value == "safe"
+                   for response in responses)
+    return elapsed, max(lags, default=0.0), failures
+
+
+async def serve(orchestrator, server, examples, args):
+    """Run every batch on one event loop, like a server worker; returns failures."""
+    # Warm up the clients and the executor, as a running server would be
+    await orchestrator.analyze_conversation_async(examples[0])
+    
+    failures = 0
+    for concurrency in (int(count) for count in args.concurrency.split(",")):
+        conversations = [examples[i % len(examples)] for i in range(concurrency)]
+        for name, use_async in (("async", True), ("blocking", False)):
+            if not use_async and concurrency > args.blocking_max:
+                continue
+            server.reset()
+            elapsed, lag, errors = await run(orchestrator, conversations, use_async)
+            failures += errors
+            print(f"{name:<10}{concurrency:>11}{concurrency / elapsed:>10,.1f}{server.peak:>16}"
+                  f"{lag * 1000:>12,.0f} ms{errors:>8}")
+    
+    await orchestrator.nimo_client.aclose()
+    return failures
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--concurrency", default="1,10,100,500")
+    parser.add_argument("--latency", type=float, default=200.0, help="simulated NIM milliseconds")
+    parser.add_argument("--blocking-max", type=int, default=100,
+                        help="largest batch also run through the blocking call")
+    args = parser.parse_args()
+    
+    server = FakeNim(args.latency / 1000.0)
+    settings.nim_base_url = f"http://127.0.0.1:{server.port}"
+    settings.nim_api_key = "benchmark"
+    settings.nim_use_openai_sdk = False
+    orchestrator = MCPOrchestrator(os.path.join(DATA_DIR, "pattern_knowledge.json"))
+    
+    examples = []
+    for path in sorted(glob.glob(os.path.join(DATA_DIR, "examples", "*.txt"))):
+        with open(path, 'r', encoding='utf-8') as f:
+            examples.append(f.read().strip())
+    
+    print(f"🧪 Concurrent analyses on one event loop: NIM server {args.latency:.0f} ms, "
+          f"{settings.nim_max_connections} client connections")
+    print("=" * 72)
+    print(f"{'pipeline':<10}{'concurrent':>11}{'req/s':>10}{'peak in flight':>16}{'max loop lag':>15}{'errors':>8}")
+    failures = asyncio.run(serve(orchestrator, server, examples, args))
+    
+    print("=" * 72)
+    print("✅ Every analysis reached the NIM server" if not failures else f"❌ {failures} failed analyses")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    exit(main())
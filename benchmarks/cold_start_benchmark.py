@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Benchmark time to first request with and without the compiled engine cache.
+
+Each measurement runs in a fresh interpreter, like a cold-started host:
+it imports the detector, builds it the way the API does and analyzes one
+message, and reports the wall time from interpreter start to that first
+result. Per matcher, three starts are measured: with the cache disabled,
+with an empty cache (compile and store) and with a warm cache (load).
+The mapped matcher's automaton file serves as its cache either way, so
+its "no cache" start builds the file just like a cache miss.
+``--extra-phrases N`` adds N synthetic phrases to a copy of the knowledge
+file, to see how startup scales with the size of the pattern pack.
+
+Usage:
+    python benchmarks/cold_start_benchmark.py [--extra-phrases 0] [--runs 3]
+"""
+
+import argparse
+import json
+import os
+import random
+import shutil
+import string
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+KNOWLEDGE_PATH = os.path.join(ROOT, "silent_signal/data/pattern_knowledge.json")
+
+# Runs in the fresh interpreter; prints seconds since it started
+FIRST_REQUEST = """
+import sys, time
+started = time.perf_counter()
+sys.path.insert(0, sys.argv[1])
+import logging
+logging.disable(logging.CRITICAL)
+from silent_signal.backend.core.pattern_detector import PatternDetector
+detector = PatternDetector(sys.argv[2], matcher=sys.argv[3], cache=sys.argv[4] == "1",
+                           cache_dir=sys.argv[5], automaton_dir=sys.argv[5])
+detector.analyze_text("you never listen, that never happened")
+print(time.perf_counter() - started)
+"""
+
+
+def write_knowledge(path, extra_phrases, seed):
+    """Copy the knowledge file with synthetic phrases added to its categories."""
+    with open(KNOWLEDGE_PATH, encoding="utf-8") as f:
+        knowledge = json.load(f)
+    
+    rng = random.Random(seed)
+    words = ["".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randrange(3, 9)))
+             for _ in range(max(extra_phrases // 3, 1))]
+    categories = [name for name, config in knowledge.items() if "patterns" in config]
+    for i in range(extra_phrases):
+        phrase = " ".join(rng.choice(words) for _ in range(rng.randrange(2, 5)))
+        knowledge[categories[i % len(categories)]]["patterns"].append(phrase)
+    
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(knowledge, f)
+
+
+def first_request(knowledge_path, matcher, cache, cache_dir):
+    """Seconds from interpreter start to the first analysis result."""
+    output = subprocess.run(
+        [sys.executable, "-c", FIRST_REQUEST, ROOT, knowledge_path, matcher,
+         "1" if cache else "0", cache_dir],
+        check=True, capture_output=True, text=True
+    ).stdout
+    return float(output)
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--extra-phrases", type=int, default=0)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--matchers", default="regex,token,mapped")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    
+    workdir = tempfile.mkdtemp(prefix="cold_start_")
+    try:
+        knowledge_path = os.path.join(workdir, "pattern_knowledge.json")
+        write_knowledge(knowledge_path, args.extra_phrases, args.seed)
+        print(f"Knowledge file: {os.path.getsize(knowledge_path) / 1e6:.2f} MB "
+              f"({args.extra_phrases} extra phrases), best of {args.runs} runs")
+        print(f"{'matcher':<8} {'no cache':>10} {'cache miss':>11} {'cache hit':>10}")
+        
+        for matcher in args.matchers.split(","):
+            timings = {"off": [], "miss": [], "hit": []}
+            for _ in range(args.runs):
+                cache_dir = tempfile.mkdtemp(dir=workdir)
+                timings["off"].append(first_request(knowledge_path, matcher, False, cache_dir))
+                shutil.rmtree(cache_dir)
+                cache_dir = tempfile.mkdtemp(dir=workdir)
+                timings["miss"].append(first_request(knowledge_path, matcher, True, cache_dir))
+                timings["hit"].append(first_request(knowledge_path, matcher, True, cache_dir))
+            print(f"{matcher:<8} {min(timings['off']):>9.3f}s {min(timings['miss']):>10.3f}s "
+                  f"{min(timings['hit']):>9.3f}s")
+    finally:
+        shutil.rmtree(workdir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Stress the analysis pipeline from many threads and check request isolation.
+
+Runs ``MCPOrchestrator.analyze_conversation`` from a thread pool of each
+given size, with the NIM call replaced by an offline stub that waits
+``--latency`` milliseconds, like a network round trip, and answers with a
+red flag quoting a marker unique to the request. Every response is then
+checked against its own request: its AI pattern must quote its own
+marker, and every step before the report must have completed once,
+within the request's own start and end and after the steps it depends on,
+with the NIM step lasting at least the stub's latency. Aggregate metrics
+must add up to the requests sent. Reports
+throughput per thread count and the number of isolation violations.
+
+Usage:
+    python benchmarks/concurrency_benchmark.py [--requests 400] [--threads 1,2,4,8,16] [--latency 20]
+"""
+
+import argparse
+import glob
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import logging
+logging.disable(logging.CRITICAL)
+
+from silent_signal.backend.core.mcp_orchestrator import MCPOrchestrator
+
+DATA_DIR = "silent_signal/data"
+
+
+def stub_nim(nimo_client, latency):
+    """Replace the NIM call by a delayed answer quoting the request's marker."""
+    def analyze_conversation(context):
+        conversation = context["conversation"]
+        marker = conversation[conversation.index("case-"):].split()[0]
+        time.sleep(latency)
+        response = nimo_client._get_fallback_response("benchmark")
+        response.update(risk_level="concerning", confidence=0.8, red_flags=[{
+            "type": "gaslighting",
+            "severity": "high",
+            "description": "Denies the other person's memory of events",
+            "evidence": marker
+        }])
+        return response
+    nimo_client.analyze_conversation = analyze_conversation
+
+
+def violations(request, response, started, finished, latency, dependencies):
+    """Ways a response shows state of another request."""
+    found = []
+    marker = request[request.index("case-"):].split()[0]
+    evidence = {pattern.evidence for pattern in response.patterns_detected}
+    if evidence != {marker}:
+        found.append(f"{marker} reported evidence {sorted(evidence)}")
+    
+    # Steps before the report ran once each, within the request and after
+    # the steps they depend on
+    steps = {step["name"]: step for step in response.analysis_details["workflow_steps"][:-1]}
+    for step in steps.values():
+        ready = max([steps[name]["end_time"] or finished for name in dependencies[step["name"]]], default=started)
+        if step["status"] != "completed" or step["start_time"] is None or step["end_time"] is None:
+            found.append(f"{marker} step {step['name']} reported as {step['status']}")
+        elif not started <= ready <= step["start_time"] <= step["end_time"] <= finished:
+            found.append(f"{marker} step {step['name']} timed outside its turn")
+        elif step["name"] == "nemotron_analysis" and step["end_time"] - step["start_time"] < latency:
+            found.append(f"{marker} step nemotron_analysis shorter than the NIM call")
+    return found
+
+
+def run(orchestrator, conversations, threads, latency):
+    """Analyze every conversation from a pool of threads; returns (seconds, violations)."""
+    def analyze(conversation):
+        started = time.time()
+        response = orchestrator.analyze_conversation(conversation)
+        return violations(conversation, response, started, time.time(), latency,
+                          orchestrator.workflow.dependencies)
+    
+    start = time.perf_counter()
+    with ThreadPoolExecutor(threads) as pool:
+        found = [problem for problems in pool.map(analyze, conversations) for problem in problems]
+    return time.perf_counter() - start, found
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--threads", default="1,2,4,8,16")
+    parser.add_argument("--latency", type=float, default=20.0, help="simulated NIM milliseconds")
+    args = parser.parse_args()
+    
+    orchestrator = MCPOrchestrator(os.path.join(DATA_DIR, "pattern_knowledge.json"))
+    stub_nim(orchestrator.nimo_client, args.latency / 1000.0)
+    
+    examples = []
+    for path in sorted(glob.glob(os.path.join(DATA_DIR, "examples", "*.txt"))):
+        with open(path, 'r', encoding='utf-8') as f:
+            examples.append(f.read().strip())
+    conversations = [
+        f"{examples[i % len(examples)]}\nSam: see you later case-{i}"
+        for i in range(args.requests)
+    ]
+    
+    print(f"🧪 Concurrent analyses: {args.requests} requests per run, NIM stub {args.latency:.0f} ms")
+    print("=" * 60)
+    print(f"{'threads':>8}{'req/s':>12}{'speedup':>10}{'violations':>14}")
+    failures = 0
+    single = None
+    for threads in (int(count) for count in args.threads.split(",")):
+        elapsed, found = run(orchestrator, conversations, threads, args.latency / 1000.0)
+        rate = len(conversations) / elapsed
+        single = single or rate
+        failures += len(found)
+        print(f"{threads:>8}{rate:>12,.1f}{rate / single:>9.1f}x{len(found):>14}")
+        for problem in found[:3]:
+            print(f"  ✗ {problem}")
+    
+    metrics = orchestrator.get_workflow_status()["metrics"]
+    runs = len(args.threads.split(",")) * len(conversations)
+    if metrics["total_analyses"] != runs or metrics["successful_analyses"] != runs:
+        failures += 1
+        print(f"  ✗ metrics count {metrics['total_analyses']} analyses, expected {runs}")
+    
+    print("=" * 60)
+    print("✅ Every response is isolated" if not failures else f"❌ {failures} violations")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,313 @@
+#!/usr/bin/env python3
+"""
+Check pattern detector engines against the original re.search loop.
+
+Generates conversations from the example conversations and the indicator
+lists, mutated with case, punctuation, quote and slang changes, and runs
+the unmodified per-pattern ``re.search`` loop of the original
+``analyze_text`` side by side with each engine. Every indicator one of
+them matches and the other does not must be explained by one of
+``ALLOWED_DIFFERENCES`` for that engine (whole-word matching, punctuation
+between words, dropped apostrophes, normalization); severities,
+confidences and scores must follow from the engine's hits exactly as the
+loop computes them. Anything else is printed and makes the script exit
+with status 1.
+
+Throughput is reported in messages per second for the loop and each
+engine, along with how many conversations each engine rates differently
+from the loop and how many differing hits each allowed reason explains.
+
+Usage:
+    python benchmarks/differential_benchmark.py [--conversations 2000] [--seed 7]
+"""
+
+import argparse
+import glob
+import os
+import random
+import re
+import shutil
+import sys
+import tempfile
+import time
+from collections import Counter
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from silent_signal.backend.core.pattern_detector import PatternDetector
+from silent_signal.backend.core.pattern_engine import indicator_key, is_literal
+from silent_signal.backend.core.text_normalizer import DEFAULT_SLANG
+from silent_signal.backend.core.token_engine import APOSTROPHE_SLANG, tokenize
+
+DATA_DIR = "silent_signal/data"
+
+SPEAKERS = ["Alex", "Sam", "Jordan", "Taylor"]
+
+# Slang spellings of words, the reverse of the normalizer's expansions
+SLANG = {}
+for _short, _word in DEFAULT_SLANG.items():
+    SLANG.setdefault(_word, []).append(_short)
+
+TRAILING_PUNCTUATION = ["", ".", "!", "!!!", "?", "?!", "...", " :(", " lol"]
+
+
+# Differences from the loop an engine is allowed, and the engines allowed them
+ALLOWED_DIFFERENCES = {
+    "whole words": "phrase found by the loop only inside longer words (token, mapped)",
+    "punctuation": "phrase with punctuation or extra spaces between its words (token, mapped)",
+    "dropped apostrophe": "contraction in a chat spelling without its apostrophe (token, mapped)",
+    "normalization": "hit gained or lost by folding quotes, elongation or slang (normalizer on)"
+}
+
+
+def words_of(text, chat_spellings=False):
+    """Whole-word view of a text: its tokens, space-delimited, chat spellings optionally expanded."""
+    tokens = tokenize(text)
+    if chat_spellings:
+        tokens = [APOSTROPHE_SLANG.get(token, token) for token in tokens]
+    return " " + " ".join(tokens) + " "
+
+
+def legacy_analyze(patterns, severity_weights, text):
+    """
+    The original ``analyze_text``: one ``re.search`` per indicator.
+    
+    Args:
+        patterns: Pattern configuration keyed by category name
+        severity_weights: Score weight per severity
+        text: Text to analyze
+    
+    Returns:
+        Tuple of ({category: (severity, confidence, matched indicators)}, total_score)
+    """
+    text_lower = text.lower()
+    detected = {}
+    total_score = 0.0
+    for pattern_name, pattern_config in patterns.items():
+        category_patterns = pattern_config.get("patterns", [])
+        severity = pattern_config.get("severity", "medium")
+        
+        matches = []
+        for pattern in category_patterns:
+            if re.search(pattern, text_lower, re.IGNORECASE):
+                matches.append(pattern)
+        
+        if matches:
+            confidence = min(len(matches) / len(category_patterns), 1.0)
+            total_score += len(matches) * severity_weights.get(severity, 4) * confidence
+            detected[pattern_name] = (severity, confidence, {indicator_key(match) for match in matches})
+    return detected, total_score
+
+
+def engine_analyze(detector, text):
+    """``analyze_text`` of a detector, in the shape ``legacy_analyze`` returns."""
+    patterns, score = detector.analyze_text(text)
+    return {
+        pattern.name: (pattern.severity, pattern.confidence, {span.indicator for span in pattern.spans})
+        for pattern in patterns
+    }, score
+
+
+def explain(pattern, engine_hit, text_lower, normalized, matcher):
+    """
+    Allowed reason an engine and the loop disagree on one indicator.
+    
+    Args:
+        pattern: Indicator as written in the knowledge file
+        engine_hit: Whether the engine matched it (the loop did not, or vice versa)
+        text_lower: Lowercased text
+        normalized: The text the normalizer produced, None with normalization off
+        matcher: Matcher name of the engine
+    
+    Returns:
+        Key of ``ALLOWED_DIFFERENCES``, or None if the difference is not allowed
+    """
+    whole_words = matcher != "regex" and is_literal(pattern)
+    
+    def found(text):
+        if whole_words:
+            return words_of(pattern.lower()) in words_of(text)
+        return re.search(pattern, text, re.IGNORECASE) is not None
+    
+    view = text_lower if normalized is None else normalized
+    if normalized is not None and found(normalized) == engine_hit != found(text_lower):
+        return "normalization"
+    if whole_words and not engine_hit and not found(view):
+        return "whole words"
+    if whole_words and engine_hit and found(view):
+        return "punctuation"
+    if whole_words and engine_hit and "'" in pattern \
+            and words_of(pattern.lower()) in words_of(view, chat_spellings=True):
+        return "dropped apostrophe"
+    return None
+
+
+def check(result, original, patterns, severity_weights, text_lower, normalized, matcher):
+    """
+    Differences between an engine's result and the loop's that no rule allows.
+    
+    Args:
+        result: The engine's result, as ``engine_analyze`` returns it
+        original: The loop's result for the same text
+        patterns: Pattern configuration keyed by category name
+        severity_weights: Score weight per severity
+        text_lower: Lowercased text
+        normalized: The text the normalizer produced, None with normalization off
+        matcher: Matcher name of the engine
+    
+    Returns:
+        Tuple of (allowed reason per differing hit, unexplained differences)
+    """
+    (detected, score), (expected, _) = result, original
+    reasons = []
+    unexplained = []
+    total_score = 0.0
+    for name, config in patterns.items():
+        engine_hits = detected[name][2] if name in detected else set()
+        loop_hits = expected[name][2] if name in expected else set()
+        for key in engine_hits ^ loop_hits:
+            pattern = next((p for p in config["patterns"] if indicator_key(p) == key), key)
+            reason = explain(pattern, key in engine_hits, text_lower, normalized, matcher)
+            if reason is None:
+                unexplained.append(f"{name}: {pattern!r} {'only' if key in engine_hits else 'not'} matched by the engine")
+            else:
+                reasons.append(reason)
+        
+        # Scoring is the loop's, over the engine's hits
+        if engine_hits:
+            severity = config.get("severity", "medium")
+            confidence = min(len(engine_hits) / len(config["patterns"]), 1.0)
+            total_score += len(engine_hits) * severity_weights.get(severity, 4) * confidence
+            if detected[name][0] != severity or abs(detected[name][1] - confidence) > 1e-12:
+                unexplained.append(f"{name}: rated {detected[name][:2]}, expected {(severity, confidence)}")
+    if abs(score - total_score) > 1e-9:
+        unexplained.append(f"score {score}, expected {total_score}")
+    return reasons, unexplained
+
+
+def mutate(sentence, rng):
+    """Apply random case, slang, quote and punctuation changes to a sentence."""
+    words = sentence.split()
+    for i, word in enumerate(words):
+        bare = word.lower().strip(".,!?")
+        if bare in SLANG and rng.random() < 0.3:
+            words[i] = rng.choice(SLANG[bare])
+        elif len(bare) > 3 and bare[-1].isalpha() and rng.random() < 0.05:
+            words[i] = word + word[-1] * rng.randint(2, 4)    # "neverrr"
+        elif rng.random() < 0.05:
+            words[i] = word + rng.choice([",", ";", " -", "..."])
+    sentence = " ".join(words)
+    
+    case = rng.random()
+    if case < 0.15:
+        sentence = sentence.upper()
+    elif case < 0.3:
+        sentence = sentence.title()
+    elif case < 0.4:
+        sentence = "".join(ch.upper() if rng.random() < 0.5 else ch for ch in sentence)
+    if rng.random() < 0.2:
+        sentence = sentence.replace("'", "’")
+    return sentence.rstrip(".!?") + rng.choice(TRAILING_PUNCTUATION)
+
+
+def generate_conversations(patterns, count, seed):
+    """Build speaker-labelled conversations of example sentences and indicators."""
+    rng = random.Random(seed)
+    
+    sentences = []
+    for path in sorted(glob.glob(os.path.join(DATA_DIR, "examples", "*.txt"))):
+        with open(path, 'r', encoding='utf-8') as f:
+            sentences.extend(s for s in re.split(r"(?<=[.!?])\s+", f.read().strip()) if s)
+    indicators = [
+        pattern for config in patterns.values() for pattern in config.get("patterns", [])
+        if is_literal(pattern)
+    ]
+    filler = ["ok", "see you later", "what time is dinner", "i was at work", "call me", "sure"]
+    
+    conversations = []
+    for _ in range(count):
+        lines = []
+        for _ in range(rng.randint(1, 12)):
+            kind = rng.random()
+            if kind < 0.4:
+                sentence = rng.choice(sentences)
+            elif kind < 0.8:
+                sentence = f"{rng.choice(filler)} {rng.choice(indicators)}"
+            else:
+                sentence = rng.choice(filler)
+            lines.append(f"{rng.choice(SPEAKERS)}: {mutate(sentence, rng)}")
+        conversations.append("\n".join(lines))
+    return conversations
+
+
+def throughput(analyze, conversations):
+    """Results of ``analyze`` over the conversations and messages per second."""
+    start = time.perf_counter()
+    results = [analyze(conversation) for conversation in conversations]
+    elapsed = time.perf_counter() - start
+    messages = sum(conversation.count("\n") + 1 for conversation in conversations)
+    return results, messages / elapsed
+
+
+def main():
+    """Run the harness."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--conversations", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--matchers", default="regex,token,mapped")
+    parser.add_argument("--show", type=int, default=3, help="differences printed per engine")
+    args = parser.parse_args()
+    
+    knowledge_path = os.path.join(DATA_DIR, "pattern_knowledge.json")
+    reference = PatternDetector(knowledge_path, normalize_text=False, matcher="regex")
+    patterns = reference.patterns
+    weights = reference.severity_weights
+    conversations = generate_conversations(patterns, args.conversations, args.seed)
+    
+    print(f"🧪 Differential check: {len(conversations)} conversations, "
+          f"{sum(c.count(chr(10)) + 1 for c in conversations)} messages, {len(reference.engine.indicators)} indicators")
+    print("=" * 78)
+    legacy, rate = throughput(lambda c: legacy_analyze(patterns, weights, c), conversations)
+    print(f"{'re.search loop':<27} {'':>10} {'':>15} {rate:>8,.0f} msg/s")
+    
+    failures = 0
+    automaton_dir = tempfile.mkdtemp(prefix="differential_")
+    try:
+        for matcher in args.matchers.split(","):
+            for normalize in (False, True):
+                detector = PatternDetector(knowledge_path, normalize_text=normalize, matcher=matcher,
+                                           automaton_dir=automaton_dir)
+                results, rate = throughput(lambda c: engine_analyze(detector, c), conversations)
+                
+                mismatches = 0
+                changed = 0
+                explained = Counter()
+                for conversation, result, original in zip(conversations, results, legacy):
+                    text_lower = conversation.lower()
+                    normalized = detector.normalizer.normalize(text_lower).text if normalize else None
+                    reasons, unexplained = check(result, original, patterns, weights,
+                                                 text_lower, normalized, matcher)
+                    explained.update(reasons)
+                    changed += bool(reasons)
+                    if unexplained:
+                        mismatches += 1
+                        if mismatches <= args.show:
+                            print(f"  ✗ {matcher} differs on {conversation!r}:\n    " + "\n    ".join(unexplained))
+                
+                failures += mismatches
+                name = f"{matcher} engine" + (" + normalizer" if normalize else "")
+                status = "as allowed" if not mismatches else f"{mismatches} DIFFER"
+                print(f"{name:<27} {status:>10} {changed:>5} changed {rate:>8,.0f} msg/s")
+                for reason, count in sorted(explained.items()):
+                    print(f"    {count:>6} hits: {reason} - {ALLOWED_DIFFERENCES[reason]}")
+    finally:
+        shutil.rmtree(automaton_dir)
+    
+    print("=" * 78)
+    print("✅ All engines differ from the re.search loop only as allowed" if not failures else f"❌ {failures} differences")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Benchmark phrase matchers against the original re.search loop.
+
+Generates messages from the example conversations, plants indicator
+phrases at word boundaries and "trap" words that merely contain a short
+indicator ("perfectly", "amazingly"), then reports per-indicator precision,
+recall and throughput for each matcher.
+
+Usage:
+    python benchmarks/matcher_benchmark.py [--messages 5000] [--seed 7]
+"""
+
+import argparse
+import glob
+import os
+import random
+import re
+import sys
+import time
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from silent_signal.backend.core.pattern_detector import PatternDetector
+
+DATA_DIR = "silent_signal/data"
+
+
+def legacy_matches(patterns, text):
+    """Indicators found by the original per-pattern re.search loop."""
+    text_lower = text.lower()
+    return {
+        pattern.lower()
+        for config in patterns.values()
+        for pattern in config.get("patterns", [])
+        if re.search(pattern, text_lower, re.IGNORECASE)
+    }
+
+
+def engine_matches(engine, text):
+    """Indicators found by a compiled engine."""
+    return {engine.indicators[i] for i in engine.find_phrases(text.lower())}
+
+
+def word_boundary_truth(phrases, text):
+    """Indicators that occur in the text as whole words."""
+    text_lower = text.lower()
+    return {
+        phrase for phrase, regex in phrases.items()
+        if regex.search(text_lower)
+    }
+
+
+def generate_messages(phrases, count, seed):
+    """Build messages mixing example text, planted phrases and trap words."""
+    rng = random.Random(seed)
+    
+    filler = []
+    for path in glob.glob(os.path.join(DATA_DIR, "examples", "*.txt")):
+        with open(path, 'r', encoding='utf-8') as f:
+            filler.extend(re.findall(r"[a-z]+", f.read().lower()))
+    filler = [word for word in filler if word not in phrases] or ["hello"]
+    
+    single_words = [phrase for phrase in phrases if re.fullmatch(r"[a-z]+", phrase)]
+    traps = [word + suffix for word in single_words for suffix in ("ly", "ness", "s")]
+    planted = list(phrases)
+    
+    messages = []
+    for _ in range(count):
+        words = [rng.choice(filler) for _ in range(rng.randint(4, 20))]
+        for _ in range(rng.randint(0, 2)):
+            words.insert(rng.randrange(len(words) + 1), rng.choice(planted))
+        for _ in range(rng.randint(0, 2)):
+            words.insert(rng.randrange(len(words) + 1), rng.choice(traps))
+        messages.append(" ".join(words) + rng.choice([".", "!", "?", ""]))
+    return messages
+
+
+def evaluate(name, match_fn, messages, truths):
+    """Score a matcher and print one result row."""
+    true_positives = false_positives = false_negatives = 0
+    
+    start = time.perf_counter()
+    results = [match_fn(message) for message in messages]
+    elapsed = time.perf_counter() - start
+    
+    for found, truth in zip(results, truths):
+        true_positives += len(found & truth)
+        false_positives += len(found - truth)
+        false_negatives += len(truth - found)
+    
+    precision = true_positives / max(true_positives + false_positives, 1)
+    recall = true_positives / max(true_positives + false_negatives, 1)
+    print(f"{name:<18} precision {precision:6.3f}  recall {recall:6.3f}  "
+          f"{len(messages) / elapsed:>10,.0f} msg/s")
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--messages", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    
+    knowledge_path = os.path.join(DATA_DIR, "pattern_knowledge.json")
+    regex_detector = PatternDetector(knowledge_path, normalize_text=False, matcher="regex")
+    token_detector = PatternDetector(knowledge_path, normalize_text=False, matcher="token")
+    patterns = regex_detector.patterns
+    
+    phrases = {
+        phrase: re.compile(r"(?<![^\W_])" + re.escape(phrase) + r"(?![^\W_])")
+        for phrase in regex_detector.engine.phrase_ids
+    }
+    messages = generate_messages(phrases, args.messages, args.seed)
+    truths = [word_boundary_truth(phrases, message) for message in messages]
+    
+    print(f"🧪 Matcher benchmark: {len(messages)} messages, {len(phrases)} indicators")
+    print("=" * 72)
+    evaluate("re.search loop", lambda m: legacy_matches(patterns, m), messages, truths)
+    evaluate("regex engine", lambda m: engine_matches(regex_detector.engine, m), messages, truths)
+    evaluate("token engine", lambda m: engine_matches(token_detector.engine, m), messages, truths)
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Benchmark parallel pattern detection against the serial path.
+
+Runs a large batch split by document and one huge transcript split into
+overlapping chunks, checks that the parallel results are identical to the
+serial ones and reports the wall time of each.
+
+Usage:
+    python benchmarks/parallel_benchmark.py [--workers 4] [--documents 20000]
+"""
+
+import argparse
+import glob
+import os
+import random
+import sys
+import time
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from silent_signal.backend.core.pattern_detector import PatternDetector
+
+DATA_DIR = "silent_signal/data"
+
+
+def timed(function, *args, **kwargs):
+    """Call a function and return (result, seconds)."""
+    start = time.perf_counter()
+    result = function(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 2)
+    parser.add_argument("--documents", type=int, default=20000)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    
+    rng = random.Random(args.seed)
+    examples = []
+    for path in glob.glob(os.path.join(DATA_DIR, "examples", "*.txt")):
+        with open(path, 'r', encoding='utf-8') as f:
+            examples.append(f.read())
+    documents = [rng.choice(examples) for _ in range(args.documents)]
+    transcript = "\n".join(documents)
+    
+    detector = PatternDetector(os.path.join(DATA_DIR, "pattern_knowledge.json"))
+    
+    print(f"🧪 Parallel detection: {args.workers} workers, {os.cpu_count()} CPUs")
+    print("=" * 60)
+    
+    serial, serial_time = timed(detector.analyze_texts, documents)
+    parallel, parallel_time = timed(detector.analyze_texts, documents, workers=args.workers)
+    identical = (
+        (serial.hit_counts == parallel.hit_counts).all()
+        and (serial.scores == parallel.scores).all()
+        and (serial.risk_levels == parallel.risk_levels).all()
+    )
+    print(f"Batch of {len(documents)} documents")
+    print(f"  serial   {serial_time:8.3f}s")
+    print(f"  parallel {parallel_time:8.3f}s  identical: {'✅' if identical else '❌'}")
+    
+    serial, serial_time = timed(detector.analyze_text, transcript)
+    parallel, parallel_time = timed(detector.analyze_text, transcript, workers=args.workers)
+    identical = serial[1] == parallel[1] and (
+        [pattern.model_dump() for pattern in serial[0]]
+        == [pattern.model_dump() for pattern in parallel[0]]
+    )
+    print(f"Transcript of {len(transcript):,} characters")
+    print(f"  serial   {serial_time:8.3f}s")
+    print(f"  parallel {parallel_time:8.3f}s  identical: {'✅' if identical else '❌'}")
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
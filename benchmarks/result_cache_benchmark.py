@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Measure the analysis result cache on a stream of repeated texts.
+
+Sends ``--requests`` analyses drawn from ``--distinct`` texts with a
+skewed popularity, like forwarded messages, each copy re-typed with
+random case, curly quotes and stray whitespace. NIM is replaced by an
+offline stub that waits ``--latency`` milliseconds. Runs once without
+and once with the cache, and reports throughput, NIM calls and the hit
+rate. Every cached response must match the response of a fresh analysis
+of the same copy, evidence excerpts and spans included.
+
+Usage:
+    python benchmarks/result_cache_benchmark.py [--requests 2000] [--distinct 200] [--latency 20]
+"""
+
+import argparse
+import glob
+import os
+import random
+import sys
+import time
+
+# Add the project root to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import logging
+logging.disable(logging.CRITICAL)
+
+from silent_signal.config.settings import settings
+from silent_signal.backend.core.mcp_orchestrator import MCPOrchestrator
+
+DATA_DIR = "silent_signal/data"
+
+
+def stub_nim(nimo_client, latency, calls):
+    """Replace the NIM call by a delayed, deterministic answer and count the calls."""
+    def analyze_conversation(context):
+        calls.append(1)
+        time.sleep(latency)
+        response = nimo_client._get_fallback_response("benchmark")
+        response.update(risk_level="concerning", confidence=0.7, red_flags=[], analysis_metadata={
+            "model_used": nimo_client.model
+        })
+        return response
+    nimo_client.analyze_conversation = analyze_conversation
+
+
+def retype(text, rng):
+    """A copy of a text as someone else might have pasted it."""
+    if rng.random() < 0.3:
+        text = text.upper()
+    if rng.random() < 0.3:
+        text = text.replace("'", "’")
+    return " " * rng.randint(0, 2) + text + "\n" * rng.randint(0, 2)
+
+
+def comparable(response):
+    """The parts of a response a cache hit must reproduce."""
+    data = response.model_dump()
+    return data["risk_level"], data["risk_score"], data["patterns_detected"], data["suggestions"]
+
+
+def run(conversations, latency, cache_size):
+    """Analyze every conversation; returns (seconds, NIM calls, orchestrator, responses)."""
+    settings.analysis_cache_size = cache_size
+    orchestrator = MCPOrchestrator(os.path.join(DATA_DIR, "pattern_knowledge.json"))
+    calls = []
+    stub_nim(orchestrator.nimo_client, latency, calls)
+    
+    start = time.perf_counter()
+    responses = [orchestrator.analyze_conversation(conversation) for conversation in conversations]
+    return time.perf_counter() - start, len(calls), orchestrator, responses
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--distinct", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=20.0, help="simulated NIM milliseconds")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    rng = random.Random(args.seed)
+    
+    examples = []
+    for path in sorted(glob.glob(os.path.join(DATA_DIR, "examples", "*.txt"))):
+        with open(path, 'r', encoding='utf-8') as f:
+            examples.append(f.read().strip())
+    texts = [f"{examples[i % len(examples)]}\nSam: forwarded {i}" for i in range(args.distinct)]
+    weights = [1.0 / (rank + 1) for rank in range(args.distinct)]
+    conversations = [retype(text, rng) for text in rng.choices(texts, weights, k=args.requests)]
+    
+    print(f"🧪 Result cache: {args.requests} requests of {args.distinct} texts, NIM stub {args.latency:.0f} ms")
+    print("=" * 60)
+    print(f"{'cache':<10}{'req/s':>10}{'NIM calls':>12}{'hit rate':>12}")
+    elapsed, calls, _, fresh = run(conversations, args.latency / 1000.0, 0)
+    print(f"{'off':<10}{len(conversations) / elapsed:>10,.1f}{calls:>12,}{'':>12}")
+    elapsed, calls, orchestrator, cached = run(conversations, args.latency / 1000.0, args.distinct)
+    hit_rate = orchestrator.result_cache.statistics()["hit_rate"]
+    print(f"{'on':<10}{len(conversations) / elapsed:>10,.1f}{calls:>12,}{hit_rate:>11.1%}")
+    
+    differences = sum(comparable(first) != comparable(second) for first, second in zip(fresh, cached))
+    print("=" * 60)
+    print("✅ Cached responses match fresh analyses" if not differences else f"❌ {differences} responses differ")
+    return 1 if differences else 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -56,6 +56,22 @@ def run_backend():
         sys.exit(1)
 
 
+def build_pattern_cache():
+    """Compile the pattern engine into the on-disk cache, e.g. during a deploy build."""
+    try:
+        from silent_signal.backend.api.main import get_orchestrator
+        
+        if not settings.pattern_cache:
+            logger.warning("PATTERN_CACHE is disabled, nothing to build")
+            return
+        detector = get_orchestrator().pattern_detector
+        logger.info(f"Pattern engine {detector.engine.version} cached in {detector.engine_cache.directory}")
+        
+    except Exception as e:
+        logger.error(f"Failed to build pattern cache: {e}")
+        sys.exit(1)
+
+
 def main():
     """Main entry point."""
     parser = argparse.ArgumentParser(
@@ -64,8 +80,8 @@ def main():
     
     parser.add_argument(
         "service",
-        choices=["frontend", "backend", "both"],
-        help="Service to run: frontend, backend, or both"
+        choices=["frontend", "backend", "both", "cache"],
+        help="Service to run: frontend, backend, or both; cache compiles the pattern engine cache"
     )
     
     parser.add_argument(
@@ -88,6 +104,8 @@ def main():
         logger.info("Please run 'make run-both' to start both services")
         # For simplicity, just run backend (React frontend should be started separately)
         run_backend()
+    elif args.service == "cache":
+        build_pattern_cache()
 
 
 if __name__ == "__main__":
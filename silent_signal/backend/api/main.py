@@ -5,12 +5,14 @@ Production-quality API with comprehensive endpoints, error handling,
 and proper request/response validation.
 """
 
-from fastapi import FastAPI, HTTPException, Depends, Request
+from fastapi import FastAPI, HTTPException, Depends, Request, Header
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
+import asyncio
+import hmac
 import logging
 import time
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 
 from ..core.mcp_orchestrator import MCPOrchestrator
 from ..models.schemas import (
@@ -64,14 +66,19 @@ async def startup_event():
     logger.info(f"Debug mode: {settings.debug}")
     
     # Initialize orchestrator
-    get_orchestrator()
+    orchestrator = get_orchestrator()
     logger.info("Orchestrator initialized successfully")
+    
+    if settings.pattern_reload_interval > 0:
+        orchestrator.pattern_detector.start_watching(settings.pattern_reload_interval)
 
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """Cleanup on shutdown."""
     logger.info("Shutting down SilentSignal API server")
+    get_orchestrator().pattern_detector.stop_watching()
+    await get_orchestrator().nimo_client.aclose()
 
 
 @app.get("/health", response_model=HealthResponse)
@@ -134,7 +141,12 @@ async def analyze_conversation(request: AnalysisRequest):
         
         # Get orchestrator and perform analysis
         orchestrator = get_orchestrator()
-        result = orchestrator.analyze_conversation(request.conversation)
+        if request.tenant_id is not None and request.tenant_id not in orchestrator.pattern_detector.tenant_overlays:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Unknown tenant: {request.tenant_id}"
+            )
+        result = await orchestrator.analyze_conversation_async(request.conversation, tenant_id=request.tenant_id)
         
         # Log analysis completion
         processing_time = time.time() - start_time
@@ -183,7 +195,7 @@ async def whatsapp_webhook(request: Request):
         
         # Analyze the message
         orchestrator = get_orchestrator()
-        analysis = orchestrator.analyze_conversation(message_data["Body"])
+        analysis = await orchestrator.analyze_conversation_async(message_data["Body"], triage=settings.whatsapp_triage)
         
         # Generate response based on analysis
         response_text = _generate_whatsapp_response(analysis)
@@ -269,6 +281,66 @@ async def get_patterns():
         )
 
 
+def _require_admin(x_admin_token: Optional[str]) -> None:
+    """Reject requests without the configured admin token."""
+    # Constant-time comparison, so response timing does not reveal the token
+    if not settings.admin_token or not hmac.compare_digest(
+            (x_admin_token or "").encode("utf-8"), settings.admin_token.encode("utf-8")):
+        raise HTTPException(status_code=403, detail="Admin access denied")
+
+
+@app.get("/admin/patterns")
+async def get_detector_state(x_admin_token: Optional[str] = Header(None)):
+    """Get pattern information along with the detector's operational state."""
+    _require_admin(x_admin_token)
+    
+    try:
+        detector = get_orchestrator().pattern_detector
+        
+        return {
+            "pattern_statistics": detector.get_pattern_statistics(),
+            "detector_statistics": detector.get_detector_statistics()
+        }
+        
+    except Exception as e:
+        logger.error(f"Detector state error: {e}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to get detector state: {str(e)}"
+        )
+
+
+@app.post("/admin/patterns/reload")
+async def reload_patterns(x_admin_token: Optional[str] = Header(None)):
+    """
+    Reload pattern knowledge without restarting.
+    
+    The new engine is compiled in a worker thread and swapped in
+    atomically; analyses already running finish on the previous version.
+    """
+    _require_admin(x_admin_token)
+    
+    try:
+        detector = get_orchestrator().pattern_detector
+        previous_version = detector.engine.version
+        loop = asyncio.get_running_loop()
+        version = await loop.run_in_executor(None, detector.reload)
+        
+        return {
+            "status": "success",
+            "previous_version": previous_version,
+            "knowledge_version": version,
+            "reloaded": version != previous_version
+        }
+        
+    except Exception as e:
+        logger.error(f"Pattern reload error: {e}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"Pattern reload failed: {str(e)}"
+        )
+
+
 @app.get("/resources")
 async def get_resources():
     """Get available crisis resources and support information."""
@@ -10,7 +10,8 @@ from typing import Dict, List, Any, Tuple
 import logging
 import math
 
-from ..models.schemas import PatternInfo, RiskLevel
+from ..models.schemas import RiskLevel
+from ..models.records import PatternRecord
 
 logger = logging.getLogger(__name__)
 
@@ -107,7 +108,7 @@ class Analyzer:
             return self._get_fallback_analysis(str(e))
     
     def _calculate_fusion_metrics(self, pattern_score: float, pattern_count: int,
-                                 patterns: List[PatternInfo], ai_confidence: float) -> Dict[str, float]:
+                                 patterns: List[PatternRecord], ai_confidence: float) -> Dict[str, float]:
         """Calculate detailed fusion metrics."""
         # Normalize pattern score (assuming max score around 100)
         normalized_pattern_score = min(pattern_score / 100.0, 1.0)
@@ -138,7 +139,7 @@ class Analyzer:
             "ai_confidence": ai_confidence
         }
     
-    def _calculate_severity_factor(self, patterns: List[PatternInfo]) -> float:
+    def _calculate_severity_factor(self, patterns: List[PatternRecord]) -> float:
         """Calculate severity factor based on detected patterns."""
         if not patterns:
             return 0.0
@@ -0,0 +1,419 @@
+"""
+Compact Trie - Memory-mapped Token Automaton File
+
+Serializes a compiled token trie, its vocabulary and its indicators into
+one binary file of flat integer arrays, read back through a read-only
+memory map. Every process mapping the same file shares its physical
+pages, and opening it costs the same whatever the number of phrases.
+"""
+
+import os
+import sys
+import json
+import mmap
+import zlib
+from array import array
+from bisect import bisect_left
+from collections import deque
+from collections.abc import Mapping, Sequence
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+import logging
+
+from .text_normalizer import phrase_words
+
+logger = logging.getLogger(__name__)
+
+# File signature and layout revision
+MAGIC = b"SSTRIE04"
+
+# Arrays are placed at multiples of this many bytes
+ALIGNMENT = 8
+
+
+class MappedStrings(Sequence):
+    """Read-only sequence of strings stored as UTF-8 in a mapped pool."""
+    
+    def __init__(self, offsets: memoryview, data: memoryview):
+        self._offsets = offsets
+        self._data = data
+    
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+    
+    def __getitem__(self, index: int) -> str:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        return bytes(self._data[self._offsets[index]:self._offsets[index + 1]]).decode("utf-8", "surrogatepass")
+
+
+class MappedCategories(Sequence):
+    """Read-only sequence of the category names of each indicator."""
+    
+    def __init__(self, offsets: memoryview, ids: memoryview, categories: List[str]):
+        self._offsets = offsets
+        self._ids = ids
+        self._categories = categories
+    
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+    
+    def __getitem__(self, index: int) -> Tuple[str, ...]:
+        categories = self._categories
+        return tuple(categories[c] for c in self._ids[self._offsets[index]:self._offsets[index + 1]])
+
+
+class MappedPhrases(Mapping):
+    """
+    Read-only mapping of literal phrase -> indicator id.
+    
+    Phrase ids are stored sorted by the UTF-8 bytes of their phrases, so
+    a lookup is a binary search decoding O(log n) phrases.
+    """
+    
+    def __init__(self, ids: memoryview, indicators: MappedStrings):
+        self._ids = ids
+        self._indicators = indicators
+        self._keys = _SortedKeys(ids, indicators)
+    
+    def __len__(self) -> int:
+        return len(self._ids)
+    
+    def __iter__(self) -> Iterator[str]:
+        indicators = self._indicators
+        return (indicators[indicator] for indicator in self._ids)
+    
+    def __getitem__(self, phrase: str) -> int:
+        key = phrase.encode("utf-8", "surrogatepass")
+        position = bisect_left(self._keys, key)
+        if position < len(self._ids) and self._keys[position] == key:
+            return self._ids[position]
+        raise KeyError(phrase)
+
+
+class _SortedKeys(Sequence):
+    """UTF-8 keys of the sorted phrase ids, for ``bisect``."""
+    
+    def __init__(self, ids: memoryview, indicators: MappedStrings):
+        self._ids = ids
+        self._indicators = indicators
+    
+    def __len__(self) -> int:
+        return len(self._ids)
+    
+    def __getitem__(self, index: int) -> bytes:
+        return self._indicators[self._ids[index]].encode("utf-8", "surrogatepass")
+
+
+class CompactTokenTrie:
+    """
+    Token trie, vocabulary and indicators of an engine in a mapped file.
+    
+    The trie is a double array over token ids: the children of the node in
+    slot ``s`` sit at ``base[s] + token_id`` and are recognized by
+    ``check[child] == s``, so a transition is two array reads. The
+    vocabulary is an open-addressing table keyed by the CRC-32 of each
+    token's UTF-8 bytes, with linear probing. Terminal indicator ids,
+    indicator texts and indicator categories are stored as offset arrays
+    into flat pools. All arrays are ``memoryview`` casts of the map, so
+    nothing is copied into the process; the category settings and sizes,
+    the ids of regex indicators and the distinct words of the phrases,
+    which are few, are kept in the header.
+    """
+    
+    def __init__(self, path: str):
+        """
+        Map an automaton file.
+        
+        Args:
+            path: File written by ``write``
+        
+        Raises:
+            ValueError: If the file is not a compatible automaton file
+        """
+        self.path = path
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        
+        view = memoryview(self._map)
+        if bytes(view[:len(MAGIC)]) != MAGIC:
+            raise ValueError(f"{path} is not a compact trie file")
+        header_length = int.from_bytes(view[len(MAGIC):len(MAGIC) + 4], "little")
+        start = len(MAGIC) + 4
+        header = json.loads(bytes(view[start:start + header_length]).decode("utf-8"))
+        if header["byteorder"] != sys.byteorder:
+            raise ValueError(f"{path} was written on a {header['byteorder']}-endian machine")
+        
+        arrays = {
+            name: view[offset:offset + length].cast(typecode)
+            for name, (offset, length, typecode) in header["arrays"].items()
+        }
+        self.version: str = header["version"]
+        self.max_phrase_tokens: int = header["max_phrase_tokens"]
+        self.categories: List[str] = header["categories"]
+        self.category_settings: Dict[str, Dict[str, Any]] = header["category_settings"]
+        self.category_sizes: Dict[str, int] = header["category_sizes"]
+        self.regex_ids: List[int] = header["regex_ids"]
+        self.words = frozenset(header["words"])
+        
+        self.base = arrays["base"]
+        self.check = arrays["check"]
+        self.term_offsets = arrays["term_offsets"]
+        self.term_ids = arrays["term_ids"]
+        self.slot_ids = arrays["slot_ids"]
+        self.slot_starts = arrays["slot_starts"]
+        self.slot_ends = arrays["slot_ends"]
+        self.key_bytes = arrays["key_bytes"]
+        self.mask = len(self.slot_ids) - 1
+        
+        self.indicators = MappedStrings(arrays["indicator_offsets"], arrays["indicator_bytes"])
+        self.indicator_categories = MappedCategories(
+            arrays["category_offsets"], arrays["category_ids"], self.categories
+        )
+        self.phrase_ids = MappedPhrases(arrays["phrase_ids"], self.indicators)
+    
+    def __len__(self) -> int:
+        """Number of double-array slots."""
+        return len(self.base)
+    
+    def token_id(self, token: str) -> int:
+        """Id of a vocabulary token, or -1."""
+        key = token.encode("utf-8", "surrogatepass")
+        slot = zlib.crc32(key) & self.mask
+        slot_ids = self.slot_ids
+        while True:
+            token_id = slot_ids[slot]
+            if token_id < 0:
+                return -1
+            if self.key_bytes[self.slot_starts[slot]:self.slot_ends[slot]] == key:
+                return token_id
+            slot = (slot + 1) & self.mask
+    
+    def child(self, node: int, token_id: int) -> int:
+        """Slot reached from ``node`` on ``token_id``, or -1."""
+        if token_id < 0:
+            return -1
+        slot = self.base[node] + token_id
+        if 0 <= slot < len(self.check) and self.check[slot] == node:
+            return slot
+        return -1
+    
+    def terminals(self, node: int) -> memoryview:
+        """Indicator ids of the phrases ending at a node."""
+        return self.term_ids[self.term_offsets[node]:self.term_offsets[node + 1]]
+    
+    @staticmethod
+    def write(path: str, engine: Any) -> None:
+        """
+        Serialize the in-memory trie of a compiled token engine.
+        
+        The file is written next to ``path`` and renamed into place, so a
+        process mapping ``path`` never sees it half written.
+        
+        Args:
+            path: Destination file
+            engine: ``TokenTrieEngine`` whose ``vocabulary``, ``children``
+                and ``terminals`` are built
+        """
+        base, check, node_slots = _double_array(engine.children)
+        
+        # Terminal ids per slot
+        slot_terminals: Dict[int, Tuple[int, ...]] = {
+            node_slots[node]: terminals
+            for node, terminals in enumerate(engine.terminals)
+            if terminals
+        }
+        term_offsets = array("i", [0])
+        term_ids = array("i")
+        for slot in range(len(base)):
+            term_ids.extend(slot_terminals.get(slot, ()))
+            term_offsets.append(len(term_ids))
+        
+        # Vocabulary hash table, at most half full
+        size = 1
+        while size < 2 * len(engine.vocabulary):
+            size <<= 1
+        slot_ids = array("i", [-1]) * size
+        slot_starts = array("i", [0]) * size
+        slot_ends = array("i", [0]) * size
+        key_bytes = bytearray()
+        for token, token_id in engine.vocabulary.items():
+            key = token.encode("utf-8", "surrogatepass")
+            slot = zlib.crc32(key) & (size - 1)
+            while slot_ids[slot] >= 0:
+                slot = (slot + 1) & (size - 1)
+            slot_ids[slot] = token_id
+            slot_starts[slot] = len(key_bytes)
+            key_bytes.extend(key)
+            slot_ends[slot] = len(key_bytes)
+        
+        indicator_offsets, indicator_bytes = _string_pool(engine.indicators)
+        category_index = {name: i for i, name in enumerate(engine.patterns)}
+        category_offsets = array("i", [0])
+        category_ids = array("i")
+        for categories in engine.indicator_categories:
+            category_ids.extend(category_index[name] for name in categories)
+            category_offsets.append(len(category_ids))
+        
+        phrase_ids = array("i", sorted(
+            engine.phrase_ids.values(),
+            key=lambda indicator: engine.indicators[indicator].encode("utf-8", "surrogatepass")
+        ))
+        
+        arrays = {
+            "base": base, "check": check,
+            "term_offsets": term_offsets, "term_ids": term_ids,
+            "slot_ids": slot_ids, "slot_starts": slot_starts, "slot_ends": slot_ends,
+            "key_bytes": array("B", key_bytes),
+            "indicator_offsets": indicator_offsets, "indicator_bytes": indicator_bytes,
+            "category_offsets": category_offsets, "category_ids": category_ids,
+            "phrase_ids": phrase_ids
+        }
+        _write_arrays(path, {
+            "version": engine.version,
+            "max_phrase_tokens": engine.max_phrase_tokens,
+            "categories": list(engine.patterns),
+            "category_settings": {
+                name: {key: value for key, value in config.items() if key != "patterns"}
+                for name, config in engine.patterns.items()
+            },
+            "category_sizes": engine.registry.category_sizes,
+            "regex_ids": [indicator for indicator, _ in engine.regex_patterns],
+            "words": sorted(phrase_words(engine.phrase_ids)),
+            "byteorder": sys.byteorder
+        }, arrays)
+
+
+def _double_array(children: List[Dict[int, int]]) -> Tuple[array, array, List[int]]:
+    """
+    Lay a trie out as a double array.
+    
+    Nodes are placed breadth first; each node's base is the first one
+    that puts all of its children on free slots, searching from the
+    lowest free slot, so the array stays dense.
+    
+    Returns:
+        (base, check, slot of each node) with the root in slot 0
+    """
+    base = array("i", [0])
+    check = array("i", [-1])
+    used = bytearray(b"\x01")
+    node_slots = [0] * len(children)
+    next_free = 1
+    
+    def reserve(size: int) -> None:
+        if size > len(used):
+            grow = max(size, 2 * len(used)) - len(used)
+            used.extend(bytes(grow))
+            base.extend(array("i", [0]) * grow)
+            check.extend(array("i", [-1]) * grow)
+    
+    queue = deque([0])
+    while queue:
+        node = queue.popleft()
+        edges = sorted(children[node].items())
+        if not edges:
+            continue
+        
+        first, last = edges[0][0], edges[-1][0]
+        position = next_free
+        while True:
+            offset = position - first
+            reserve(offset + last + 1)
+            if all(not used[offset + token_id] for token_id, _ in edges):
+                break
+            # Only free slots can take the first child
+            position = used.find(0, position + 1)
+            if position < 0:
+                position = len(used)
+        
+        slot = node_slots[node]
+        base[slot] = offset
+        for token_id, child in edges:
+            used[offset + token_id] = 1
+            check[offset + token_id] = slot
+            node_slots[child] = offset + token_id
+            queue.append(child)
+        next_free = used.find(0, next_free)
+        if next_free < 0:
+            next_free = len(used)
+    
+    end = len(used)
+    while end > 1 and not used[end - 1]:
+        end -= 1
+    return base[:end], check[:end], node_slots
+
+
+def _string_pool(strings: Sequence) -> Tuple[array, array]:
+    """Offsets and UTF-8 bytes of a list of strings."""
+    offsets = array("i", [0])
+    data = bytearray()
+    for string in strings:
+        data.extend(string.encode("utf-8", "surrogatepass"))
+        offsets.append(len(data))
+    return offsets, array("B", data)
+
+
+def _write_arrays(path: str, header: Dict[str, Any], arrays: Dict[str, array]) -> None:
+    """Write a header and aligned arrays to ``path`` atomically."""
+    # Offsets depend on the header length, which depends on the offsets'
+    # digits; lay out against a header padded to a fixed size
+    layout: Dict[str, List] = {}
+    header_size = 256 + 64 * len(arrays) + len(json.dumps(header))
+    position = _aligned(len(MAGIC) + 4 + header_size)
+    for name, values in arrays.items():
+        nbytes = len(values) * values.itemsize
+        layout[name] = [position, nbytes, values.typecode]
+        position = _aligned(position + nbytes)
+    
+    encoded = json.dumps(dict(header, arrays=layout)).encode("utf-8")
+    if len(encoded) > header_size:
+        raise ValueError("compact trie header does not fit its reserved space")
+    
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    temporary = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(temporary, "wb") as f:
+            f.write(MAGIC)
+            f.write(len(encoded).to_bytes(4, "little"))
+            f.write(encoded)
+            for name, values in arrays.items():
+                f.write(bytes(layout[name][0] - f.tell()))
+                values.tofile(f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temporary, path)
+    finally:
+        if os.path.exists(temporary):
+            os.remove(temporary)
+
+
+def _aligned(position: int) -> int:
+    """Round a file position up to ``ALIGNMENT``."""
+    return -(-position // ALIGNMENT) * ALIGNMENT
+
+
+def open_trie(path: str, version: Optional[str] = None) -> Optional[CompactTokenTrie]:
+    """
+    Map an automaton file if it exists and was built for an engine version.
+    
+    Args:
+        path: Automaton file
+        version: Engine version the file must hold; any if None
+    
+    Returns:
+        The mapped trie, or None if it has to be (re)built
+    """
+    if not os.path.exists(path):
+        return None
+    try:
+        trie = CompactTokenTrie(path)
+    except (OSError, ValueError, KeyError) as e:
+        logger.warning(f"Ignoring unreadable automaton file {path}: {e}")
+        return None
+    if version is not None and trie.version != version:
+        logger.warning(f"Automaton file {path} holds version {trie.version}, expected {version}")
+        return None
+    return trie
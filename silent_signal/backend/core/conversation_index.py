@@ -0,0 +1,188 @@
+"""
+Conversation Index - Incremental Per-message Detection
+
+Keeps the hits of every message of an analyzed conversation, so a thread
+that is re-submitted with new messages appended only has its new messages
+scanned and rescored.
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Set, Tuple
+import logging
+
+import numpy as np
+
+from ..models.records import EvidenceRecord
+
+logger = logging.getLogger(__name__)
+
+
+def split_messages(text: str) -> List[str]:
+    """Split a conversation into its lines, keeping each line's newline."""
+    messages = [line + "\n" for line in text.split("\n")]
+    messages[-1] = messages[-1][:-1]
+    if not messages[-1]:
+        messages.pop()
+    return messages
+
+
+def message_digests(messages: List[str]) -> List[bytes]:
+    """
+    Digest of the conversation text up to each message's newline.
+    
+    The newline itself is left out, so a thread ending in a message has the
+    same digest as the thread with more messages appended after it.
+    """
+    running = hashlib.blake2b(digest_size=16)
+    digests = []
+    for message in messages:
+        body = message[:-1] if message.endswith("\n") else message
+        running.update(body.encode("utf-8", "surrogatepass"))
+        digests.append(running.copy().digest())
+        if len(body) < len(message):
+            running.update(b"\n")
+    return digests
+
+
+@dataclass
+class MessageHits:
+    """Hits of one message of an indexed conversation."""
+    digest: bytes                   # digest of the conversation up to this message's newline
+    end: int                        # offset of the message end in the conversation
+    exact: Optional[np.ndarray]     # packed bitmap of exactly matched indicator ids
+    fuzzy: Dict[int, int]           # approximately matched indicator id -> edit distance
+    evidence: List[Tuple[int, EvidenceRecord]]  # (indicator id, hit) in scan order
+
+
+class ConversationIndex:
+    """
+    Per-message hits and running totals of one conversation.
+    
+    Totals are kept as the number of messages each indicator matched in,
+    so appending or dropping a message updates them in O(indicators) and
+    the matched set of the whole conversation is never rescanned. Hits are
+    attributed to the message they start in; messages from ``complete`` on
+    may still gain hits that continue into text appended later, and are
+    rescanned when the conversation grows.
+    """
+    
+    def __init__(self, version: str, indicator_count: int):
+        self.version = version
+        self.indicator_count = indicator_count
+        self.messages: List[MessageHits] = []
+        self.complete = 0
+        self.exact_counts = np.zeros(indicator_count, dtype=np.int32)
+        self.fuzzy_counts: Dict[Tuple[int, int], int] = {}
+    
+    def __len__(self) -> int:
+        return len(self.messages)
+    
+    @property
+    def digest(self) -> Optional[bytes]:
+        """Digest of the indexed conversation."""
+        return self.messages[-1].digest if self.messages else None
+    
+    @property
+    def end(self) -> int:
+        """Length of the indexed conversation text."""
+        return self.messages[-1].end if self.messages else 0
+    
+    def append(self, digest: bytes, end: int, matched: Set[int], fuzzy: Dict[int, int],
+               evidence: List[Tuple[int, EvidenceRecord]]) -> None:
+        """
+        Add the hits of the next message.
+        
+        Args:
+            digest: Digest of the conversation up to this message
+            end: Offset of the message end in the conversation
+            matched: Exactly matched indicator ids
+            fuzzy: Approximately matched indicator ids -> edit distance
+            evidence: (indicator id, hit) pairs starting in the message
+        """
+        exact = None
+        if matched:
+            mask = np.zeros(self.indicator_count, dtype=np.uint8)
+            mask[list(matched)] = 1
+            self.exact_counts += mask
+            exact = np.packbits(mask)
+        for key in fuzzy.items():
+            self.fuzzy_counts[key] = self.fuzzy_counts.get(key, 0) + 1
+        self.messages.append(MessageHits(digest, end, exact, fuzzy, evidence))
+    
+    def truncate(self, count: int) -> None:
+        """Drop every message after the first ``count``, updating the totals."""
+        while len(self.messages) > count:
+            message = self.messages.pop()
+            if message.exact is not None:
+                self.exact_counts -= np.unpackbits(message.exact, count=self.indicator_count)
+            for key in message.fuzzy.items():
+                remaining = self.fuzzy_counts[key] - 1
+                if remaining:
+                    self.fuzzy_counts[key] = remaining
+                else:
+                    del self.fuzzy_counts[key]
+        self.complete = min(self.complete, count)
+    
+    def matched(self) -> Set[int]:
+        """Indicator ids matched exactly anywhere in the conversation."""
+        return set(np.flatnonzero(self.exact_counts).tolist())
+    
+    def fuzzy(self) -> Dict[int, int]:
+        """Approximately matched indicator ids -> smallest edit distance."""
+        fuzzy: Dict[int, int] = {}
+        for indicator, distance in self.fuzzy_counts:
+            fuzzy[indicator] = min(distance, fuzzy.get(indicator, distance))
+        return fuzzy
+
+
+class ConversationIndexCache:
+    """
+    Least recently used conversation indexes, keyed by conversation digest.
+    
+    An index is taken out of the cache while a request extends it, so
+    concurrent requests for the same thread never share one.
+    """
+    
+    def __init__(self, max_size: int = 256):
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        self._indexes: "OrderedDict[bytes, ConversationIndex]" = OrderedDict()
+    
+    def __len__(self) -> int:
+        return len(self._indexes)
+    
+    def checkout(self, digests: List[bytes], version: str) -> Optional[ConversationIndex]:
+        """
+        Take the index of the longest cached prefix of a conversation.
+        
+        Args:
+            digests: Message digests of the conversation, from ``message_digests``
+            version: Engine version the index must have been built with
+        
+        Returns:
+            Index covering the first ``len(index)`` messages, or None
+        """
+        with self._lock:
+            for digest in reversed(digests):
+                index = self._indexes.pop(digest, None)
+                if index is not None:
+                    return index if index.version == version else None
+        return None
+    
+    def store(self, index: ConversationIndex) -> None:
+        """Put an index (back) into the cache, evicting the least recently used."""
+        if not index.messages:
+            return
+        with self._lock:
+            self._indexes[index.digest] = index
+            self._indexes.move_to_end(index.digest)
+            while len(self._indexes) > self.max_size:
+                self._indexes.popitem(last=False)
+    
+    def clear(self) -> None:
+        """Drop every cached index."""
+        with self._lock:
+            self._indexes.clear()
@@ -0,0 +1,244 @@
+"""
+Engine Cache - Compiled Pattern Engines Kept on Disk
+
+Pickles each compiled engine and prefilter under a content hash of
+everything it was built from, so a cold start with unchanged patterns
+loads them instead of parsing the knowledge file and compiling again.
+Entries no build asks for any more are eventually deleted.
+"""
+
+import os
+import sys
+import stat
+import json
+import pickle
+import time
+import hashlib
+import tempfile
+from typing import Any, Dict, Iterable, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Layout revision of cache entries
+CACHE_FORMAT = 1
+
+# Where compiled engines are kept unless configured otherwise: the user's
+# cache directory, never a shared one like /tmp that others can write to
+DEFAULT_CACHE_DIR = os.path.join(
+    os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache"),
+    "silent_signal", "engines"
+)
+
+# Permission bits that let other users replace what the cache unpickles
+UNSAFE_MODE = stat.S_IWGRP | stat.S_IWOTH
+
+# Modules besides the engine's own whose code changes what gets compiled
+COMPILER_MODULES = (
+    "silent_signal.backend.core.regex_guard",
+    "silent_signal.backend.core.text_normalizer",
+    "silent_signal.backend.core.compact_trie"
+)
+
+
+class EngineCache:
+    """
+    Directory of compiled objects keyed by what they were compiled from.
+    
+    The key covers the inputs of a build, the bytes of the file it read,
+    if any, and the compiler version, i.e. the compiling classes and the
+    source of every module they are defined in, so editing any of them
+    simply misses the cache. Entries are unpickled, so the directory is
+    created private to the current user, and a directory or entry owned by
+    anyone else or writable by other users is never read.
+    
+    Every edit thus leaves the previous entries behind. Loading an entry
+    marks it used, and each store deletes the least recently used entries
+    beyond ``max_entries`` and those unused for ``max_age`` seconds.
+    """
+    
+    # Entries kept, enough for the engines and prefilters of a few
+    # configurations with their language packs
+    max_entries = 64
+    
+    # Seconds an unused entry (or abandoned temporary file) is kept
+    max_age = 30 * 24 * 3600.0
+    
+    def __init__(self, directory: Optional[str] = None, max_entries: Optional[int] = None,
+                 max_age: Optional[float] = None):
+        """
+        Initialize the cache.
+        
+        Args:
+            directory: Directory of cache entries; defaults to
+                ``DEFAULT_CACHE_DIR``
+            max_entries: Entries kept; defaults to ``max_entries``
+            max_age: Seconds an unused entry is kept; defaults to ``max_age``
+        """
+        self.directory = directory or DEFAULT_CACHE_DIR
+        if max_entries is not None:
+            self.max_entries = max_entries
+        if max_age is not None:
+            self.max_age = max_age
+    
+    @classmethod
+    def key(cls, compilers: Iterable[type], inputs: Dict[str, Any],
+            paths: Iterable[str] = ()) -> str:
+        """
+        Content hash of the inputs of a build.
+        
+        Args:
+            compilers: Classes whose code the compiled object depends on
+            inputs: Everything else the build depends on, JSON-serializable
+            paths: Files read by the build
+        
+        Returns:
+            Hex digest identifying the compiled object
+        """
+        compilers = list(compilers)
+        digest = hashlib.sha256()
+        digest.update(json.dumps({
+            "format": CACHE_FORMAT,
+            "python": sys.version_info[:2],
+            "compilers": [f"{cls.__module__}.{cls.__qualname__}" for cls in compilers],
+            "inputs": inputs
+        }, sort_keys=True).encode("utf-8"))
+        
+        modules = {base.__module__ for cls in compilers for base in cls.__mro__ if base is not object}
+        for name in sorted(modules.union(COMPILER_MODULES)):
+            source = getattr(sys.modules.get(name), "__file__", None)
+            digest.update(name.encode("utf-8"))
+            digest.update(cls._read(source) or b"")
+        
+        for path in paths:
+            contents = cls._read(path)
+            digest.update(b"file" if contents is not None else b"no file")
+            digest.update(contents or b"")
+        return digest.hexdigest()[:32]
+    
+    @staticmethod
+    def _read(path: Optional[str]) -> Optional[bytes]:
+        """Contents of a file, or None if unavailable."""
+        if not path:
+            return None
+        try:
+            with open(path, "rb") as f:
+                return f.read()
+        except OSError:
+            return None
+    
+    def _path(self, key: str) -> str:
+        """File of a cache entry."""
+        return os.path.join(self.directory, f"{key}.pickle")
+    
+    @staticmethod
+    def _owned(status: os.stat_result) -> bool:
+        """Whether a file belongs to the current user and only they can write it."""
+        if not hasattr(os, "getuid"):
+            return True
+        return status.st_uid == os.getuid() and not status.st_mode & UNSAFE_MODE
+    
+    def _trusted(self) -> bool:
+        """Whether the cache directory belongs to the current user and only they can write it."""
+        try:
+            return self._owned(os.stat(self.directory))
+        except OSError:
+            return False
+    
+    def load(self, key: str) -> Optional[Any]:
+        """
+        Load a cached object.
+        
+        Args:
+            key: Key from ``key``
+        
+        Returns:
+            The cached object, or None if there is no usable entry
+        """
+        path = self._path(key)
+        if not os.path.exists(path):
+            return None
+        if not self._trusted():
+            logger.warning(f"Ignoring engine cache {self.directory}: not private to this user")
+            return None
+        
+        try:
+            with open(path, "rb") as f:
+                # Checked on the open file, so it cannot be swapped after the check
+                if not self._owned(os.fstat(f.fileno())):
+                    logger.warning(f"Ignoring cache entry {path}: not private to this user")
+                    return None
+                compiled = pickle.load(f)
+        except Exception as e:
+            logger.warning(f"Failed to load cache entry {path}: {e}")
+            return None
+        
+        # The modification time orders entries by last use
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        logger.info(f"{type(compiled).__name__} {compiled.version} loaded from {path}")
+        return compiled
+    
+    def store(self, key: str, compiled: Any) -> None:
+        """
+        Cache an object; failures are logged and otherwise ignored.
+        
+        Args:
+            key: Key from ``key``
+            compiled: Freshly compiled object with a ``version``
+        """
+        path = self._path(key)
+        try:
+            os.makedirs(self.directory, mode=0o700, exist_ok=True)
+            if not self._trusted():
+                logger.warning(f"Not caching in {self.directory}: not private to this user")
+                return
+            # Readers only ever see complete entries
+            fd, temporary = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    pickle.dump(compiled, f, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(temporary, path)
+            except BaseException:
+                os.unlink(temporary)
+                raise
+        except Exception as e:
+            logger.warning(f"Failed to cache {type(compiled).__name__} {compiled.version}: {e}")
+            return
+        self._prune()
+    
+    def _prune(self) -> None:
+        """Delete the entries beyond ``max_entries`` or unused for ``max_age``."""
+        if not self._trusted():
+            return
+        
+        used: Dict[str, float] = {}
+        try:
+            with os.scandir(self.directory) as scan:
+                for entry in scan:
+                    if entry.name.endswith((".pickle", ".tmp")):
+                        try:
+                            used[entry.path] = entry.stat().st_mtime
+                        except FileNotFoundError:
+                            continue
+        except OSError as e:
+            logger.warning(f"Failed to list engine cache {self.directory}: {e}")
+            return
+        
+        cutoff = time.time() - self.max_age
+        entries = sorted((path for path in used if path.endswith(".pickle")), key=used.get, reverse=True)
+        temporaries = [path for path in used if path.endswith(".tmp")]
+        stale = entries[self.max_entries:] + [
+            path for path in entries[:self.max_entries] + temporaries if used[path] < cutoff
+        ]
+        for path in stale:
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass    # pruned by another process
+            except OSError as e:
+                logger.warning(f"Failed to delete cache entry {path}: {e}")
+        if stale:
+            logger.info(f"Deleted {len(stale)} stale entries from engine cache {self.directory}")
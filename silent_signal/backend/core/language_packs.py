@@ -0,0 +1,209 @@
+"""
+Language Packs - Per-language Pattern Engines
+
+Finds the language packs next to a knowledge file, guesses the language
+of a text from its script or its most common words, and keeps the
+engines compiled from the packs in a bounded least recently used cache.
+"""
+
+import os
+import re
+import glob
+import threading
+from collections import OrderedDict, defaultdict
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+import logging
+
+from .pattern_engine import PatternEngine, build_trie_regex
+from .prefilter import Prefilter
+
+logger = logging.getLogger(__name__)
+
+# Language of the built-in patterns and the main knowledge file
+DEFAULT_LANGUAGE = "en"
+
+# Function words common in chat messages of each Latin-script language;
+# words shared by several languages count for each of them
+LANGUAGE_WORDS = {
+    "en": "the and you to is that it not my me was for are with this have but what i'm don't you're never always",
+    "es": "el la que los las y no es por con para una lo me mi pero eres estás nunca siempre qué yo tú te",
+    "fr": "le la les et est pas je tu que des une ne vous mon ma mais c'est es jamais toujours moi toi",
+    "de": "der die das und ist nicht ich du sie zu mit ein eine mein aber wie was bist nie immer mich dich",
+    "pt": "o a os as e é não que um uma você eu meu mas com para isso nunca sempre está",
+    "it": "il lo la che di e è non un una per sei mio ma mai sempre io tu mi ti",
+    "nl": "de het een en is niet ik je dat van mijn maar wat zijn nooit altijd jij",
+}
+
+# Languages told apart by script alone, checked in order: kana first,
+# since Japanese also uses the ideographs Chinese is written in
+SCRIPT_LANGUAGES = [
+    ("ja", r"[\u3040-\u30ff]"),
+    ("zh", r"[\u4e00-\u9fff]"),
+    ("ko", r"[\u1100-\u11ff\uac00-\ud7af]"),
+    ("ru", r"[\u0400-\u04ff]"),
+    ("el", r"[\u0370-\u03ff]"),
+    ("he", r"[\u0590-\u05ff]"),
+    ("ar", r"[\u0600-\u06ff]"),
+    ("hi", r"[\u0900-\u097f]"),
+    ("th", r"[\u0e00-\u0e7f]"),
+]
+
+# Pack file names carry a language code, e.g. pattern_knowledge.es.json
+LANGUAGE_CODE_PATTERN = re.compile(r"[a-z]{2,3}")
+
+LETTER_PATTERN = re.compile(r"[^\W\d_]")
+
+
+def pack_path(knowledge_path: str, language: str) -> str:
+    """Path of the language pack of a knowledge file."""
+    root, extension = os.path.splitext(knowledge_path)
+    return f"{root}.{language}{extension}"
+
+
+def find_packs(knowledge_path: str) -> Set[str]:
+    """Languages with a pack next to a knowledge file."""
+    root, extension = os.path.splitext(knowledge_path)
+    languages = set()
+    for path in glob.glob(f"{glob.escape(root)}.*{glob.escape(extension)}"):
+        language = path[len(root) + 1:len(path) - len(extension)]
+        if LANGUAGE_CODE_PATTERN.fullmatch(language) and language != DEFAULT_LANGUAGE:
+            languages.add(language)
+    return languages
+
+
+class LanguageDetector:
+    """
+    Guess which of a set of languages a text is written in.
+    
+    Only the start of the text is looked at. Text mostly in a non-Latin
+    script is assigned that script's language; otherwise the language
+    whose function words occur most often wins, if it has at least
+    ``min_word_hits`` of them and more than the default language.
+    """
+    
+    # Characters of a text looked at
+    sample_length = 1000
+    
+    # Function words needed to pick a language other than the default
+    min_word_hits = 2
+    
+    def __init__(self, languages: Iterable[str]):
+        """
+        Build the detector.
+        
+        Args:
+            languages: Languages to tell apart from the default language
+        """
+        self.languages = frozenset(languages)
+        self.scripts: List[Tuple[str, re.Pattern]] = [
+            (language, re.compile(characters))
+            for language, characters in SCRIPT_LANGUAGES if language in self.languages
+        ]
+        self.script_pattern = (
+            re.compile("|".join(pattern.pattern for _, pattern in self.scripts)) if self.scripts else None
+        )
+        
+        self.words: Dict[str, Tuple[str, ...]] = defaultdict(tuple)
+        for language in self.languages | {DEFAULT_LANGUAGE}:
+            for word in LANGUAGE_WORDS.get(language, "").split():
+                self.words[word] += (language,)
+        self.words = dict(self.words)
+        # Finds only the function words, so other words cost no lookups
+        self.word_pattern = re.compile(r"\b" + build_trie_regex(sorted(self.words)) + r"\b")
+        
+        undetectable = self.languages - set(LANGUAGE_WORDS) - {language for language, _ in self.scripts}
+        if undetectable:
+            logger.warning(f"No detection rule for language packs {sorted(undetectable)}; they are never used")
+    
+    def detect(self, text: str) -> Optional[str]:
+        """
+        Guess the language of a text.
+        
+        Args:
+            text: Input text
+        
+        Returns:
+            Language code, or None if the text matches no language well
+        """
+        sample = text[:self.sample_length].lower()
+        if self.script_pattern is not None and not sample.isascii():
+            scripted = len(self.script_pattern.findall(sample))
+            if 2 * scripted > len(LETTER_PATTERN.findall(sample)):
+                for language, pattern in self.scripts:
+                    if pattern.search(sample):
+                        return language
+        
+        found = self.word_pattern.findall(sample)
+        if not found:
+            return None
+        counts: Dict[str, int] = {}
+        words = self.words
+        for word in found:
+            for language in words[word]:
+                counts[language] = counts.get(language, 0) + 1
+        
+        language = max(counts, key=counts.get)
+        if language != DEFAULT_LANGUAGE and (
+                counts[language] < self.min_word_hits
+                or counts[language] <= counts.get(DEFAULT_LANGUAGE, 0)):
+            return None
+        return language
+
+
+@dataclass
+class LanguagePack:
+    """Engine and prefilter compiled from one language pack."""
+    
+    language: str
+    engine: PatternEngine
+    prefilter: Optional[Prefilter]
+    mtime: Optional[float]      # of the pack file when it was compiled
+    base_version: str           # engine version of the main knowledge
+
+
+class LanguagePackCache:
+    """Least recently used compiled language packs, keyed by language."""
+    
+    def __init__(self, max_size: int = 4):
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        self._packs: "OrderedDict[str, LanguagePack]" = OrderedDict()
+    
+    def __len__(self) -> int:
+        return len(self._packs)
+    
+    def get(self, language: str) -> Optional[LanguagePack]:
+        """Compiled pack of a language, marked as most recently used."""
+        with self._lock:
+            pack = self._packs.get(language)
+            if pack is not None:
+                self._packs.move_to_end(language)
+            return pack
+    
+    def store(self, pack: LanguagePack) -> None:
+        """Add or replace a pack, evicting the least recently used."""
+        with self._lock:
+            self._packs[pack.language] = pack
+            self._packs.move_to_end(pack.language)
+            while len(self._packs) > self.max_size:
+                evicted, _ = self._packs.popitem(last=False)
+                logger.info(f"Evicted language pack {evicted}")
+    
+    def prefilter(self, version: str) -> Optional[Prefilter]:
+        """Prefilter of the cached pack whose engine has a version."""
+        with self._lock:
+            for pack in self._packs.values():
+                if pack.engine.version == version:
+                    return pack.prefilter
+        return None
+    
+    def languages(self) -> List[str]:
+        """Languages currently compiled, least recently used first."""
+        with self._lock:
+            return list(self._packs)
+    
+    def clear(self) -> None:
+        """Drop every compiled pack."""
+        with self._lock:
+            self._packs.clear()
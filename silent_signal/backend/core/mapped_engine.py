@@ -0,0 +1,286 @@
+"""
+Mapped Engine - Token Matcher over a Shared Automaton File
+
+Token-trie engine for very large pattern packs: the trie, vocabulary and
+indicators live in a compact memory-mapped file instead of Python
+objects, so every worker process on a host shares one physical copy.
+"""
+
+import os
+import re
+import tempfile
+from typing import Dict, FrozenSet, List, Optional, Set
+import logging
+
+from .pattern_engine import MatchSpans
+from .token_engine import TokenTrieEngine, TOKEN_PATTERN
+from .compact_trie import CompactTokenTrie, open_trie
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+# Where automaton files are kept unless configured otherwise
+DEFAULT_AUTOMATON_DIR = os.path.join(tempfile.gettempdir(), "silent_signal_automata")
+
+
+class MappedRegistry:
+    """Indicator registry read from an automaton file, shaped like ``IndicatorRegistry``."""
+    
+    def __init__(self, trie: CompactTokenTrie):
+        self.categories = trie.categories
+        self.indicators = trie.indicators
+        self.indicator_categories = trie.indicator_categories
+        self.category_sizes = trie.category_sizes
+        self.indicator_ids: Dict[str, int] = {}
+    
+    def __len__(self) -> int:
+        return len(self.indicators)
+
+
+class MappedTokenEngine(TokenTrieEngine):
+    """
+    Token-trie engine reading its trie from a memory-mapped automaton file.
+    
+    Matches exactly like ``TokenTrieEngine``. The file is named after the
+    ``source`` the engine was built from (a content hash of the knowledge
+    files and settings) or, without one, its version; the first process to
+    need a file builds it (under an exclusive lock, so concurrent workers
+    build it once) and every process maps it read-only. Once the file
+    exists, engines never build the indicators in memory: ``registry``,
+    ``indicators``, ``indicator_categories`` and ``phrase_ids`` read the
+    mapped file, and ``patterns`` keeps only each category's settings, read
+    from the file as well, not its indicator list. ``open`` returns an
+    engine for a source without the patterns at all.
+    
+    Approximate matching is not supported; fuzzy categories match exactly.
+    """
+    
+    name = "mapped"
+    
+    # Distinct text tokens whose ids are kept per process
+    token_cache_size = 65536
+    
+    def __init__(self, patterns: Dict[str, Dict], regex_budget: Optional[float] = None,
+                 automaton_dir: Optional[str] = None, source: Optional[str] = None):
+        """
+        Compile the engine, building its automaton file if needed.
+        
+        Args:
+            patterns: Pattern configuration keyed by category name
+            regex_budget: Seconds of regex searching allowed per scanned
+                text, 0 for no limit
+            automaton_dir: Directory of automaton files; defaults to
+                ``DEFAULT_AUTOMATON_DIR``
+            source: Content hash of everything ``patterns`` was built
+                from, naming the automaton file so ``open`` finds it
+        """
+        self.automaton_dir = automaton_dir or DEFAULT_AUTOMATON_DIR
+        self.source = source
+        super().__init__(patterns, regex_budget=regex_budget)
+    
+    @classmethod
+    def open(cls, source: str, regex_budget: Optional[float] = None,
+             automaton_dir: Optional[str] = None) -> Optional["MappedTokenEngine"]:
+        """
+        Map the automaton file built from a source, without the patterns.
+        
+        Args:
+            source: Content hash the engine was built with
+            regex_budget: Seconds of regex searching allowed per scanned
+                text, 0 for no limit
+            automaton_dir: Directory of automaton files; defaults to
+                ``DEFAULT_AUTOMATON_DIR``
+        
+        Returns:
+            The engine, or None if the file has to be built
+        """
+        engine = cls.__new__(cls)
+        engine.automaton_dir = automaton_dir or DEFAULT_AUTOMATON_DIR
+        engine.source = source
+        trie = open_trie(engine.automaton_path)
+        if trie is None:
+            return None
+        
+        if regex_budget is not None:
+            engine.regex_budget = regex_budget
+        engine.version = trie.version
+        engine._map(trie)
+        engine.fuzzy_categories = frozenset(
+            name for name, config in engine.patterns.items() if config.get("fuzzy")
+        )
+        engine.fuzzy_indicators = frozenset()
+        if engine.fuzzy_categories:
+            engine._warn_fuzzy()
+        logger.info(f"Pattern engine {engine.version} ({cls.name}) mapped from {engine.automaton_path}")
+        return engine
+    
+    @property
+    def automaton_path(self) -> str:
+        """Automaton file of this engine's source, or of its version if it has none."""
+        return os.path.join(self.automaton_dir, f"{self.source or self.version}.automaton")
+    
+    def _register_indicators(self) -> None:
+        """Read the indicators from the automaton file, or register them to build it."""
+        self.fuzzy_indicators = frozenset()
+        trie = open_trie(self.automaton_path, self.version)
+        if trie is None:
+            super()._register_indicators()
+            return
+        
+        if self.fuzzy_categories:
+            self._warn_fuzzy()
+        self._map(trie)
+    
+    def _warn_fuzzy(self) -> None:
+        """Warn that fuzzy categories match exactly."""
+        logger.warning(
+            f"The {self.name} matcher does not support fuzzy matching; "
+            f"categories {sorted(self.fuzzy_categories)} match exactly"
+        )
+    
+    def _compile_literals(self) -> None:
+        """Build the automaton file of this version unless it is mapped already."""
+        if getattr(self, "trie", None) is not None:
+            return
+        if self.fuzzy_indicators:
+            self._warn_fuzzy()
+            self.fuzzy_indicators = frozenset()
+        
+        path = self.automaton_path
+        os.makedirs(self.automaton_dir, exist_ok=True)
+        with open(f"{path}.lock", "w") as lock:
+            if fcntl is not None:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            # Another process may have built it while this one waited
+            trie = open_trie(path, self.version)
+            if trie is None:
+                super()._compile_literals()
+                CompactTokenTrie.write(path, self)
+                logger.info(f"Wrote automaton file {path} ({os.path.getsize(path)} bytes)")
+                del self.vocabulary, self.children, self.terminals
+                del self.first_tokens, self.fuzzy_terminals
+                trie = CompactTokenTrie(path)
+        
+        self._map(trie)
+    
+    def _map(self, trie: CompactTokenTrie) -> None:
+        """Read the trie and the indicators from a mapped automaton file."""
+        self.trie = trie
+        self.max_phrase_tokens = trie.max_phrase_tokens
+        self._token_cache: Dict[str, int] = {}
+        
+        # Read indicators from the map from now on, so any Python copies
+        # built from the configuration can be freed
+        self.patterns = trie.category_settings
+        self.registry = MappedRegistry(trie)
+        self.indicators = trie.indicators
+        self.indicator_categories = trie.indicator_categories
+        self.phrase_ids = trie.phrase_ids
+        self.regex_patterns = [
+            (indicator, re.compile(self.indicators[indicator], re.IGNORECASE))
+            for indicator in trie.regex_ids
+        ]
+    
+    def words(self) -> FrozenSet[str]:
+        """Words of the literal phrases, from the automaton file."""
+        return self.trie.words
+    
+    def __getstate__(self) -> Dict:
+        """Pickle everything but the mapped file, which is mapped again on load."""
+        state = self.__dict__.copy()
+        for name in ("trie", "_token_cache", "patterns", "registry", "indicators",
+                     "indicator_categories", "phrase_ids", "regex_patterns"):
+            state.pop(name, None)
+        return state
+    
+    def __setstate__(self, state: Dict) -> None:
+        """
+        Restore a pickled engine by mapping its automaton file.
+        
+        Raises:
+            FileNotFoundError: If the automaton file of this version is
+                missing or unusable
+        """
+        self.__dict__.update(state)
+        trie = open_trie(self.automaton_path, self.version)
+        if trie is None:
+            raise FileNotFoundError(f"No usable automaton file {self.automaton_path}")
+        self._map(trie)
+    
+    def _token_ids(self, tokens: List[str]) -> List[int]:
+        """Ids of text tokens, -1 for tokens outside the vocabulary."""
+        cache = self._token_cache
+        token_id = self.trie.token_id
+        ids = []
+        for token in tokens:
+            found = cache.get(token)
+            if found is None:
+                if len(cache) >= self.token_cache_size:
+                    cache.clear()
+                found = cache[token] = token_id(token)
+            ids.append(found)
+        return ids
+    
+    def find_phrases(self, text_lower: str, start: int = 0, end: Optional[int] = None,
+                     spans: Optional[MatchSpans] = None,
+                     fuzzy: Optional[Dict[int, int]] = None) -> Set[int]:
+        """
+        Tokenize lowercased text once and return every phrase it contains.
+        
+        Args:
+            text_lower: Lowercased input text
+            start: Position to start tokenizing at; must be a token boundary
+            end: Only consider matches whose first token starts before this position
+            spans: Optional span record to append every hit to
+            fuzzy: Unused; this matcher only matches exactly
+        
+        Returns:
+            Set of matched indicator ids
+        """
+        matched: Set[int] = set()
+        
+        if spans is None and start == 0 and end is None:
+            tokens = TOKEN_PATTERN.findall(text_lower)
+            positions = None
+        else:
+            found = list(TOKEN_PATTERN.finditer(text_lower, start))
+            tokens = [token.group() for token in found]
+            positions = [token.span() for token in found]
+        token_ids = self._token_ids(tokens)
+        
+        trie = self.trie
+        base = trie.base
+        check = trie.check
+        slots = len(check)
+        term_offsets = trie.term_offsets
+        term_ids = trie.term_ids
+        count = len(token_ids)
+        
+        for i in range(count):
+            token_id = token_ids[i]
+            if token_id < 0:
+                continue
+            slot = base[0] + token_id
+            if not (0 <= slot < slots and check[slot] == 0):
+                continue
+            if end is not None and positions[i][0] >= end:
+                break
+            
+            node = 0
+            j = i
+            while j < count:
+                token_id = token_ids[j]
+                slot = base[node] + token_id
+                if token_id < 0 or not (0 <= slot < slots and check[slot] == node):
+                    break
+                node = slot
+                for indicator in term_ids[term_offsets[node]:term_offsets[node + 1]]:
+                    matched.add(indicator)
+                    if spans is not None:
+                        spans.add(indicator, positions[i][0], positions[j][1])
+                j += 1
+        return matched
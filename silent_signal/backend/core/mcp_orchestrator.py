@@ -5,17 +5,25 @@ Orchestrates multi-step analysis pipeline with RAG and Nemotron integration.
 Production-quality implementation with proper error handling and logging.
 """
 
+import asyncio
 import json
 import os
-from typing import Dict, List, Any, Optional
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Any, Optional, Tuple
 from dataclasses import dataclass, field
 import logging
 
-from ..services.nimo_client import NimoClient
+from ..services.nimo_client import NimoClient, RED_FLAG_TYPES
 from .pattern_detector import PatternDetector
+from .pattern_engine import PatternEngine
 from .analyzer import Analyzer
+from .stage_graph import StageGraph, WorkflowStage
+from .result_cache import AnalysisResultCache, cache_key
 from ..utils.resource_manager import ResourceManager
-from ..models.schemas import AnalysisResponse, RiskLevel, PatternInfo
+from ..models.schemas import AnalysisResponse, RiskLevel
+from ..models.records import PatternRecord, to_pattern_models
+from ...config.settings import settings
 
 logger = logging.getLogger(__name__)
 
@@ -24,11 +32,121 @@ logger = logging.getLogger(__name__)
 class AnalysisStep:
     """Represents a step in the agentic workflow."""
     name: str
-    status: str = "pending"  # pending, running, completed, failed
+    status: str = "pending"  # pending, running, completed, failed, skipped
     result: Optional[Dict[str, Any]] = None
     error: Optional[str] = None
     start_time: Optional[float] = None
     end_time: Optional[float] = None
+    
+    def summary(self) -> Dict[str, Any]:
+        """Status and timing of the step, without its result."""
+        return {
+            "name": self.name,
+            "status": self.status,
+            "error": self.error,
+            "start_time": self.start_time,
+            "end_time": self.end_time,
+            "duration": (self.end_time - self.start_time) if self.start_time and self.end_time else None
+        }
+
+
+# Weights of the AI confidence and the pattern score in the fusion score
+FUSION_WEIGHTS = {"ai": 0.7, "pattern": 0.3}
+
+# Steps of the agentic workflow, in the order they run
+WORKFLOW_STEPS = (
+    "preprocessing",
+    "rag_retrieval",
+    "pattern_detection",
+    "nemotron_analysis",
+    "fusion_analysis",
+    "report_generation"
+)
+
+
+@dataclass(eq=False)
+class WorkflowContext:
+    """
+    State of one run of the agentic workflow.
+    
+    Every ``analyze_conversation`` call gets its own context and passes it
+    to the steps that need it, so concurrent analyses never see each
+    other's step timings or results.
+    """
+    steps: List[AnalysisStep] = field(default_factory=lambda: [AnalysisStep(name) for name in WORKFLOW_STEPS])
+    started: Optional[float] = None
+    
+    def step(self, step_name: str) -> Optional[AnalysisStep]:
+        """Step of the workflow with a name."""
+        return next((step for step in self.steps if step.name == step_name), None)
+    
+    def update_step(self, step_name: str, status: str,
+                    result: Optional[Dict[str, Any]] = None,
+                    error: Optional[str] = None) -> None:
+        """Update the status of a workflow step."""
+        import time
+        
+        step = self.step(step_name)
+        if step is None:
+            return
+        step.status = status
+        step.result = result
+        step.error = error
+        
+        if status == "running":
+            step.start_time = time.time()
+        elif status in ["completed", "failed"]:
+            step.end_time = time.time()
+
+
+class WorkflowMetrics:
+    """Thread-safe counts, average processing time and critical paths of workflow runs."""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.total_analyses = 0
+        self.successful_analyses = 0
+        self.failed_analyses = 0
+        self.average_processing_time = 0.0
+        self.critical_stages: Dict[str, List[float]] = {}  # stage -> [runs on the path, seconds there]
+    
+    def start(self) -> None:
+        """Count one started analysis."""
+        with self._lock:
+            self.total_analyses += 1
+    
+    def record(self, processing_time: float, success: bool) -> None:
+        """Count one finished analysis and fold its time into the average."""
+        with self._lock:
+            if success:
+                self.successful_analyses += 1
+            else:
+                self.failed_analyses += 1
+            
+            finished = self.successful_analyses + self.failed_analyses
+            self.average_processing_time += (processing_time - self.average_processing_time) / finished
+    
+    def record_critical_path(self, path: List[Dict[str, Any]]) -> None:
+        """Count the stages on the critical path of one run and their durations."""
+        with self._lock:
+            for stage in path:
+                totals = self.critical_stages.setdefault(stage["name"], [0, 0.0])
+                totals[0] += 1
+                totals[1] += stage["duration"]
+    
+    def statistics(self) -> Dict[str, Any]:
+        """Consistent snapshot of the metrics."""
+        with self._lock:
+            return {
+                "total_analyses": self.total_analyses,
+                "successful_analyses": self.successful_analyses,
+                "failed_analyses": self.failed_analyses,
+                "average_processing_time": self.average_processing_time,
+                "critical_path": {
+                    name: {"analyses": int(count), "average_duration": total / count}
+                    for name, (count, total) in self.critical_stages.items()
+                }
+            }
 
 
 class MCPOrchestrator:
@@ -50,120 +168,320 @@ class MCPOrchestrator:
             resource_data_path: Path to resource data JSON file
         """
         self.nimo_client = NimoClient()
-        self.pattern_detector = PatternDetector(pattern_knowledge_path)
+        self.pattern_detector = PatternDetector(
+            pattern_knowledge_path,
+            slang_dictionary_path=settings.slang_dictionary_path,
+            normalize_text=settings.text_normalization,
+            matcher=settings.pattern_matcher,
+            fuzzy_categories=[name.strip() for name in settings.fuzzy_categories.split(",") if name.strip()],
+            profile=settings.pattern_profiling,
+            index_size=settings.conversation_index_size,
+            regex_budget=settings.regex_time_budget_ms / 1000.0,
+            prefilter=settings.pattern_prefilter,
+            automaton_dir=settings.pattern_automaton_dir,
+            cache=settings.pattern_cache,
+            cache_dir=settings.pattern_cache_dir,
+            language_packs=settings.pattern_language_packs,
+            tenant_overlays_path=settings.tenant_overlays_path
+        )
         self.analyzer = Analyzer()
         self.resource_manager = ResourceManager(resource_data_path)
         
-        # Initialize workflow steps
-        self.steps = [
-            AnalysisStep("preprocessing"),
-            AnalysisStep("rag_retrieval"),
-            AnalysisStep("pattern_detection"),
-            AnalysisStep("nemotron_analysis"),
-            AnalysisStep("fusion_analysis"),
-            AnalysisStep("report_generation")
-        ]
+        # Workflows in flight and step summaries of the last one finished,
+        # for status reporting only; each analysis owns its own context
+        self._workflows_lock = threading.Lock()
+        self._active_workflows: Dict[int, WorkflowContext] = {}
+        self._last_workflow: List[Dict[str, Any]] = [AnalysisStep(name).summary() for name in WORKFLOW_STEPS]
+        self._last_critical_path: List[Dict[str, Any]] = []
+        
+        # Stages of the workflow, and the threads that run blocking stages
+        # of every analysis when several are ready at once
+        self.workflow = self._build_workflow()
+        self.executor = ThreadPoolExecutor(thread_name_prefix="workflow")
+        self.fusion_weights = dict(FUSION_WEIGHTS)
+        
+        # Responses of texts seen again, keyed by digests and stripped of
+        # anything quoting the text (opt-in)
+        self.result_cache: Optional[AnalysisResultCache] = None
+        if settings.analysis_cache_size > 0:
+            self.result_cache = AnalysisResultCache(settings.analysis_cache_size, settings.analysis_cache_ttl)
         
         # Performance metrics
-        self.metrics = {
-            "total_analyses": 0,
-            "successful_analyses": 0,
-            "failed_analyses": 0,
-            "average_processing_time": 0.0
-        }
+        self.metrics = WorkflowMetrics()
+    
+    def _build_workflow(self) -> StageGraph:
+        """
+        Stages of the agentic workflow and the values they pass on.
+        
+        Preprocessing also pins the pattern engine (of the conversation's
+        language, with the tenant's overlay) so a concurrent knowledge
+        reload cannot change it halfway through. RAG retrieval and pattern
+        detection only need those two, so an asynchronous analysis runs
+        them side by side, on the event loop and in the shared executor.
+        ``analyze_conversation`` hands the executor only blocking stages
+        ready together with another blocking one, which this graph has
+        none of: RAG retrieval is a lookup of tens of microseconds, less
+        than handing it to another thread costs, so it runs on the calling
+        thread while pattern detection does.
+        """
+        return StageGraph([
+            WorkflowStage("preprocessing", self._preprocess_stage,
+                          ("conversation_text", "tenant_id"), ("preprocessed_data", "pattern_engine"),
+                          blocking=True),
+            WorkflowStage("rag_retrieval", self._retrieve_pattern_definitions,
+                          ("preprocessed_data", "pattern_engine"), ("rag_context",)),
+            WorkflowStage("pattern_detection", self._detect_patterns,
+                          ("preprocessed_data", "pattern_engine", "triage"), ("pattern_results",),
+                          blocking=True),
+            WorkflowStage("nemotron_analysis", self._analyze_with_nemotron,
+                          ("conversation_text", "rag_context", "pattern_results"), ("nemotron_results",),
+                          run_async=self._analyze_with_nemotron_async, skip=self._skip_nemotron),
+            WorkflowStage("fusion_analysis", self._fuse_analyses,
+                          ("pattern_results", "nemotron_results"), ("fusion_results",)),
+            WorkflowStage("report_generation", self._generate_final_report,
+                          ("fusion_results", "nemotron_results", "rag_context", "context"), ("final_report",))
+        ], initial=("conversation_text", "tenant_id", "triage", "context"))
     
-    def analyze_conversation(self, conversation_text: str) -> AnalysisResponse:
+    def analyze_conversation(self, conversation_text: str,
+                             tenant_id: Optional[str] = None,
+                             triage: bool = False) -> AnalysisResponse:
         """
         Execute the complete agentic workflow for conversation analysis.
         
         Args:
             conversation_text: The conversation to analyze
+            tenant_id: Tenant whose pattern overlay applies, if any
+            triage: Stop pattern detection once the risk level is final and
+                then skip AI analysis, which could not lower it; the
+                response is marked partial
             
         Returns:
             Complete analysis result with explainable reasoning
         """
-        import time
-        start_time = time.time()
+        cache_lookup, cached = self._cached_response(conversation_text, tenant_id, triage)
+        if cached is not None:
+            return cached
+        context = self._begin_workflow()
         
         try:
-            logger.info("Starting MCP agentic workflow")
-            self.metrics["total_analyses"] += 1
-            
-            # Reset steps
-            self._reset_workflow_steps()
-            
-            # Step 1: Preprocessing
-            self._update_step_status("preprocessing", "running")
-            preprocessed_data = self._preprocess_conversation(conversation_text)
-            self._update_step_status("preprocessing", "completed", preprocessed_data)
-            
-            # Step 2: RAG Retrieval
-            self._update_step_status("rag_retrieval", "running")
-            rag_context = self._retrieve_pattern_definitions(preprocessed_data)
-            self._update_step_status("rag_retrieval", "completed", rag_context)
-            
-            # Step 3: Pattern Detection
-            self._update_step_status("pattern_detection", "running")
-            pattern_results = self._detect_patterns(preprocessed_data)
-            self._update_step_status("pattern_detection", "completed", pattern_results)
-            
-            # Step 4: Nemotron Analysis
-            self._update_step_status("nemotron_analysis", "running")
-            nemotron_results = self._analyze_with_nemotron(
-                conversation_text, rag_context, pattern_results
+            values = self.workflow.run(
+                context, self._workflow_inputs(context, conversation_text, tenant_id, triage),
+                self.executor
             )
-            self._update_step_status("nemotron_analysis", "completed", nemotron_results)
-            
-            # Step 5: Fusion Analysis
-            self._update_step_status("fusion_analysis", "running")
-            fusion_results = self._fuse_analyses(pattern_results, nemotron_results)
-            self._update_step_status("fusion_analysis", "completed", fusion_results)
-            
-            # Step 6: Report Generation
-            self._update_step_status("report_generation", "running")
-            final_report = self._generate_final_report(fusion_results, rag_context)
-            self._update_step_status("report_generation", "completed", final_report)
+            self._cache_response(cache_lookup, values)
+            return self._complete_analysis(context, values["final_report"])
             
-            # Update metrics
-            processing_time = time.time() - start_time
-            self._update_metrics(processing_time, success=True)
+        except Exception as e:
+            return self._fail_analysis(context, e)
+        
+        finally:
+            self._end_workflow(context)
+    
+    async def analyze_conversation_async(self, conversation_text: str,
+                                         tenant_id: Optional[str] = None,
+                                         triage: bool = False) -> AnalysisResponse:
+        """
+        Execute the agentic workflow without blocking the event loop.
+        
+        The CPU-bound steps run in the shared executor and the NIM
+        call is awaited on asynchronous I/O, so a single worker can keep
+        hundreds of analyses in flight while they wait for Nemotron. The
+        result is the same as that of ``analyze_conversation``.
+        
+        Args:
+            conversation_text: The conversation to analyze
+            tenant_id: Tenant whose pattern overlay applies, if any
+            triage: Stop pattern detection once the risk level is final and
+                then skip AI analysis; the response is marked partial
             
-            logger.info(f"MCP agentic workflow completed successfully in {processing_time:.2f}s")
-            return final_report
+        Returns:
+            Complete analysis result with explainable reasoning
+        """
+        cache_lookup, cached = None, None
+        if self.result_cache is not None:
+            cache_lookup, cached = await asyncio.get_running_loop().run_in_executor(
+                self.executor, self._cached_response, conversation_text, tenant_id, triage
+            )
+            if cached is not None:
+                return cached
+        context = self._begin_workflow()
+        
+        try:
+            values = await self.workflow.run_async(
+                context, self._workflow_inputs(context, conversation_text, tenant_id, triage),
+                self.executor
+            )
+            self._cache_response(cache_lookup, values)
+            return self._complete_analysis(context, values["final_report"])
             
         except Exception as e:
-            processing_time = time.time() - start_time
-            self._update_metrics(processing_time, success=False)
-            logger.error(f"MCP workflow error after {processing_time:.2f}s: {e}")
-            return self._get_error_response(str(e))
+            return self._fail_analysis(context, e)
+        
+        finally:
+            self._end_workflow(context)
     
-    def _reset_workflow_steps(self) -> None:
-        """Reset all workflow steps to pending status."""
-        for step in self.steps:
-            step.status = "pending"
-            step.result = None
-            step.error = None
-            step.start_time = None
-            step.end_time = None
-    
-    def _update_step_status(self, step_name: str, status: str, 
-                           result: Optional[Dict[str, Any]] = None,
-                           error: Optional[str] = None) -> None:
-        """Update the status of a workflow step."""
+    def _cached_response(self, conversation_text: str, tenant_id: Optional[str],
+                         triage: bool) -> Tuple[Optional[Tuple[bytes, str]], Optional[AnalysisResponse]]:
+        """
+        Look an analysis up in the result cache.
+        
+        The key covers everything the response depends on: the text as
+        the engines see it, the version of the pattern engine it gets
+        (language pack and tenant overlay included), the triage flag, the
+        NIM model and the fusion weights. Cached responses quote nothing
+        from the text they were computed for, so on a hit the rule-based
+        patterns, with their evidence, are detected again in this text.
+        
+        Returns:
+            Tuple of ((key, engine version) to store the response under,
+            cached response); both None when the cache is disabled
+        """
+        if self.result_cache is None:
+            return None, None
+        try:
+            pattern_engine = self.pattern_detector.engine_for(conversation_text, tenant_id)
+            version = pattern_engine.version
+            key = cache_key(
+                self.pattern_detector.canonical_text(conversation_text),
+                version,
+                tenant_id or "",
+                "triage" if triage else "full",
+                self.nimo_client.model,
+                json.dumps(self.fusion_weights, sort_keys=True)
+            )
+        except Exception as e:
+            logger.warning(f"Analysis cache lookup skipped: {e}")
+            return None, None
+        
+        cached = self.result_cache.get(key)
+        if cached is None:
+            return (key, version), None
+        response, age = cached
+        
+        pattern_results = self._detect_patterns(
+            self._preprocess_conversation(conversation_text), pattern_engine, triage
+        )
+        if "error" in pattern_results:
+            return (key, version), None
+        patterns = to_pattern_models(pattern_results["patterns"])
+        
+        logger.info(f"Analysis served from cache ({age:.0f}s old)")
+        details = response.analysis_details
+        return (key, version), response.model_copy(update={
+            # Stored AI red flags take precedence, as in the report
+            "patterns_detected": response.patterns_detected or patterns,
+            "analysis_details": {
+                **details,
+                "fusion_details": {**details["fusion_details"], "patterns": patterns},
+                "cache": {"hit": True, "age_seconds": age}
+            }
+        })
+    
+    def _cache_response(self, cache_lookup: Optional[Tuple[bytes, str]], values: Dict[str, Any]) -> None:
+        """
+        Store the response of a workflow run, unless AI analysis fell back
+        or failed, or the knowledge changed since the lookup.
+        
+        Only what does not quote the text is kept: rule-based patterns are
+        dropped, since hits detect them again. AI red flags keep their
+        category, severity and confidence, but NIM's own wording (evidence,
+        description, anything off the requested vocabulary) may quote the
+        conversation, so descriptions come from the knowledge file instead.
+        """
+        if cache_lookup is None:
+            return
+        key, version = cache_lookup
+        final_report = values["final_report"]
+        nemotron_results = values["nemotron_results"]
+        ai_metadata = nemotron_results.get("ai_analysis", {}).get("analysis_metadata", {})
+        if (values["pattern_engine"].version != version
+                or "error" in final_report.analysis_details
+                or "error" in nemotron_results
+                or ai_metadata.get("model_used") == "fallback"):
+            return
+        
+        # The report lists AI red flags instead of rule-based patterns if any
+        red_flags = nemotron_results.get("ai_analysis", {}).get("red_flags", [])
+        ai_patterns = any(isinstance(flag, dict) for flag in red_flags)
+        categories = values["pattern_engine"].patterns
+        severities = self.pattern_detector.severity_weights
+        
+        def cached_pattern(pattern):
+            known = pattern.name in categories or pattern.name in RED_FLAG_TYPES
+            return pattern.model_copy(update={
+                "name": pattern.name if known else "unknown",
+                "severity": pattern.severity if pattern.severity in severities else "medium",
+                "description": categories.get(pattern.name, {}).get("description", ""),
+                "evidence": None,
+                "spans": None
+            })
+        
+        details = final_report.analysis_details
+        self.result_cache.put(key, final_report.model_copy(update={
+            "patterns_detected": [
+                cached_pattern(pattern) for pattern in final_report.patterns_detected
+            ] if ai_patterns else [],
+            "analysis_details": {**details, "fusion_details": {**details["fusion_details"], "patterns": []}}
+        }))
+    
+    def _begin_workflow(self) -> WorkflowContext:
+        """Create and register the context of a new analysis."""
         import time
         
-        for step in self.steps:
-            if step.name == step_name:
-                step.status = status
-                step.result = result
-                step.error = error
-                
-                if status == "running":
-                    step.start_time = time.time()
-                elif status in ["completed", "failed"]:
-                    step.end_time = time.time()
-                
-                break
+        context = WorkflowContext(started=time.time())
+        with self._workflows_lock:
+            self._active_workflows[id(context)] = context
+        
+        logger.info("Starting MCP agentic workflow")
+        self.metrics.start()
+        return context
+    
+    def _end_workflow(self, context: WorkflowContext) -> None:
+        """Unregister a finished analysis, keeping its step summaries and critical path."""
+        summary = [step.summary() for step in context.steps]
+        critical_path = self.workflow.critical_path(context, context.started)
+        self.metrics.record_critical_path(critical_path)
+        with self._workflows_lock:
+            del self._active_workflows[id(context)]
+            self._last_workflow = summary
+            self._last_critical_path = critical_path
+    
+    @staticmethod
+    def _workflow_inputs(context: WorkflowContext, conversation_text: str,
+                         tenant_id: Optional[str], triage: bool) -> Dict[str, Any]:
+        """Initial values of a workflow run."""
+        return {
+            "conversation_text": conversation_text,
+            "tenant_id": tenant_id,
+            "triage": triage,
+            "context": context
+        }
+    
+    def _complete_analysis(self, context: WorkflowContext, final_report: AnalysisResponse) -> AnalysisResponse:
+        """Record a completed analysis."""
+        import time
+        
+        processing_time = time.time() - context.started
+        self.metrics.record(processing_time, success=True)
+        
+        logger.info(f"MCP agentic workflow completed successfully in {processing_time:.2f}s")
+        return final_report
+    
+    def _fail_analysis(self, context: WorkflowContext, error: Exception) -> AnalysisResponse:
+        """Record a failed analysis and build its error response."""
+        import time
+        
+        processing_time = time.time() - context.started
+        self.metrics.record(processing_time, success=False)
+        logger.error(f"MCP workflow error after {processing_time:.2f}s: {error}")
+        return self._get_error_response(str(error))
+    
+    def _preprocess_stage(self, conversation_text: str, tenant_id: Optional[str]):
+        """Preprocess the conversation and pin its pattern engine."""
+        return (
+            self._preprocess_conversation(conversation_text),
+            self.pattern_detector.engine_for(conversation_text, tenant_id)
+        )
     
     def _preprocess_conversation(self, conversation_text: str) -> Dict[str, Any]:
         """Preprocess the conversation text for analysis."""
@@ -200,11 +518,12 @@ class MCPOrchestrator:
                 "error": str(e)
             }
     
-    def _retrieve_pattern_definitions(self, preprocessed_data: Dict[str, Any]) -> Dict[str, Any]:
+    def _retrieve_pattern_definitions(self, preprocessed_data: Dict[str, Any],
+                                      pattern_engine: Optional[PatternEngine] = None) -> Dict[str, Any]:
         """Retrieve relevant pattern definitions using RAG."""
         try:
             # Get pattern statistics for context
-            pattern_stats = self.pattern_detector.get_pattern_statistics()
+            pattern_stats = self.pattern_detector.get_pattern_statistics(pattern_engine)
             
             # Get resource information
             resources = self.resource_manager.get_crisis_resources()
@@ -223,22 +542,44 @@ class MCPOrchestrator:
             logger.error(f"RAG retrieval error: {e}")
             return {"error": str(e)}
     
-    def _detect_patterns(self, preprocessed_data: Dict[str, Any]) -> Dict[str, Any]:
+    def _detect_patterns(self, preprocessed_data: Dict[str, Any],
+                         pattern_engine: Optional[PatternEngine] = None,
+                         triage: bool = False) -> Dict[str, Any]:
         """Detect patterns using the pattern detector."""
+        pattern_engine = pattern_engine or self.pattern_detector.engine
         try:
             text = preprocessed_data.get("cleaned_text", "")
-            patterns, score = self.pattern_detector.analyze_text(text)
+            if triage:
+                result = self.pattern_detector.triage_text(text, pattern_engine)
+                return {
+                    "patterns": result.patterns,
+                    "score": result.score,
+                    "pattern_count": len(result.patterns),
+                    "risk_level": result.risk_level,
+                    "partial": result.partial,
+                    "knowledge_version": pattern_engine.version
+                }
+            
+            patterns, score = self.pattern_detector.analyze_conversation(
+                text, pattern_engine, workers=settings.detection_workers
+            )
             
             return {
                 "patterns": patterns,
                 "score": score,
                 "pattern_count": len(patterns),
-                "risk_level": self.pattern_detector.get_risk_level(score, len(patterns))
+                "risk_level": self.pattern_detector.get_risk_level(score, len(patterns)),
+                "knowledge_version": pattern_engine.version
             }
             
         except Exception as e:
             logger.error(f"Pattern detection error: {e}")
-            return {"error": str(e), "patterns": [], "score": 0.0}
+            return {
+                "error": str(e),
+                "patterns": [],
+                "score": 0.0,
+                "knowledge_version": pattern_engine.version
+            }
     
     def _analyze_with_nemotron(self, conversation_text: str, 
                               rag_context: Dict[str, Any],
@@ -254,23 +595,61 @@ class MCPOrchestrator:
             
             # Get AI analysis
             ai_analysis = self.nimo_client.analyze_conversation(context)
+            return self._nemotron_results(ai_analysis)
             
-            return {
-                "ai_analysis": ai_analysis,
-                "confidence": ai_analysis.get("confidence", 0.5),
-                "reasoning": ai_analysis.get("reasoning", ""),
-                "risk_assessment": ai_analysis.get("risk_level", "unknown")
+        except Exception as e:
+            return self._nemotron_error(e)
+    
+    @staticmethod
+    def _skip_nemotron(values: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Result of AI analysis skipped because triage settled the risk level; None to run it."""
+        if not values["pattern_results"].get("partial"):
+            return None
+        return {
+            "ai_analysis": {},
+            "confidence": 0.0,
+            "reasoning": "AI analysis skipped: rule-based triage reached the highest risk level",
+            "risk_assessment": "unknown"
+        }
+    
+    async def _analyze_with_nemotron_async(self, conversation_text: str,
+                                           rag_context: Dict[str, Any],
+                                           pattern_results: Dict[str, Any]) -> Dict[str, Any]:
+        """Analyze conversation using Nemotron AI, awaiting the NIM call."""
+        try:
+            context = {
+                "conversation": conversation_text,
+                "pattern_results": pattern_results,
+                "rag_context": rag_context
             }
             
+            ai_analysis = await self.nimo_client.analyze_conversation_async(context)
+            return self._nemotron_results(ai_analysis)
+            
         except Exception as e:
-            logger.error(f"Nemotron analysis error: {e}")
-            return {
-                "error": str(e),
-                "ai_analysis": {},
-                "confidence": 0.0,
-                "reasoning": "AI analysis unavailable due to error",
-                "risk_assessment": "unknown"
-            }
+            return self._nemotron_error(e)
+    
+    @staticmethod
+    def _nemotron_results(ai_analysis: Dict[str, Any]) -> Dict[str, Any]:
+        """Step result of a Nemotron analysis."""
+        return {
+            "ai_analysis": ai_analysis,
+            "confidence": ai_analysis.get("confidence", 0.5),
+            "reasoning": ai_analysis.get("reasoning", ""),
+            "risk_assessment": ai_analysis.get("risk_level", "unknown")
+        }
+    
+    @staticmethod
+    def _nemotron_error(error: Exception) -> Dict[str, Any]:
+        """Step result of a failed Nemotron analysis."""
+        logger.error(f"Nemotron analysis error: {error}")
+        return {
+            "error": str(error),
+            "ai_analysis": {},
+            "confidence": 0.0,
+            "reasoning": "AI analysis unavailable due to error",
+            "risk_assessment": "unknown"
+        }
     
     def _fuse_analyses(self, pattern_results: Dict[str, Any], 
                       nemotron_results: Dict[str, Any]) -> Dict[str, Any]:
@@ -281,7 +660,7 @@ class MCPOrchestrator:
             ai_confidence = nemotron_results.get("confidence", 0.0)
             
             # Weighted fusion - AI is primary detection engine
-            fusion_score = (ai_confidence * 100 * 0.7) + (pattern_score * 0.3)
+            fusion_score = (ai_confidence * 100 * self.fusion_weights["ai"]) + (pattern_score * self.fusion_weights["pattern"])
             
             # Determine final risk level
             pattern_risk = pattern_results.get("risk_level", "safe")
@@ -297,20 +676,24 @@ class MCPOrchestrator:
                 "pattern_contribution": pattern_score * 0.5,
                 "ai_contribution": ai_confidence * 100 * 0.5,
                 "confidence": (ai_confidence + 0.5) / 2,  # Normalized confidence
-                "patterns": pattern_results.get("patterns", [])  # Pass through detected patterns
+                "patterns": pattern_results.get("patterns", []),  # Pass through detected patterns
+                "partial": pattern_results.get("partial", False),
+                "knowledge_version": pattern_results.get("knowledge_version")
             }
             
-        except Exception as e:s
-        logger.error(f"Fusion analysis error: {e}")
-        return {
-            "error": str(e),
-            "fusion_score": 0.0,
-            "final_risk_level": "unknown",
-            "confidence": 0.0
-        }
+        except Exception as e:
+            logger.error(f"Fusion analysis error: {e}")
+            return {
+                "error": str(e),
+                "fusion_score": 0.0,
+                "final_risk_level": "unknown",
+                "confidence": 0.0
+            }
     
-    def _generate_final_report(self, fusion_results: Dict[str, Any], 
-                              rag_context: Dict[str, Any]) -> AnalysisResponse:
+    def _generate_final_report(self, fusion_results: Dict[str, Any],
+                              nemotron_results: Optional[Dict[str, Any]],
+                              rag_context: Dict[str, Any],
+                              context: WorkflowContext) -> AnalysisResponse:
         """Generate the final analysis report."""
         try:
             # Extract results
@@ -319,20 +702,15 @@ class MCPOrchestrator:
             patterns = fusion_results.get("patterns", [])
             
             # Extract AI red flags from Nemotron analysis
-            nemotron_results = {}
-            for step in self.steps:
-                if step.name == "nemotron_analysis" and step.result:
-                    nemotron_results = step.result
-                    break
+            nemotron_results = nemotron_results or {}
             
             ai_red_flags = nemotron_results.get("ai_analysis", {}).get("red_flags", [])
             
-            # Convert AI red flags to PatternInfo objects
+            # Convert AI red flags to pattern records
             ai_patterns = []
             for flag in ai_red_flags:
                 if isinstance(flag, dict):
-                    from ..models.schemas import PatternInfo
-                    ai_patterns.append(PatternInfo(
+                    ai_patterns.append(PatternRecord(
                         name=flag.get("type", "unknown"),
                         severity=flag.get("severity", "medium"),
                         description=flag.get("description", ""),
@@ -340,8 +718,14 @@ class MCPOrchestrator:
                         evidence=flag.get("evidence", "")
                     ))
             
-            # Use AI patterns if available, otherwise fall back to rule-based patterns
-            final_patterns = ai_patterns if ai_patterns else patterns
+            # Use AI patterns if available, otherwise fall back to rule-based patterns.
+            # Internal records become response models only here; reported rule-based
+            # patterns are converted in place so workflow state shares the models.
+            if ai_patterns:
+                final_patterns = ai_patterns
+            else:
+                patterns[:] = to_pattern_models(patterns)
+                final_patterns = patterns
             
             # Convert risk level to enum
             try:
@@ -362,29 +746,31 @@ class MCPOrchestrator:
                         "start_time": step.start_time,
                         "end_time": step.end_time,
                         "duration": (step.end_time - step.start_time) if step.start_time and step.end_time else None
-                    } for step in self.steps
+                    } for step in context.steps
                 ],
                 "fusion_details": fusion_results,
                 "rag_context": rag_context,
-                "processing_metrics": self.metrics.copy()
+                "pattern_knowledge_version": fusion_results.get("knowledge_version"),
+                "processing_metrics": self.metrics.statistics()
             }
             
             return AnalysisResponse(
                 risk_level=risk_level_enum,
                 risk_score=min(risk_score / 100.0, 1.0),  # Normalize to 0-1
-                patterns_detected=final_patterns,
+                patterns_detected=to_pattern_models(final_patterns),
                 red_flags_count=len(final_patterns),
                 suggestions=suggestions,
                 resources=resources,
                 analysis_details=analysis_details,
-                reasoning=fusion_results.get("reasoning", "Analysis completed successfully")
+                reasoning=fusion_results.get("reasoning", "Analysis completed successfully"),
+                partial=fusion_results.get("partial", False)
             )
             
         except Exception as e:
             logger.error(f"Report generation error: {e}")
             return self._get_error_response(str(e))
     
-    def _generate_suggestions(self, risk_level: str, patterns: List[PatternInfo]) -> List[str]:
+    def _generate_suggestions(self, risk_level: str, patterns: List[PatternRecord]) -> List[str]:
         """Generate contextual suggestions based on detected patterns."""
         suggestions = []
         
@@ -445,7 +831,7 @@ class MCPOrchestrator:
         
         return unique_suggestions[:6]  # Limit to 6 suggestions max
     
-    def _get_relevant_resources(self, risk_level: str, patterns: List[PatternInfo]) -> List[str]:
+    def _get_relevant_resources(self, risk_level: str, patterns: List[PatternRecord]) -> List[str]:
         """Get relevant resources based on risk level and patterns."""
         if risk_level == "abuse":
             return [
@@ -478,28 +864,27 @@ class MCPOrchestrator:
             reasoning=f"Analysis failed: {error_message}"
         )
     
-    def _update_metrics(self, processing_time: float, success: bool) -> None:
-        """Update performance metrics."""
-        if success:
-            self.metrics["successful_analyses"] += 1
-        else:
-            self.metrics["failed_analyses"] += 1
-        
-        # Update average processing time
-        total = self.metrics["successful_analyses"] + self.metrics["failed_analyses"]
-        if total > 0:
-            current_avg = self.metrics["average_processing_time"]
-            self.metrics["average_processing_time"] = (
-                (current_avg * (total - 1) + processing_time) / total
-            )
-    
     def get_workflow_status(self) -> Dict[str, Any]:
-        """Get current workflow status and metrics."""
+        """
+        Get current workflow status and metrics.
+        
+        Running steps are those of every analysis in flight; completed and
+        failed steps and the critical path are those of the last analysis
+        that finished. Metrics count how often each stage was on the
+        critical path.
+        """
+        with self._workflows_lock:
+            active = list(self._active_workflows.values())
+            last = self._last_workflow
+            critical_path = self._last_critical_path
         return {
-            "current_step": next((step.name for step in self.steps if step.status == "running"), None),
-            "completed_steps": [step.name for step in self.steps if step.status == "completed"],
-            "failed_steps": [step.name for step in self.steps if step.status == "failed"],
-            "metrics": self.metrics,
-            "steps": [step.__dict__ for step in self.steps]
+            "in_flight": len(active),
+            "running_steps": [step.name for context in active for step in context.steps if step.status == "running"],
+            "completed_steps": [step["name"] for step in last if step["status"] == "completed"],
+            "failed_steps": [step["name"] for step in last if step["status"] == "failed"],
+            "metrics": self.metrics.statistics(),
+            "steps": last,
+            "critical_path": critical_path,
+            "result_cache": self.result_cache.statistics() if self.result_cache is not None else None
         }
 
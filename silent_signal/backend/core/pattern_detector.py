@@ -6,32 +6,229 @@ Production-quality implementation with clean separation of concerns.
 """
 
 import re
+import os
 import json
-from typing import Dict, List, Any, Tuple, Optional
+import time
+import threading
+import multiprocessing
+from bisect import bisect_left, bisect_right
+from typing import Dict, List, Any, Tuple, Optional, Iterable
 from collections import defaultdict
+from dataclasses import dataclass
 import logging
 
-from ..models.schemas import PatternInfo
+import numpy as np
+
+from ..models.records import PatternRecord, EvidenceRecord
+from .pattern_engine import PatternEngine, MatchSpans, indicator_key
+from .token_engine import TokenTrieEngine
+from .mapped_engine import MappedTokenEngine
+from .engine_cache import EngineCache
+from .language_packs import (
+    LanguageDetector, LanguagePack, LanguagePackCache, DEFAULT_LANGUAGE, find_packs, pack_path
+)
+from .text_normalizer import TextNormalizer, NormalizedText
+from .pattern_profiler import PatternProfiler
+from .prefilter import Prefilter, PrefilterStatistics
+from .pattern_overlay import OverlayEngine, OverlayPrefilter
+from .regex_guard import guard_pattern
+from .conversation_index import ConversationIndex, ConversationIndexCache, split_messages, message_digests
 
 logger = logging.getLogger(__name__)
 
+# Literal phrase matchers selectable by name
+MATCHERS = {
+    "regex": PatternEngine,      # substring semantics of the original re.search loop
+    "token": TokenTrieEngine,    # whole-word token sequences
+    "mapped": MappedTokenEngine  # token sequences from a shared memory-mapped automaton
+}
+
+# State inherited by forked pool workers: the compiled engine and the
+# inputs are set here right before the pool forks, so they are never pickled
+_fork_state: Dict[str, Any] = {}
+_fork_lock = threading.Lock()
+
+
+def _fork_pool(workers: int, **state) -> Any:
+    """Fork a process pool whose workers inherit ``state``."""
+    with _fork_lock:
+        _fork_state.update(state)
+        try:
+            return multiprocessing.get_context("fork").Pool(workers)
+        finally:
+            _fork_state.clear()
+
+
+def _count_documents(bounds: Tuple[int, int]) -> List[Tuple[int, Dict[str, float]]]:
+    """Pool worker: per-category counts for a range of batch texts."""
+    detector = _fork_state["detector"]
+    engine = _fork_state["engine"]
+    state = _fork_state["state"]
+    texts = _fork_state["texts"]
+    return [
+        (column, detector._count_text(engine, texts[column], None, state))
+        for column in range(*bounds)
+    ]
+
+
+def _scan_chunk(bounds: Tuple[int, int, int]) -> Tuple[set, Dict[int, int], MatchSpans]:
+    """Pool worker: phrase hits starting in one chunk of a transcript."""
+    engine = _fork_state["engine"]
+    start, stop, scan_end = bounds
+    chunk = _fork_state["text"][start:scan_end]
+    spans = MatchSpans()
+    fuzzy = {}
+    matched = engine.find_phrases(chunk, end=stop - start, spans=spans, fuzzy=fuzzy)
+    return matched, fuzzy, spans
+
+
+def _scan_regex(_: Any = None) -> Tuple[set, MatchSpans]:
+    """Pool worker: regex indicator hits over a whole transcript."""
+    spans = MatchSpans()
+    matched = _fork_state["engine"].find_regex(_fork_state["text"], spans)
+    return matched, spans
+
+
+@dataclass
+class TriageResult:
+    """
+    Pattern detection result that may stop before the whole text is scanned.
+    
+    ``partial`` results list only the patterns found before the risk level
+    became final; the risk level itself is that of the full analysis.
+    """
+    patterns: List[PatternRecord]
+    score: float
+    risk_level: str
+    partial: bool
+
+
+@dataclass
+class BatchAnalysisResult:
+    """
+    Dense pattern detection results for a batch of texts.
+    
+    Arrays are indexed ``[category, text]`` or ``[text]``; pattern records
+    are only built on request via ``patterns()``.
+    """
+    categories: List[str]
+    severities: List[str]
+    descriptions: List[str]
+    hit_counts: np.ndarray      # (n_categories, n_texts) weighted matched indicator counts
+    confidence: np.ndarray      # (n_categories, n_texts) per-category confidence
+    scores: np.ndarray          # (n_texts,) severity-weighted total score
+    pattern_counts: np.ndarray  # (n_texts,) number of categories detected
+    risk_levels: np.ndarray     # (n_texts,) risk level strings
+    
+    def __len__(self) -> int:
+        return int(self.scores.shape[0])
+    
+    def patterns(self, index: int) -> List[PatternRecord]:
+        """Build the detected patterns for one text of the batch."""
+        return [
+            PatternRecord(
+                name=self.categories[c],
+                severity=self.severities[c],
+                description=self.descriptions[c],
+                confidence=float(self.confidence[c, index])
+            )
+            for c in np.flatnonzero(self.hit_counts[:, index])
+        ]
+
+
+@dataclass(frozen=True)
+class DetectorState:
+    """
+    Engine of one knowledge version with the normalizer and prefilter built for it.
+    
+    The three are published together, so an analysis reading the state
+    once never normalizes with the vocabulary of another version.
+    """
+    engine: PatternEngine
+    normalizer: Optional[TextNormalizer]
+    prefilter: Optional[Prefilter]
+
 
 class PatternDetector:
     """
     Advanced pattern detector for emotional abuse patterns.
     
-    Uses regex patterns and keyword matching for detection with
-    configurable severity levels and confidence scoring.
+    Uses a single-pass compiled pattern engine for detection with
+    configurable severity levels and confidence scoring. The engine can be
+    rebuilt from the knowledge file at runtime and is swapped in atomically,
+    together with its normalizer and prefilter, as a new ``DetectorState``;
+    analysis methods read ``self.state`` once, so in-flight calls finish on
+    the version they started with.
     """
     
-    def __init__(self, pattern_knowledge_path: Optional[str] = None):
+    def __init__(self, pattern_knowledge_path: Optional[str] = None,
+                 slang_dictionary_path: Optional[str] = None,
+                 normalize_text: bool = True,
+                 matcher: str = "regex",
+                 fuzzy_categories: Optional[Iterable[str]] = None,
+                 profile: bool = False,
+                 index_size: int = 0,
+                 regex_budget: Optional[float] = None,
+                 prefilter: bool = True,
+                 automaton_dir: Optional[str] = None,
+                 cache: bool = False,
+                 cache_dir: Optional[str] = None,
+                 language_packs: int = 0,
+                 tenant_overlays_path: Optional[str] = None):
         """
         Initialize the pattern detector.
         
         Args:
             pattern_knowledge_path: Path to pattern knowledge JSON file
+            slang_dictionary_path: Path to extra slang expansions JSON file
+            normalize_text: Normalize quotes, elongation and slang before matching
+            matcher: Phrase matcher name, one of ``MATCHERS``
+            fuzzy_categories: Categories that also accept phrases with a
+                one-character typo, in addition to those marked ``"fuzzy"``
+                in the knowledge file
+            profile: Count hits and evaluation time per indicator, reported
+                by ``get_detector_statistics``
+            index_size: Conversations whose per-message hits are kept, so
+                ``analyze_conversation`` only scans messages appended since;
+                0 disables the index
+            regex_budget: Seconds of regex indicator searching allowed per
+                text, 0 for no limit; defaults to the engine's
+            prefilter: Reject short texts no indicator can match before
+                normalizing and scanning them; the share rejected is
+                reported by ``get_detector_statistics``
+            automaton_dir: Directory the ``"mapped"`` matcher keeps its
+                automaton files in; defaults to a temporary directory
+            cache: Keep compiled engines on disk and load them instead of
+                compiling again when nothing they are built from changed
+            cache_dir: Directory of the compiled engine cache, private to
+                the current user; defaults to ``DEFAULT_CACHE_DIR``
+            language_packs: Language packs kept compiled at once. Packs are
+                files like ``pattern_knowledge.es.json`` next to the
+                knowledge file, whose indicators are added to the usual
+                ones on first use for texts detected as their language; 0
+                disables language packs
+            tenant_overlays_path: Path to a JSON file of per-tenant pattern
+                overlays, applied on top of the shared engine for requests
+                naming a tenant
         """
-        self.patterns = self._initialize_patterns()
+        if matcher not in MATCHERS:
+            raise ValueError(f"Unknown pattern matcher {matcher!r}, expected one of {sorted(MATCHERS)}")
+        
+        self.pattern_knowledge_path = pattern_knowledge_path
+        self.slang_dictionary_path = slang_dictionary_path
+        self.normalize_text = normalize_text
+        self.engine_class = MATCHERS[matcher]
+        self.fuzzy_categories = set(fuzzy_categories or ())
+        self.regex_budget = regex_budget
+        self.automaton_dir = automaton_dir
+        self.engine_cache = EngineCache(cache_dir) if cache else None
+        self.language_packs = (
+            LanguagePackCache(language_packs) if language_packs > 0 and pattern_knowledge_path else None
+        )
+        self.tenant_overlays_path = tenant_overlays_path
+        self.profiler = PatternProfiler() if profile else None
+        self.conversation_indexes = ConversationIndexCache(index_size) if index_size > 0 else None
+        self.prefilter_statistics = PrefilterStatistics() if prefilter else None
         self.severity_weights = {
             "critical": 10,
             "high": 7,
@@ -39,8 +236,353 @@ class PatternDetector:
             "low": 2
         }
         
-        if pattern_knowledge_path:
-            self._load_pattern_knowledge(pattern_knowledge_path)
+        # Minimum (score, pattern_count) for each risk level, highest first
+        self.risk_thresholds = {
+            "abuse": (50, 5),
+            "concerning": (20, 3)
+        }
+        
+        # Characters kept between stream chunks so regex indicators that
+        # straddle a chunk boundary are still seen
+        self.stream_regex_overlap = 1024
+        
+        # Hits quoted in the evidence string of each detected pattern
+        self.max_evidence_spans = 5
+        
+        # Parallel detection only pays off above these input sizes
+        self.parallel_min_chunk = 1 << 18   # characters per transcript chunk
+        self.parallel_min_batch = 256       # texts per batch
+        
+        # Longer texts nearly always pass the prefilter, so skip checking them
+        self.prefilter_max_length = 2048
+        
+        # Characters triage scans between checks of the risk level
+        self.triage_chunk = 2048
+        
+        # Hot reload state; only reloads take the lock, never analysis
+        self._reload_lock = threading.Lock()
+        self._watch_stop = threading.Event()
+        self._watcher: Optional[threading.Thread] = None
+        self._knowledge_mtime = self._get_knowledge_mtime()
+        
+        # Compile all categories into one engine once, after knowledge is merged
+        self.state = self._build_state(self._build_engine())
+        
+        # Language packs are found now but only compiled once needed
+        self._pack_lock = threading.Lock()
+        self.language_detector = self._find_language_packs()
+        
+        # Tenant overlays too, once per tenant and engine they apply to
+        self._overlay_lock = threading.Lock()
+        self._overlays: Dict[Tuple[str, str], Tuple[OverlayEngine, Optional[OverlayPrefilter]]] = {}
+        self.tenant_overlays = self._load_tenant_overlays()
+    
+    @property
+    def engine(self) -> PatternEngine:
+        """Current engine."""
+        return self.state.engine
+    
+    @property
+    def normalizer(self) -> Optional[TextNormalizer]:
+        """Normalizer of the current engine, or None if normalization is disabled."""
+        return self.state.normalizer
+    
+    @property
+    def prefilter(self) -> Optional[Prefilter]:
+        """Prefilter of the current engine, or None if prefiltering is disabled."""
+        return self.state.prefilter
+    
+    @property
+    def patterns(self) -> Dict[str, Dict]:
+        """Pattern configuration of the current engine."""
+        return self.engine.patterns
+    
+    def _build_state(self, engine: PatternEngine) -> DetectorState:
+        """
+        Build the normalizer and prefilter of an engine.
+        
+        Elongated words may collapse to single letters where that spells a
+        word of the engine's indicators, so the normalizer's vocabulary is
+        built from them; the prefilter expands slang with that normalizer.
+        """
+        normalizer = TextNormalizer(
+            self.slang_dictionary_path, vocabulary=engine.words()
+        ) if self.normalize_text else None
+        return DetectorState(engine, normalizer, self._build_prefilter(engine, normalizer))
+    
+    def _build_engine(self, strict: bool = False, language: Optional[str] = None) -> PatternEngine:
+        """
+        Build a new engine from the built-in patterns plus the knowledge file.
+        
+        With the engine cache enabled, an engine compiled from the same
+        inputs before is loaded instead. A ``"mapped"`` engine whose
+        automaton file was built from the same inputs is opened from the
+        file without reading the knowledge file at all. Strict builds
+        always compile, so a broken knowledge file still raises.
+        
+        Args:
+            strict: Raise if a knowledge file fails to load
+            language: Language of a pack whose indicators are added to
+                the built-in and knowledge file ones, so mixed-language
+                texts are matched in both; confidence is relative to the
+                combined category sizes
+        """
+        knowledge_paths = []
+        if self.pattern_knowledge_path:
+            knowledge_paths.append(self.pattern_knowledge_path)
+            if language is not None:
+                knowledge_paths.append(pack_path(self.pattern_knowledge_path, language))
+        
+        patterns = self._initialize_patterns()
+        mapped = issubclass(self.engine_class, MappedTokenEngine)
+        # The automaton file of a mapped engine is its cache
+        engine_cache = self.engine_cache if not mapped else None
+        key = None
+        if engine_cache is not None or mapped:
+            key = EngineCache.key([self.engine_class], {
+                "patterns": patterns,
+                "language": language,
+                "fuzzy_categories": sorted(self.fuzzy_categories),
+                "regex_budget": self.regex_budget,
+                "automaton_dir": self.automaton_dir
+            }, knowledge_paths)
+        if mapped and not strict:
+            engine = self.engine_class.open(key, regex_budget=self.regex_budget,
+                                            automaton_dir=self.automaton_dir)
+            if engine is not None:
+                return engine
+        if engine_cache is not None and not strict:
+            engine = engine_cache.load(key)
+            if engine is not None:
+                return engine
+        
+        for knowledge_path in knowledge_paths:
+            self._load_pattern_knowledge(patterns, knowledge_path, strict)
+        for pattern_name in self.fuzzy_categories:
+            if pattern_name in patterns:
+                patterns[pattern_name]['fuzzy'] = True
+            else:
+                logger.warning(f"Unknown fuzzy pattern category: {pattern_name}")
+        if mapped:
+            engine = self.engine_class(patterns, regex_budget=self.regex_budget,
+                                       automaton_dir=self.automaton_dir, source=key)
+        else:
+            engine = self.engine_class(patterns, regex_budget=self.regex_budget)
+        if engine_cache is not None:
+            engine_cache.store(key, engine)
+        return engine
+    
+    def _build_prefilter(self, engine: PatternEngine,
+                         normalizer: Optional[TextNormalizer]) -> Optional[Prefilter]:
+        """Build the prefilter of an engine, if prefiltering is enabled."""
+        if self.prefilter_statistics is None:
+            return None
+        if self.engine_cache is None:
+            return Prefilter(engine, normalizer)
+        
+        # The engine version hashes the patterns the engine was built from
+        key = self.engine_cache.key([Prefilter, TextNormalizer, type(engine)], {
+            "engine": engine.version,
+            "slang": normalizer.slang if normalizer is not None else None
+        })
+        prefilter = self.engine_cache.load(key)
+        if prefilter is None:
+            prefilter = Prefilter(engine, normalizer)
+            self.engine_cache.store(key, prefilter)
+        return prefilter
+    
+    def _find_language_packs(self) -> Optional[LanguageDetector]:
+        """Detector for the languages with a pack, or None if there are none."""
+        if self.language_packs is None:
+            return None
+        languages = find_packs(self.pattern_knowledge_path)
+        if not languages:
+            return None
+        logger.info(f"Language packs available: {sorted(languages)}")
+        return LanguageDetector(languages)
+    
+    def _load_tenant_overlays(self, strict: bool = False) -> Dict[str, Dict]:
+        """
+        Read the tenant overlay file.
+        
+        Each tenant's overlay has the knowledge file's layout under
+        ``"patterns"`` (extra indicators, severity and description per
+        category, new categories) plus a ``"suppress"`` list of indicators
+        the tenant does not want flagged.
+        
+        Args:
+            strict: Raise if the file fails to load
+        
+        Returns:
+            Overlay configuration keyed by tenant id
+        """
+        if not self.tenant_overlays_path:
+            return {}
+        try:
+            with open(self.tenant_overlays_path, 'r', encoding='utf-8') as f:
+                overlays = json.load(f)
+            for tenant, overlay in overlays.items():
+                if not isinstance(overlay, dict) or not isinstance(overlay.get("patterns", {}), dict) \
+                        or not isinstance(overlay.get("suppress", []), list):
+                    raise ValueError(f"Malformed overlay for tenant {tenant!r}")
+            logger.info(f"Loaded pattern overlays for {len(overlays)} tenants from {self.tenant_overlays_path}")
+            return overlays
+        except Exception as e:
+            if strict:
+                raise
+            logger.warning(f"Failed to load tenant overlays from {self.tenant_overlays_path}: {e}")
+            return {}
+    
+    def engine_for(self, text: str, tenant_id: Optional[str] = None) -> PatternEngine:
+        """
+        Engine for the language of a text and, optionally, a tenant.
+        
+        Texts in a language with a pack get an engine compiled from the
+        usual patterns plus the pack's, built on first use and kept in a least recently used cache;
+        all others get the current engine. A pack that changed on disk is
+        compiled again. A tenant's overlay is applied on top of that
+        engine, compiled once per tenant and engine.
+        
+        Args:
+            text: Text about to be analyzed
+            tenant_id: Tenant whose overlay applies, if any
+        
+        Returns:
+            Engine snapshot to analyze the text with
+        
+        Raises:
+            KeyError: If the tenant has no overlay
+        """
+        engine = self._language_engine(text)
+        if tenant_id is None:
+            return engine
+        
+        overlay = self.tenant_overlays[tenant_id]
+        key = (tenant_id, engine.version)
+        compiled = self._overlays.get(key)
+        if compiled is None:
+            with self._overlay_lock:
+                compiled = self._overlays.get(key)
+                if compiled is None:
+                    tenant_engine = OverlayEngine(engine, overlay)
+                    compiled = tenant_engine, self._build_overlay_prefilter(tenant_engine)
+                    self._overlays[key] = compiled
+        return compiled[0]
+    
+    def _build_overlay_prefilter(self, engine: OverlayEngine) -> Optional[OverlayPrefilter]:
+        """Build the prefilter of a tenant engine from its base engine's, if there is one."""
+        base = self._prefilter_for(engine.base)
+        if base is None:
+            return None
+        delta = Prefilter(engine.delta, self.normalizer) if engine.delta is not None else None
+        return OverlayPrefilter(engine, base, delta)
+    
+    def _language_engine(self, text: str) -> PatternEngine:
+        """Engine for the language of a text, as described in ``engine_for``."""
+        engine = self.engine
+        detector = self.language_detector
+        if detector is None:
+            return engine
+        language = detector.detect(text)
+        if language is None or language == DEFAULT_LANGUAGE:
+            return engine
+        
+        mtime = self._get_knowledge_mtime(pack_path(self.pattern_knowledge_path, language))
+        if mtime is None:
+            return engine
+        pack = self.language_packs.get(language)
+        if pack is not None and pack.mtime == mtime and pack.base_version == engine.version:
+            return pack.engine
+        
+        # One pack compiles at a time, and only once however many requests wait
+        with self._pack_lock:
+            pack = self.language_packs.get(language)
+            if pack is None or pack.mtime != mtime or pack.base_version != engine.version:
+                pack_engine = self._build_engine(language=language)
+                pack_prefilter = self._build_prefilter(pack_engine, self.normalizer)
+                pack = LanguagePack(language, pack_engine, pack_prefilter, mtime, engine.version)
+                self.language_packs.store(pack)
+                logger.info(f"Language pack {language} loaded as pattern engine {pack_engine.version}")
+        return pack.engine
+    
+    def reload(self) -> str:
+        """
+        Rebuild the engine from the knowledge file and swap it in.
+        
+        The new engine, its normalizer and its prefilter are built off to
+        the side and published with a single assignment of ``self.state``.
+        A knowledge file that fails to load raises and leaves the current
+        state in place.
+        
+        Returns:
+            Knowledge version now in use
+        """
+        with self._reload_lock:
+            self._knowledge_mtime = self._get_knowledge_mtime()
+            engine = self._build_engine(strict=True)
+            self.language_detector = self._find_language_packs()
+            self.tenant_overlays = self._load_tenant_overlays(strict=True)
+            with self._overlay_lock:
+                self._overlays.clear()
+            if engine.version != self.engine.version:
+                previous = self.engine.version
+                self.state = self._build_state(engine)
+                if self.conversation_indexes is not None:
+                    # Indexed hits belong to the old engine
+                    self.conversation_indexes.clear()
+                if self.language_packs is not None:
+                    # Packs were compiled on top of the old knowledge
+                    self.language_packs.clear()
+                logger.info(f"Pattern knowledge reloaded: {previous} -> {engine.version}")
+            return self.engine.version
+    
+    def start_watching(self, interval: float = 5.0) -> None:
+        """
+        Watch the knowledge file and reload whenever it changes.
+        
+        Args:
+            interval: Seconds between modification-time checks
+        """
+        if not self.pattern_knowledge_path or self._watcher is not None:
+            return
+        
+        self._watch_stop.clear()
+        self._watcher = threading.Thread(
+            target=self._watch_knowledge_file,
+            args=(interval,),
+            name="pattern-knowledge-watcher",
+            daemon=True
+        )
+        self._watcher.start()
+        logger.info(f"Watching {self.pattern_knowledge_path} every {interval}s")
+    
+    def stop_watching(self) -> None:
+        """Stop the knowledge file watcher, if running."""
+        if self._watcher is None:
+            return
+        self._watch_stop.set()
+        self._watcher.join()
+        self._watcher = None
+    
+    def _watch_knowledge_file(self, interval: float) -> None:
+        """Watcher thread loop."""
+        while not self._watch_stop.wait(interval):
+            if self._get_knowledge_mtime() == self._knowledge_mtime:
+                continue
+            try:
+                self.reload()
+            except Exception as e:
+                logger.error(f"Pattern knowledge reload failed, keeping {self.engine.version}: {e}")
+    
+    def _get_knowledge_mtime(self, path: Optional[str] = None) -> Optional[float]:
+        """Modification time of the knowledge file (or another), or None if unavailable."""
+        path = path or self.pattern_knowledge_path
+        if not path:
+            return None
+        try:
+            return os.stat(path).st_mtime
+        except OSError:
+            return None
     
     def _initialize_patterns(self) -> Dict[str, Dict]:
         """Initialize comprehensive patterns for detection."""
@@ -257,35 +799,62 @@ class PatternDetector:
             }
         }
     
-    def _load_pattern_knowledge(self, knowledge_path: str) -> None:
-        """Load additional pattern knowledge from JSON file."""
+    def _load_pattern_knowledge(self, patterns: Dict[str, Dict], knowledge_path: str,
+                                strict: bool = False) -> None:
+        """
+        Merge additional pattern knowledge from JSON file into ``patterns``.
+        
+        Indicators from the file go through ``guard_pattern`` first:
+        escaped phrases become literals, and regexes prone to catastrophic
+        backtracking are rewritten or dropped.
+        """
         try:
             with open(knowledge_path, 'r', encoding='utf-8') as f:
                 knowledge_data = json.load(f)
                 
             # Merge with existing patterns
             for pattern_name, pattern_data in knowledge_data.items():
-                if pattern_name in self.patterns:
-                    # Update existing pattern
+                if 'patterns' in pattern_data:
+                    guarded = (guard_pattern(pattern) for pattern in pattern_data['patterns'])
+                    pattern_data = dict(pattern_data, patterns=[
+                        pattern for pattern in guarded if pattern is not None
+                    ])
+                
+                if pattern_name in patterns:
+                    # Update existing pattern, skipping indicators it already has
                     if 'patterns' in pattern_data:
-                        self.patterns[pattern_name]['patterns'].extend(pattern_data['patterns'])
+                        existing = patterns[pattern_name]['patterns']
+                        known = {indicator_key(pattern) for pattern in existing}
+                        for pattern in pattern_data['patterns']:
+                            if indicator_key(pattern) not in known:
+                                known.add(indicator_key(pattern))
+                                existing.append(pattern)
                     if 'severity' in pattern_data:
-                        self.patterns[pattern_name]['severity'] = pattern_data['severity']
+                        patterns[pattern_name]['severity'] = pattern_data['severity']
                     if 'description' in pattern_data:
-                        self.patterns[pattern_name]['description'] = pattern_data['description']
+                        patterns[pattern_name]['description'] = pattern_data['description']
+                    if 'fuzzy' in pattern_data:
+                        patterns[pattern_name]['fuzzy'] = pattern_data['fuzzy']
                 else:
                     # Add new pattern
-                    self.patterns[pattern_name] = pattern_data
+                    patterns[pattern_name] = pattern_data
                     
         except Exception as e:
+            if strict:
+                raise
             logger.warning(f"Failed to load pattern knowledge from {knowledge_path}: {e}")
     
-    def analyze_text(self, text: str) -> Tuple[List[PatternInfo], float]:
+    def analyze_text(self, text: str, engine: Optional[PatternEngine] = None,
+                     workers: int = 1) -> Tuple[List[PatternRecord], float]:
         """
         Analyze text for emotional abuse patterns.
         
         Args:
             text: Input text to analyze
+            engine: Engine snapshot to use; defaults to the engine for
+                the language of the text
+            workers: Worker processes for very long transcripts; results
+                are identical to the serial scan
             
         Returns:
             Tuple of (detected_patterns, total_score)
@@ -293,39 +862,651 @@ class PatternDetector:
         if not text or not text.strip():
             return [], 0.0
             
+        engine = engine or self.engine_for(text)
+        
+        # Single scan over the text for every category at once, recording
+        # the offsets of every hit so rule-based results carry evidence
+        text_lower = text.lower()
+        if self._prefilter_rejects(engine, text_lower):
+            return [], 0.0
+        spans = MatchSpans()
+        match_counts = self._scan(engine, text_lower, workers, spans)
+        
+        # Offsets index the lowercased text; quote the original when they agree
+        source = text if len(text) == len(text_lower) else text_lower
+        evidence = self._collect_evidence(engine, source, spans)
+        return self._score_matches(engine, match_counts, evidence)
+    
+    def triage_text(self, text: str, engine: Optional[PatternEngine] = None) -> TriageResult:
+        """
+        Analyze text only until its risk level can no longer change.
+        
+        Scores and pattern counts only grow as more hits are found, so once
+        the risk level is the highest one, the rest of the text cannot
+        change it. The text is scanned in chunks of about ``triage_chunk``
+        characters, with the risk level checked after each chunk that adds
+        hits; regex indicators are searched last, over the whole text.
+        
+        Args:
+            text: Input text to analyze
+            engine: Engine snapshot to use; defaults to the engine for
+                the language of the text
+            
+        Returns:
+            Result marked ``partial`` if scanning stopped early
+        """
+        if not text or not text.strip():
+            return TriageResult([], 0.0, self.get_risk_level(0.0, 0), False)
+        
+        engine = engine or self.engine_for(text)
         text_lower = text.lower()
+        if self._prefilter_rejects(engine, text_lower):
+            return TriageResult([], 0.0, self.get_risk_level(0.0, 0), False)
+        
+        final_level = next(iter(self.risk_thresholds))
+        normalized = self._normalize(text_lower)
+        scan_text = normalized.text
+        bounds = self._cut_bounds(engine, scan_text, -(-len(scan_text) // self.triage_chunk))
+        
+        profiler = self.profiler
+        phrase_scan_ns = 0
+        timings: Optional[Dict[int, int]] = {} if profiler is not None else None
+        
+        matched = set()
+        fuzzy: Dict[int, int] = {}
+        chunk_spans: List[MatchSpans] = []
+        for position, (start, stop, scan_end) in enumerate(bounds):
+            spans = MatchSpans()
+            chunk_fuzzy: Dict[int, int] = {}
+            started = time.perf_counter_ns()
+            found = engine.find_phrases(scan_text[start:scan_end], end=stop - start,
+                                        spans=spans, fuzzy=chunk_fuzzy)
+            phrase_scan_ns += time.perf_counter_ns() - started
+            chunk_spans.append(spans)
+            for indicator, distance in chunk_fuzzy.items():
+                fuzzy[indicator] = min(distance, fuzzy.get(indicator, distance))
+            added = found - matched
+            matched |= found
+            # Stopping only pays off with chunks or regex indicators left
+            partial = position + 1 < len(bounds) or bool(engine.regex_patterns)
+            if partial and (added or chunk_fuzzy) and self._triage_level(engine, matched, fuzzy) == final_level:
+                break
+        else:
+            regex_spans = MatchSpans()
+            matched |= engine.find_regex(scan_text, regex_spans, timings=timings)
+            chunk_spans.append(regex_spans)
+            partial = False
+        
+        # Same span order as a full scan: exact, approximate, regex
+        spans = MatchSpans()
+        for approximate in (False, True):
+            for (start, _, _), found_spans in zip(bounds, chunk_spans):
+                spans.extend(found_spans, start, approximate)
+        if len(chunk_spans) > len(bounds):
+            spans.extend(chunk_spans[-1])
+        if normalized.starts is not None:
+            for i in range(len(spans)):
+                spans.starts[i], spans.ends[i] = normalized.original_span(spans.starts[i], spans.ends[i])
+        
+        match_counts = engine.aggregate(matched, fuzzy)
+        if profiler is not None:
+            # Partial scans count the hits found before stopping
+            profiler.record(engine, matched, fuzzy, match_counts, phrase_scan_ns, timings)
+        source = text if len(text) == len(text_lower) else text_lower
+        evidence = self._collect_evidence(engine, source, spans)
+        patterns, score = self._score_matches(engine, match_counts, evidence)
+        return TriageResult(patterns, score, self.get_risk_level(score, len(patterns)), partial)
+    
+    def _triage_level(self, engine: PatternEngine, matched: set, fuzzy: Dict[int, int]) -> str:
+        """Risk level of the hits found so far."""
+        patterns, score = self._score_matches(engine, engine.aggregate(matched, fuzzy))
+        return self.get_risk_level(score, len(patterns))
+    
+    def analyze_conversation(self, text: str, engine: Optional[PatternEngine] = None,
+                             workers: int = 1) -> Tuple[List[PatternRecord], float]:
+        """
+        Analyze a conversation that may extend one analyzed before.
+        
+        Messages are the lines of the text. Hits are indexed per message, so
+        when the conversation starts with one still in the index only the
+        messages appended since (and the last few before them, whose hits
+        could run into the new text) are scanned, and the totals are updated
+        from per-message hit bitmaps. Results match ``analyze_text``.
+        
+        Args:
+            text: Conversation text, one message per line
+            engine: Engine snapshot to use; defaults to the engine for
+                the language of the text
+            workers: Worker processes for very long unindexed text
+            
+        Returns:
+            Tuple of (detected_patterns, total_score)
+        """
+        indexes = self.conversation_indexes
+        if indexes is None:
+            return self.analyze_text(text, engine, workers)
+        if not text or not text.strip():
+            return [], 0.0
+        
+        engine = engine or self.engine_for(text)
+        messages = split_messages(text)
+        digests = message_digests(messages)
+        index = indexes.checkout(digests, engine.version)
+        if index is None:
+            index = ConversationIndex(engine.version, len(engine.indicators))
+        
+        if len(messages) > len(index):
+            index.truncate(index.complete)
+            if not self._index_messages(engine, index, messages, digests, workers):
+                # Lowercasing changed offsets; such text is not indexed
+                return self.analyze_text(text, engine, workers)
+        
+        evidence: Dict[str, List[EvidenceRecord]] = defaultdict(list)
+        for message in index.messages:
+            for indicator, span in message.evidence:
+                for category in engine.indicator_categories[indicator]:
+                    if span.edit_distance and category not in engine.fuzzy_categories:
+                        continue
+                    evidence[category].append(span)
+        
+        match_counts = engine.aggregate(index.matched(), index.fuzzy())
+        indexes.store(index)
+        return self._score_matches(engine, match_counts, self._quote_evidence(text, evidence))
+    
+    def _index_messages(self, engine: PatternEngine, index: ConversationIndex,
+                        messages: List[str], digests: List[bytes], workers: int) -> bool:
+        """
+        Scan the messages after those already indexed and append their hits.
+        
+        The remaining text is scanned as one piece, exactly like a one-shot
+        scan of its own, and every hit is attributed to the message it
+        starts in. Hits starting before the piece were already final, since
+        their messages were followed by enough text when they were indexed.
+        
+        Returns:
+            False if the text cannot be indexed because lowercasing changes
+            its length
+        """
+        first = len(index)
+        offset = index.end
+        region = "".join(messages[first:])
+        region_lower = region.lower()
+        if len(region_lower) != len(region):
+            return False
+        
+        spans = MatchSpans()
+        normalized = self._normalize(region_lower)
+        if not self._prefilter_rejects(engine, region_lower):
+            self._scan(engine, region_lower, workers, spans, normalized)
+        
+        line_starts = [0]
+        for message in messages[first:-1]:
+            line_starts.append(line_starts[-1] + len(message))
+        
+        hits: List[List[Tuple[int, EvidenceRecord]]] = [[] for _ in line_starts]
+        for indicator, start, end, distance in zip(spans.indicators, spans.starts,
+                                                   spans.ends, spans.distances):
+            line = bisect_right(line_starts, start) - 1
+            hits[line].append((indicator, EvidenceRecord(
+                indicator=engine.indicators[indicator],
+                start=offset + start,
+                end=offset + end,
+                line=first + line + 1,
+                speaker=self._speaker(region[line_starts[line]:start]),
+                edit_distance=distance
+            )))
+        
+        for line, line_start in enumerate(line_starts):
+            matched = set()
+            fuzzy: Dict[int, int] = {}
+            for indicator, span in hits[line]:
+                if span.edit_distance:
+                    fuzzy[indicator] = min(span.edit_distance, fuzzy.get(indicator, span.edit_distance))
+                else:
+                    matched.add(indicator)
+            end = offset + line_start + len(messages[first + line])
+            index.append(digests[first + line], end, matched, fuzzy, hits[line])
+        
+        # Messages are final once the scan saw enough text after them to
+        # complete any phrase (and regex hit) starting inside them
+        complete = len(index)
+        overlap = self.stream_regex_overlap if engine.regex_patterns else 0
+        text_end = len(normalized.text)
+        for line in range(len(line_starts) - 1, -1, -1):
+            line_end = line_starts[line + 1] if line + 1 < len(line_starts) else len(region)
+            if normalized.starts is not None:
+                line_end = bisect_left(normalized.starts, line_end)
+            if engine.scan_end(normalized.text, line_end) < text_end and text_end - line_end >= overlap:
+                break
+            complete = first + line
+        index.complete = complete
+        return True
+    
+    def _scan(self, engine: PatternEngine, text_lower: str, workers: int, spans: MatchSpans,
+              normalized: Optional[NormalizedText] = None) -> Dict[str, float]:
+        """
+        Normalize and scan lowercased text, recording hits at offsets into it.
+        
+        Args:
+            engine: Engine to scan with
+            text_lower: Lowercased input text
+            workers: Worker processes for very long text
+            spans: Span record to append every hit to
+            normalized: ``text_lower`` already normalized, if available
+            
+        Returns:
+            Mapping of category name to (weighted) number of matched indicators
+        """
+        normalized = normalized or self._normalize(text_lower)
+        bounds = self._chunk_bounds(engine, normalized.text, workers)
+        if len(bounds) > 1 and self._can_fork():
+            match_counts = self._count_matches_parallel(engine, normalized.text, bounds, workers, spans)
+        else:
+            match_counts = engine.count_matches(normalized.text, spans, self.profiler)
+        
+        # Point spans found in the normalized text back at the input
+        if normalized.starts is not None:
+            for i in range(len(spans)):
+                spans.starts[i], spans.ends[i] = normalized.original_span(spans.starts[i], spans.ends[i])
+        return match_counts
+    
+    def _prefilter_rejects(self, engine: PatternEngine, text_lower: str) -> bool:
+        """
+        Check a text against the engine's prefilter, counting the outcome.
+        
+        Args:
+            engine: Engine the text is about to be scanned with
+            text_lower: Lowercased input text
+            
+        Returns:
+            True if no indicator can match, so the scan can be skipped
+        """
+        prefilter = self._prefilter_for(engine)
+        if prefilter is None or len(text_lower) > self.prefilter_max_length:
+            return False
+        rejected = not prefilter.may_match(text_lower)
+        self.prefilter_statistics.record(rejected)
+        if rejected and self.profiler is not None:
+            # Still a profiled text, one without hits
+            self.profiler.record(engine, set(), None, {}, 0, {})
+        return rejected
+    
+    def _prefilter_for(self, engine: PatternEngine) -> Optional[Prefilter]:
+        """Prefilter built for an engine, or None if there is none."""
+        prefilter = self.prefilter
+        if prefilter is None or prefilter.version == engine.version:
+            return prefilter
+        if isinstance(engine, OverlayEngine):
+            for tenant_engine, prefilter in list(self._overlays.values()):
+                if tenant_engine is engine:
+                    return prefilter
+            return None
+        if self.language_packs is not None:
+            return self.language_packs.prefilter(engine.version)
+        return None
+    
+    def _can_fork(self) -> bool:
+        """Whether parallel detection is available on this platform."""
+        if "fork" in multiprocessing.get_all_start_methods():
+            return True
+        logger.warning("Parallel detection needs the fork start method; scanning serially")
+        return False
+    
+    def _chunk_bounds(self, engine: PatternEngine, text: str,
+                      workers: int) -> List[Tuple[int, int, int]]:
+        """
+        Split text into chunks of match start positions for parallel scanning.
+        
+        Chunks are cut right after whitespace, so no token straddles a cut,
+        and each extends to the engine's ``scan_end`` so every match
+        starting inside it is seen whole.
+        
+        Returns:
+            List of (start, stop, scan_end) tuples, a single one if the text
+            is too short to be worth splitting
+        """
+        return self._cut_bounds(engine, text, min(workers, len(text) // self.parallel_min_chunk))
+    
+    def _cut_bounds(self, engine: PatternEngine, text: str, count: int) -> List[Tuple[int, int, int]]:
+        """Split text into at most ``count`` chunks, as described in ``_chunk_bounds``."""
+        if count < 2:
+            return [(0, len(text), len(text))]
+        
+        whitespace = re.compile(r"\s")
+        cuts = [0]
+        for i in range(1, count):
+            boundary = whitespace.search(text, max(len(text) * i // count, cuts[-1]))
+            if boundary is None:
+                break
+            cuts.append(boundary.end())
+        cuts.append(len(text))
+        
+        return [
+            (start, stop, engine.scan_end(text, stop))
+            for start, stop in zip(cuts, cuts[1:])
+            if stop > start
+        ]
+    
+    def _count_matches_parallel(self, engine: PatternEngine, text: str,
+                                bounds: List[Tuple[int, int, int]], workers: int,
+                                spans: MatchSpans) -> Dict[str, float]:
+        """
+        Parallel ``engine.count_matches`` over chunks of one long text.
+        
+        Hit sets are unioned before aggregation, so phrases found in two
+        chunks' overlap are counted once; spans are merged in the order the
+        serial scan records them (exact, approximate, regex).
+        """
+        with _fork_pool(workers, engine=engine, text=text) as pool:
+            regex_result = pool.apply_async(_scan_regex) if engine.regex_patterns else None
+            results = pool.map(_scan_chunk, bounds)
+            regex_matched, regex_spans = regex_result.get() if regex_result else (set(), MatchSpans())
+        
+        matched = set()
+        fuzzy: Dict[int, int] = {}
+        for chunk_matched, chunk_fuzzy, _ in results:
+            matched |= chunk_matched
+            for indicator, distance in chunk_fuzzy.items():
+                fuzzy[indicator] = min(distance, fuzzy.get(indicator, distance))
+        
+        for approximate in (False, True):
+            for (start, _, _), (_, _, chunk_spans) in zip(bounds, results):
+                spans.extend(chunk_spans, start, approximate)
+        spans.extend(regex_spans)
+        
+        matched |= regex_matched
+        match_counts = engine.aggregate(matched, fuzzy)
+        if self.profiler is not None:
+            # Hits only; evaluation time spent in workers is not attributed
+            self.profiler.record(engine, matched, fuzzy, match_counts, 0, {})
+        return match_counts
+    
+    def analyze_stream(self, chunks: Iterable[str],
+                       engine: Optional[PatternEngine] = None) -> Tuple[List[PatternRecord], float]:
+        """
+        Analyze text that arrives chunk by chunk, e.g. from a generator or file.
+        
+        Only the tail of the buffer that could still start a match is carried
+        over, so memory stays bounded by the chunk size while phrases
+        spanning a chunk boundary are still found. Results match ``analyze_text`` on the
+        concatenated text.
+        
+        Args:
+            chunks: Iterable of text chunks in order
+            engine: Engine snapshot to use; defaults to the current engine
+            
+        Returns:
+            Tuple of (detected_patterns, total_score)
+        """
+        state = self.state
+        engine = engine or state.engine
+        matched = set()
+        fuzzy = {}
+        has_content = False
+        
+        # Lowercased text not yet normalized; it is held back to the last
+        # word boundary because slang words and letter runs never cross one
+        pending = ""
+        
+        # Literal matches are accepted by start position once the engine
+        # reports them final; ``scanned`` is the first unaccepted start.
+        buffer = ""
+        scanned = 0
+        overlap = self.stream_regex_overlap if engine.regex_patterns else 0
+        
+        profiler = self.profiler
+        phrase_scan_ns = 0
+        timings: Optional[Dict[int, int]] = {} if profiler is not None else None
+        
+        for chunk in chunks:
+            if not chunk:
+                continue
+            has_content = has_content or not chunk.isspace()
+            pending += chunk.lower()
+            
+            cut = len(pending)
+            if state.normalizer is not None:
+                while cut and (pending[cut - 1].isalnum() or pending[cut - 1] == "_"):
+                    cut -= 1
+                if not cut and len(pending) < self.stream_regex_overlap:
+                    continue
+                cut = cut or len(pending)
+            buffer += self._normalize(pending[:cut], state).text
+            pending = pending[cut:]
+            
+            limit = engine.stream_limit(buffer, scanned)
+            if limit > scanned:
+                started = time.perf_counter_ns()
+                matched |= engine.find_phrases(buffer, scanned, limit, fuzzy=fuzzy)
+                phrase_scan_ns += time.perf_counter_ns() - started
+                scanned = limit
+            matched |= engine.find_regex(buffer, timings=timings)
+            
+            drop = min(len(buffer) - overlap, scanned)
+            if drop > 0:
+                buffer = buffer[drop:]
+                scanned -= drop
+        
+        if not has_content:
+            return [], 0.0
+        
+        if pending:
+            buffer += self._normalize(pending, state).text
+            matched |= engine.find_regex(buffer, timings=timings)
+        started = time.perf_counter_ns()
+        matched |= engine.find_phrases(buffer, scanned, fuzzy=fuzzy)
+        phrase_scan_ns += time.perf_counter_ns() - started
+        
+        match_counts = engine.aggregate(matched, fuzzy)
+        if profiler is not None:
+            profiler.record(engine, matched, fuzzy, match_counts, phrase_scan_ns, timings)
+        return self._score_matches(engine, match_counts)
+    
+    def analyze_file(self, file_path: str,
+                     chunk_size: int = 1 << 16) -> Tuple[List[PatternRecord], float]:
+        """
+        Analyze a text file without loading it into memory.
+        
+        Args:
+            file_path: Path to a UTF-8 text file
+            chunk_size: Number of characters read per chunk
+            
+        Returns:
+            Tuple of (detected_patterns, total_score)
+        """
+        with open(file_path, 'r', encoding='utf-8') as f:
+            return self.analyze_stream(iter(lambda: f.read(chunk_size), ""))
+    
+    def canonical_text(self, text: str) -> str:
+        """Text as the engines see it: stripped, lowercased and, if enabled, normalized."""
+        return self._normalize(text.strip().lower()).text
+    
+    def _normalize(self, text_lower: str, state: Optional[DetectorState] = None) -> NormalizedText:
+        """Run the normalization stage of a state (the current one by default), if enabled."""
+        normalizer = (state or self.state).normalizer
+        if normalizer is None:
+            return NormalizedText(text_lower)
+        return normalizer.normalize(text_lower)
+    
+    def _collect_evidence(self, engine: PatternEngine, text: str,
+                          spans: MatchSpans) -> Dict[str, Tuple[str, List[EvidenceRecord]]]:
+        """
+        Resolve recorded hits into per-category evidence.
+        
+        Line numbers come from a newline index and the speaker from a
+        ``Name:`` prefix on the hit's line, as in chat exports.
+        
+        Args:
+            engine: Engine that recorded the spans
+            text: Text the span offsets refer to
+            spans: Hits recorded during the scan
+            
+        Returns:
+            Mapping of category name to (evidence string, evidence spans)
+        """
+        if not spans:
+            return {}
+        
+        line_starts = [0]
+        line_starts.extend(match.end() for match in re.finditer("\n", text))
+        
+        by_category: Dict[str, List[EvidenceRecord]] = defaultdict(list)
+        for indicator, start, end, distance in zip(spans.indicators, spans.starts,
+                                                   spans.ends, spans.distances):
+            line = bisect_right(line_starts, start) - 1
+            span = EvidenceRecord(
+                indicator=engine.indicators[indicator],
+                start=start,
+                end=end,
+                line=line + 1,
+                speaker=self._speaker(text[line_starts[line]:start]),
+                edit_distance=distance
+            )
+            for category in engine.indicator_categories[indicator]:
+                if distance and category not in engine.fuzzy_categories:
+                    continue
+                by_category[category].append(span)
+        return self._quote_evidence(text, by_category)
+        
+    @staticmethod
+    def _speaker(prefix: str) -> Optional[str]:
+        """Speaker named by a ``Name:`` prefix of a line, if any."""
+        if ":" not in prefix:
+            return None
+        speaker = prefix.split(":", 1)[0].strip() or None
+        if speaker and len(speaker) > 32:
+            return None
+        return speaker
+    
+    def _quote_evidence(self, text: str, by_category: Dict[str, List[EvidenceRecord]]
+                        ) -> Dict[str, Tuple[str, List[EvidenceRecord]]]:
+        """Sort each category's hits and quote the first few from the text."""
+        evidence = {}
+        for category, category_spans in by_category.items():
+            category_spans.sort(key=lambda span: (span.start, span.end))
+            quotes = []
+            for span in category_spans[:self.max_evidence_spans]:
+                location = f"line {span.line}, {span.speaker}" if span.speaker else f"line {span.line}"
+                if span.edit_distance:
+                    location += ", approximate"
+                quotes.append(f'"{text[span.start:span.end]}" ({location})')
+            evidence[category] = ("; ".join(quotes), category_spans)
+        return evidence
+    
+    def _score_matches(self, engine: PatternEngine, match_counts: Dict[str, float],
+                       evidence: Optional[Dict[str, Tuple[str, List[EvidenceRecord]]]] = None
+                       ) -> Tuple[List[PatternRecord], float]:
+        """Turn per-category match counts into detected patterns and a total score."""
+        evidence = evidence or {}
         detected_patterns = []
         total_score = 0.0
         
-        for pattern_name, pattern_config in self.patterns.items():
-            patterns = pattern_config.get("patterns", [])
-            severity = pattern_config.get("severity", "medium")
-            description = pattern_config.get("description", "")
-            
-            matches = []
-            for pattern in patterns:
-                if re.search(pattern, text_lower, re.IGNORECASE):
-                    matches.append(pattern)
+        category_sizes = engine.registry.category_sizes
+        
+        for pattern_name, pattern_config in engine.patterns.items():
+            match_count = match_counts.get(pattern_name, 0)
             
-            if matches:
-                # Calculate confidence based on number of matches
-                confidence = min(len(matches) / len(patterns), 1.0)
+            if match_count:
+                severity = pattern_config.get("severity", "medium")
+                description = pattern_config.get("description", "")
+                
+                # Calculate confidence based on the share of the category's
+                # unique indicators that matched; approximate matches count
+                # for less, so their edit distance lowers the confidence
+                confidence = min(match_count / category_sizes[pattern_name], 1.0)
                 
                 # Calculate score
                 severity_weight = self.severity_weights.get(severity, 4)
-                pattern_score = len(matches) * severity_weight * confidence
+                pattern_score = match_count * severity_weight * confidence
                 total_score += pattern_score
                 
-                pattern_info = PatternInfo(
+                quotes, spans = evidence.get(pattern_name, (None, None))
+                detected_patterns.append(PatternRecord(
                     name=pattern_name,
                     severity=severity,
                     description=description,
-                    confidence=confidence
-                )
-                detected_patterns.append(pattern_info)
+                    confidence=confidence,
+                    evidence=quotes,
+                    spans=spans
+                ))
         
         return detected_patterns, total_score
     
+    def analyze_texts(self, texts: List[str], engine: Optional[PatternEngine] = None,
+                      workers: int = 1) -> BatchAnalysisResult:
+        """
+        Analyze a batch of texts for emotional abuse patterns.
+        
+        Matching runs once per text; confidence, scores and risk levels are
+        then computed as array operations over the whole batch.
+        
+        Args:
+            texts: Input texts to analyze
+            engine: Engine snapshot to use; defaults to the current engine
+            workers: Worker processes to split large batches across by
+                document; results are identical to the serial scan
+            
+        Returns:
+            Dense batch result with a category-by-text hit-count matrix
+        """
+        state = self.state
+        engine = engine or state.engine
+        categories = list(engine.patterns)
+        category_index = {name: i for i, name in enumerate(categories)}
+        hit_counts = np.zeros((len(categories), len(texts)), dtype=np.float64)
+        
+        if workers > 1 and len(texts) >= self.parallel_min_batch and self._can_fork():
+            step = -(-len(texts) // (workers * 4))
+            bounds = [(start, min(start + step, len(texts))) for start in range(0, len(texts), step)]
+            with _fork_pool(workers, detector=self, engine=engine, state=state, texts=texts) as pool:
+                counted = [item for part in pool.map(_count_documents, bounds) for item in part]
+        else:
+            counted = [
+                (column, self._count_text(engine, text, self.profiler, state))
+                for column, text in enumerate(texts)
+            ]
+        
+        for column, match_counts in counted:
+            for pattern_name, match_count in match_counts.items():
+                hit_counts[category_index[pattern_name], column] = match_count
+        
+        configs = [engine.patterns[name] for name in categories]
+        severities = [config.get("severity", "medium") for config in configs]
+        category_sizes = engine.registry.category_sizes
+        totals = np.array(
+            [max(category_sizes[name], 1) for name in categories],
+            dtype=np.float64
+        )
+        weights = np.array(
+            [self.severity_weights.get(severity, 4) for severity in severities],
+            dtype=np.float64
+        )
+        
+        confidence = np.minimum(hit_counts / totals[:, None], 1.0)
+        scores = (hit_counts * weights[:, None] * confidence).sum(axis=0)
+        pattern_counts = np.count_nonzero(hit_counts, axis=0)
+        
+        return BatchAnalysisResult(
+            categories=categories,
+            severities=severities,
+            descriptions=[config.get("description", "") for config in configs],
+            hit_counts=hit_counts,
+            confidence=confidence,
+            scores=scores,
+            pattern_counts=pattern_counts,
+            risk_levels=self.get_risk_levels(scores, pattern_counts)
+        )
+    
+    def _count_text(self, engine: PatternEngine, text: str, profiler: Optional[PatternProfiler],
+                    state: DetectorState) -> Dict[str, float]:
+        """Per-category match counts of one batch text, normalized by ``state``."""
+        if not text or not text.strip():
+            return {}
+        text_lower = text.lower()
+        if self._prefilter_rejects(engine, text_lower):
+            return {}
+        return engine.count_matches(self._normalize(text_lower, state).text, profiler=profiler)
+    
     def get_risk_level(self, score: float, pattern_count: int) -> str:
         """
         Determine risk level based on score and pattern count.
@@ -337,27 +1518,82 @@ class PatternDetector:
         Returns:
             Risk level string
         """
-        if score >= 50 or pattern_count >= 5:
-            return "abuse"
-        elif score >= 20 or pattern_count >= 3:
-            return "concerning"
-        else:
-            return "safe"
+        for level, (min_score, min_count) in self.risk_thresholds.items():
+            if score >= min_score or pattern_count >= min_count:
+                return level
+        return "safe"
     
-    def get_pattern_statistics(self) -> Dict[str, Any]:
+    def get_risk_levels(self, scores: np.ndarray, pattern_counts: np.ndarray) -> np.ndarray:
+        """
+        Vectorized ``get_risk_level`` over arrays of scores and pattern counts.
+        
+        Args:
+            scores: Total pattern scores
+            pattern_counts: Number of different patterns detected per score
+            
+        Returns:
+            Array of risk level strings
+        """
+        conditions = [
+            (scores >= min_score) | (pattern_counts >= min_count)
+            for min_score, min_count in self.risk_thresholds.values()
+        ]
+        return np.select(conditions, list(self.risk_thresholds), default="safe")
+    
+    def get_pattern_statistics(self, engine: Optional[PatternEngine] = None) -> Dict[str, Any]:
         """Get statistics about available patterns."""
+        engine = engine or self.engine
+        registry = engine.registry
         stats = {
-            "total_patterns": len(self.patterns),
+            "knowledge_version": engine.version,
+            "total_patterns": len(engine.patterns),
             "patterns_by_severity": defaultdict(int),
-            "total_indicators": 0
+            "total_indicators": 0,
+            "unique_indicators": len(registry)
         }
         
-        for pattern_name, pattern_config in self.patterns.items():
+        for pattern_name, pattern_config in engine.patterns.items():
             severity = pattern_config.get("severity", "medium")
-            patterns = pattern_config.get("patterns", [])
             
             stats["patterns_by_severity"][severity] += 1
-            stats["total_indicators"] += len(patterns)
+            stats["total_indicators"] += registry.category_sizes[pattern_name]
         
         return dict(stats)
+    
+    def get_detector_statistics(self) -> Dict[str, Any]:
+        """
+        Get the operational state of the detector, for administrators.
+        
+        Unlike ``get_pattern_statistics``, which goes into every analysis,
+        this names tenants and counts hits across all of them, so it is
+        only served on the admin endpoint.
+        """
+        engine = self.engine
+        stats = {}
+        
+        if self.profiler is not None:
+            stats["profile"] = self.profiler.statistics(engine)
+        
+        if self.language_packs is not None:
+            detector = self.language_detector
+            stats["language_packs"] = {
+                "available": sorted(detector.languages) if detector is not None else [],
+                "compiled": self.language_packs.languages(),
+                "capacity": self.language_packs.max_size
+            }
+        
+        if self.prefilter_statistics is not None:
+            prefilter = self.prefilter
+            stats["prefilter"] = {
+                "enabled": prefilter is not None and prefilter.enabled,
+                **self.prefilter_statistics.statistics()
+            }
+        
+        if self.tenant_overlays_path:
+            stats["tenant_overlays"] = {
+                "configured": sorted(self.tenant_overlays),
+                "compiled": sorted({tenant for tenant, _ in list(self._overlays)})
+            }
+        
+        return stats
 
@@ -0,0 +1,454 @@
+"""
+Pattern Engine - Single-pass Multi-pattern Matcher
+
+Compiles every indicator phrase into one trie-shaped regular expression,
+built once at construction, so a conversation is scanned a single time
+for all pattern categories.
+"""
+
+import re
+import json
+import time
+import hashlib
+from array import array
+from typing import Dict, FrozenSet, List, Tuple, Any, Optional, Set
+import logging
+
+from .text_normalizer import phrase_words
+
+logger = logging.getLogger(__name__)
+
+# Characters that make an indicator a real regular expression rather than
+# a plain phrase. Plain phrases go through the combined trie expression.
+REGEX_METACHARACTERS = frozenset(".^$*+?{}[]\\|()")
+
+
+def is_literal(pattern: str) -> bool:
+    """Return True if the pattern can be matched as a plain phrase."""
+    return bool(pattern) and not any(ch in REGEX_METACHARACTERS for ch in pattern)
+
+
+def indicator_key(pattern: str) -> str:
+    """Return the registry key of an indicator (literal phrases are case-folded)."""
+    return pattern.lower() if is_literal(pattern) else pattern
+
+
+def build_trie_regex(phrases: List[str]) -> str:
+    """
+    Build a regular expression that matches the longest phrase at a position.
+    
+    Phrases are folded into a character trie so shared prefixes are only
+    tested once; optional tails are greedy, so the deepest terminal node
+    reached along the text wins.
+    
+    Args:
+        phrases: Literal phrases to combine
+    
+    Returns:
+        Regular expression source
+    """
+    trie: Dict[str, Any] = {}
+    for phrase in phrases:
+        node = trie
+        for char in phrase:
+            node = node.setdefault(char, {})
+        node[""] = True
+    
+    def render(node: Dict[str, Any]) -> str:
+        branches = [
+            re.escape(char) + render(child)
+            for char, child in sorted(node.items())
+            if char
+        ]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if "" in node:
+            return "(?:" + body + ")?"
+        return body
+    
+    return render(trie)
+
+
+class MatchSpans:
+    """
+    Compact record of every indicator hit found during a scan.
+    
+    Hits are stored as parallel integer arrays (indicator id, start, end,
+    edit distance) holding character offsets into the scanned text, never
+    substrings.
+    """
+    
+    __slots__ = ("indicators", "starts", "ends", "distances")
+    
+    def __init__(self):
+        self.indicators = array("i")
+        self.starts = array("l")
+        self.ends = array("l")
+        self.distances = array("b")
+    
+    def __len__(self) -> int:
+        return len(self.indicators)
+    
+    def add(self, indicator: int, start: int, end: int, distance: int = 0) -> None:
+        """Record one hit; ``distance`` is non-zero for approximate matches."""
+        self.indicators.append(indicator)
+        self.starts.append(start)
+        self.ends.append(end)
+        self.distances.append(distance)
+    
+    def extend(self, other: "MatchSpans", offset: int = 0, approximate: bool = False) -> None:
+        """
+        Append the exact (or approximate) hits of another record.
+        
+        Args:
+            other: Record to copy hits from
+            offset: Added to every copied start and end
+            approximate: Copy hits with a non-zero edit distance instead of exact ones
+        """
+        for indicator, start, end, distance in zip(other.indicators, other.starts,
+                                                   other.ends, other.distances):
+            if bool(distance) == approximate:
+                self.add(indicator, start + offset, end + offset, distance)
+
+
+class IndicatorRegistry:
+    """
+    Registry of unique indicators shared across pattern categories.
+    
+    Each indicator is stored once (literal phrases case-folded) with the
+    categories it belongs to, so one hit fans out to all of them and the
+    per-category denominators used for confidence are computed here once.
+    """
+    
+    def __init__(self, patterns: Dict[str, Dict]):
+        """
+        Build the registry.
+        
+        Args:
+            patterns: Pattern configuration keyed by category name
+        """
+        self.categories: List[str] = list(patterns)
+        self.indicators: List[str] = []
+        self.indicator_categories: List[Tuple[str, ...]] = []
+        self.category_sizes: Dict[str, int] = {}
+        
+        indicator_ids: Dict[str, int] = {}
+        members: List[List[str]] = []
+        
+        for category, config in patterns.items():
+            size = 0
+            for pattern in config.get("patterns", []):
+                key = indicator_key(pattern)
+                indicator = indicator_ids.get(key)
+                if indicator is None:
+                    if not is_literal(pattern) and not self._is_valid_regex(pattern):
+                        continue
+                    indicator = indicator_ids[key] = len(self.indicators)
+                    self.indicators.append(key)
+                    members.append([])
+                if category not in members[indicator]:
+                    members[indicator].append(category)
+                    size += 1
+            self.category_sizes[category] = size
+        
+        self.indicator_categories = [tuple(categories) for categories in members]
+        self.indicator_ids = indicator_ids
+    
+    def __len__(self) -> int:
+        return len(self.indicators)
+    
+    @staticmethod
+    def _is_valid_regex(pattern: str) -> bool:
+        """Check that a non-literal indicator compiles."""
+        try:
+            re.compile(pattern)
+            return True
+        except re.error as e:
+            logger.warning(f"Skipping invalid pattern {pattern!r}: {e}")
+            return False
+
+
+class PatternEngine:
+    """
+    Compiled single-pass matcher for all pattern categories.
+    
+    Literal indicators are merged into one expression wrapped in a
+    lookahead, so every start position reports its longest phrase; shorter
+    phrases that are prefixes of it are resolved from a precomputed table.
+    Indicators that use regex syntax fall back to individual searches.
+    Indicators are identified by their id in the ``IndicatorRegistry``.
+    
+    An engine is immutable once built: it owns the pattern configuration
+    it was compiled from, so a detector can swap in a new engine without
+    affecting scans that are still running on the old one.
+    
+    Categories with ``"fuzzy": true`` in their configuration also accept
+    approximate phrase matches from matchers that support them; each such
+    hit counts ``1 - fuzzy_penalty * distance`` instead of 1.
+    
+    Subclasses provide other literal matchers by overriding
+    ``_compile_literals``, ``find_phrases`` and ``stream_limit``, and may
+    load compiled indicators by overriding ``_register_indicators``.
+    """
+    
+    # Matcher name, part of the engine version
+    name = "regex"
+    
+    # Share of an indicator's weight lost per edit in approximate matches
+    fuzzy_penalty = 0.5
+    
+    # Seconds of regex indicator searching allowed per scanned text, 0 for
+    # no limit: a limit makes results depend on how loaded the machine is
+    regex_budget = 0.0
+    
+    def __init__(self, patterns: Dict[str, Dict], regex_budget: Optional[float] = None):
+        """
+        Compile the engine.
+        
+        Args:
+            patterns: Pattern configuration keyed by category name; the
+                engine takes ownership and it must not be mutated afterwards
+            regex_budget: Seconds of regex searching allowed per scanned
+                text, 0 for no limit; defaults to ``regex_budget``
+        """
+        self.patterns = patterns
+        if regex_budget is not None:
+            self.regex_budget = regex_budget
+        
+        # Content hash of the configuration, reported with every analysis
+        self.version = hashlib.sha256(
+            json.dumps({"matcher": self.name, "patterns": patterns}, sort_keys=True).encode("utf-8")
+        ).hexdigest()[:12]
+        
+        # Literal indicators that may also match approximately
+        self.fuzzy_categories = frozenset(
+            name for name, config in patterns.items() if config.get("fuzzy")
+        )
+        
+        self._register_indicators()
+        self._compile_literals()
+        
+        logger.info(
+            f"Pattern engine {self.version} ({self.name}) compiled: {len(self.phrase_ids)} phrases, "
+            f"{len(self.regex_patterns)} regex patterns"
+        )
+    
+    def _register_indicators(self) -> None:
+        """Register the indicators of ``patterns``, split into phrases and regex patterns."""
+        self.registry = IndicatorRegistry(self.patterns)
+        self.indicators = self.registry.indicators
+        self.indicator_categories = self.registry.indicator_categories
+        
+        self.phrase_ids: Dict[str, int] = {}
+        self.regex_patterns: List[Tuple[int, re.Pattern]] = []
+        for indicator, pattern in enumerate(self.indicators):
+            if is_literal(pattern):
+                self.phrase_ids[pattern] = indicator
+            else:
+                self.regex_patterns.append((indicator, re.compile(pattern, re.IGNORECASE)))
+        
+        self.fuzzy_indicators = frozenset(
+            indicator for indicator in self.phrase_ids.values()
+            if self.fuzzy_categories.intersection(self.indicator_categories[indicator])
+        )
+    
+    def words(self) -> FrozenSet[str]:
+        """Words of the literal phrases."""
+        return phrase_words(self.phrase_ids)
+    
+    def _compile_literals(self) -> None:
+        """Compile the literal phrases in ``phrase_ids`` into the matcher."""
+        if self.fuzzy_indicators:
+            logger.warning(
+                f"The {self.name} matcher does not support fuzzy matching; "
+                f"categories {sorted(self.fuzzy_categories)} match exactly"
+            )
+            self.fuzzy_indicators = frozenset()
+        
+        # Every phrase that is a prefix of a longer one matches wherever the
+        # longer one does, so resolve those once here instead of per scan.
+        self.prefix_closure: Dict[str, Tuple[Tuple[int, int], ...]] = {
+            phrase: tuple(
+                (self.phrase_ids[candidate], len(candidate))
+                for candidate in self.phrase_ids
+                if phrase.startswith(candidate)
+            )
+            for phrase in self.phrase_ids
+        }
+        
+        # Longest phrase, i.e. how far ahead a match can reach from its start
+        self.max_phrase_length = max((len(phrase) for phrase in self.phrase_ids), default=0)
+        
+        self.literal_regex = None
+        if self.phrase_ids:
+            self.literal_regex = re.compile(
+                "(?=(" + build_trie_regex(list(self.phrase_ids)) + "))"
+            )
+    
+    def stream_limit(self, buffer: str, start: int) -> int:
+        """
+        Position before which literal matches in a growing buffer are final.
+        
+        A match starting before the limit cannot change when more text is
+        appended; streaming scans accept matches up to it and keep the rest.
+        
+        Args:
+            buffer: Lowercased text received so far (possibly truncated)
+            start: First position not yet accepted
+            
+        Returns:
+            Limit position, at least ``start``
+        """
+        return max(len(buffer) - self.max_phrase_length + 1, start)
+    
+    def scan_end(self, text: str, limit: int) -> int:
+        """
+        Position text must be scanned up to so matches starting before ``limit`` are complete.
+        
+        Used to give each parallel chunk just enough lookahead.
+        
+        Args:
+            text: Lowercased text
+            limit: End of the chunk of match starts being scanned
+            
+        Returns:
+            Scan end position, at most ``len(text)``
+        """
+        return min(limit + self.max_phrase_length - 1, len(text))
+    
+    def find_phrases(self, text_lower: str, start: int = 0, end: Optional[int] = None,
+                     spans: Optional[MatchSpans] = None,
+                     fuzzy: Optional[Dict[int, int]] = None) -> Set[int]:
+        """
+        Scan lowercased text once and return every literal phrase it contains.
+        
+        Args:
+            text_lower: Lowercased input text
+            start: First match start position to consider
+            end: Only consider matches starting before this position
+            spans: Optional span record to append every hit to
+            fuzzy: Optional mapping to record approximate matches in, as
+                indicator id -> edit distance (unused by this matcher)
+            
+        Returns:
+            Set of matched indicator ids
+        """
+        matched: Set[int] = set()
+        if self.literal_regex is None:
+            return matched
+        
+        prefix_closure = self.prefix_closure
+        seen = set()
+        for match in self.literal_regex.finditer(text_lower, start):
+            position = match.start()
+            if end is not None and position >= end:
+                break
+            longest = match.group(1)
+            if spans is not None:
+                for indicator, length in prefix_closure[longest]:
+                    spans.add(indicator, position, position + length)
+            if longest not in seen:
+                seen.add(longest)
+                matched.update(indicator for indicator, _ in prefix_closure[longest])
+        return matched
+    
+    def find_regex(self, text_lower: str, spans: Optional[MatchSpans] = None,
+                   timings: Optional[Dict[int, int]] = None) -> Set[int]:
+        """
+        Return the ids of regex indicators found in the text.
+        
+        Indicators are searched one after another. With a ``regex_budget``,
+        those left when it runs out are skipped for this text and a warning
+        is logged. A single search cannot be interrupted, which is why
+        knowledge-file regexes prone to catastrophic backtracking are
+        rejected when they are loaded.
+        
+        Args:
+            text_lower: Lowercased input text
+            spans: Optional span record to append every hit to
+            timings: Optional mapping to add nanoseconds spent per indicator to
+            
+        Returns:
+            Set of matched indicator ids
+        """
+        matched: Set[int] = set()
+        deadline = time.perf_counter() + self.regex_budget if self.regex_budget else None
+        for position, (indicator, compiled) in enumerate(self.regex_patterns):
+            if deadline is not None and position and time.perf_counter() > deadline:
+                logger.warning(
+                    f"Regex time budget of {self.regex_budget * 1000:.0f} ms exhausted on a "
+                    f"{len(text_lower)}-character text; skipped {len(self.regex_patterns) - position} "
+                    f"of {len(self.regex_patterns)} regex indicators"
+                )
+                break
+            if timings is not None:
+                started = time.perf_counter_ns()
+            if spans is None:
+                if compiled.search(text_lower):
+                    matched.add(indicator)
+            else:
+                for match in compiled.finditer(text_lower):
+                    matched.add(indicator)
+                    spans.add(indicator, match.start(), match.end())
+            if timings is not None:
+                timings[indicator] = timings.get(indicator, 0) + time.perf_counter_ns() - started
+        return matched
+    
+    def aggregate(self, indicators: Set[int],
+                  fuzzy: Optional[Dict[int, int]] = None) -> Dict[str, float]:
+        """
+        Count matched indicators per category.
+        
+        Approximate matches only count towards fuzzy categories, with the
+        edit-distance penalty applied, and only if the indicator did not
+        also match exactly.
+        
+        Args:
+            indicators: Matched indicator ids
+            fuzzy: Approximate matches as indicator id -> edit distance
+            
+        Returns:
+            Mapping of category name to (weighted) number of matched indicators
+        """
+        counts: Dict[str, float] = {}
+        for indicator in indicators:
+            for category in self.indicator_categories[indicator]:
+                counts[category] = counts.get(category, 0) + 1
+        
+        for indicator, distance in (fuzzy or {}).items():
+            if indicator in indicators:
+                continue
+            weight = max(1.0 - self.fuzzy_penalty * distance, 0.0)
+            for category in self.indicator_categories[indicator]:
+                if category in self.fuzzy_categories:
+                    counts[category] = counts.get(category, 0) + weight
+        return counts
+    
+    def count_matches(self, text_lower: str, spans: Optional[MatchSpans] = None,
+                      profiler: Optional[Any] = None) -> Dict[str, float]:
+        """
+        Count matched indicators per category.
+        
+        Args:
+            text_lower: Lowercased input text
+            spans: Optional span record to append every hit to
+            profiler: Optional ``PatternProfiler`` to record hits and timings in
+            
+        Returns:
+            Mapping of category name to (weighted) number of matched indicators
+        """
+        fuzzy = {} if self.fuzzy_indicators else None
+        if profiler is None:
+            matched = self.find_phrases(text_lower, spans=spans, fuzzy=fuzzy)
+            matched |= self.find_regex(text_lower, spans)
+            return self.aggregate(matched, fuzzy)
+        
+        started = time.perf_counter_ns()
+        matched = self.find_phrases(text_lower, spans=spans, fuzzy=fuzzy)
+        phrase_scan_ns = time.perf_counter_ns() - started
+        timings: Dict[int, int] = {}
+        matched |= self.find_regex(text_lower, spans, timings)
+        match_counts = self.aggregate(matched, fuzzy)
+        profiler.record(self, matched, fuzzy, match_counts, phrase_scan_ns, timings)
+        return match_counts
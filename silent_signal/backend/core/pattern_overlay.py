@@ -0,0 +1,334 @@
+"""
+Pattern Overlay - Per-tenant Changes on a Shared Engine
+
+Lets one deployment serve several partner organizations from a single
+compiled base engine: each tenant's extra indicators are compiled into a
+small delta engine, and suppressed indicators and severity overrides are
+applied on top, so a tenant costs memory and compile time in proportion
+to its overlay only.
+"""
+
+import json
+import hashlib
+from collections.abc import Sequence, Set as AbstractSet
+from typing import Any, Dict, FrozenSet, Iterator, List, Optional, Set, Tuple
+import logging
+
+from .pattern_engine import PatternEngine, MatchSpans, indicator_key, is_literal
+from .token_engine import TokenTrieEngine
+from .prefilter import Prefilter
+from .regex_guard import guard_pattern
+
+logger = logging.getLogger(__name__)
+
+
+class ConcatenatedSequence(Sequence):
+    """Read-only view of one sequence followed by another."""
+    
+    def __init__(self, first: Sequence, second: Sequence):
+        self._first = first
+        self._second = second
+    
+    def __len__(self) -> int:
+        return len(self._first) + len(self._second)
+    
+    def __getitem__(self, index: int) -> Any:
+        if index < 0:
+            index += len(self)
+        if index < len(self._first):
+            return self._first[index]
+        return self._second[index - len(self._first)]
+    
+    def __iter__(self) -> Iterator:
+        yield from self._first
+        yield from self._second
+
+
+class OffsetUnion(AbstractSet):
+    """Read-only union of a set of ids and another set shifted by an offset."""
+    
+    def __init__(self, first: AbstractSet, second: AbstractSet, offset: int):
+        self._first = first
+        self._second = second
+        self._offset = offset
+    
+    def __contains__(self, item: int) -> bool:
+        if item < self._offset:
+            return item in self._first
+        return item - self._offset in self._second
+    
+    def __len__(self) -> int:
+        return len(self._first) + len(self._second)
+    
+    def __iter__(self) -> Iterator[int]:
+        yield from self._first
+        for item in self._second:
+            yield item + self._offset
+
+
+class OverlayRegistry:
+    """Indicator registry of an overlay engine, shaped like ``IndicatorRegistry``."""
+    
+    def __init__(self, categories: List[str], indicators: Sequence,
+                 indicator_categories: Sequence, category_sizes: Dict[str, int], size: int):
+        self.categories = categories
+        self.indicators = indicators
+        self.indicator_categories = indicator_categories
+        self.category_sizes = category_sizes
+        self.indicator_ids: Dict[str, int] = {}
+        self._size = size
+    
+    def __len__(self) -> int:
+        return self._size
+
+
+class OverlayEngine(PatternEngine):
+    """
+    A base engine with one tenant's overlay applied, used like any engine.
+    
+    The overlay has the shape of a knowledge file under ``"patterns"``
+    (extra indicators, severity and description per category, new
+    categories) plus a ``"suppress"`` list of indicators to ignore in
+    every category. Indicator ids below ``offset`` are the base engine's,
+    the rest the delta engine's shifted by ``offset``. The base engine is
+    shared, never copied: indicators are viewed through concatenated
+    sequences and suppressed hits are dropped from each scan, so category
+    sizes and confidence are as if the tenant had its own engine.
+    """
+    
+    def __init__(self, base: PatternEngine, overlay: Dict[str, Any]):
+        """
+        Apply an overlay to a base engine.
+        
+        Args:
+            base: Compiled engine shared by every tenant
+            overlay: Tenant overlay configuration
+        """
+        self.base = base
+        self.name = base.name
+        self.regex_budget = base.regex_budget
+        self.offset = len(base.indicators)
+        self.version = hashlib.sha256(
+            json.dumps({"base": base.version, "overlay": overlay}, sort_keys=True).encode("utf-8")
+        ).hexdigest()[:12]
+        
+        # Category settings, with the base engine's indicator lists shared
+        self.patterns: Dict[str, Dict] = {name: dict(config) for name, config in base.patterns.items()}
+        delta_patterns: Dict[str, Dict] = {}
+        for category, config in overlay.get("patterns", {}).items():
+            settings = {key: value for key, value in config.items() if key != "patterns"}
+            merged = self.patterns.setdefault(category, {"patterns": []})
+            merged.update(settings)
+            added = [
+                pattern for pattern in map(guard_pattern, config.get("patterns", ()))
+                if pattern is not None and category not in self._base_categories(pattern)
+            ]
+            if added:
+                delta_patterns[category] = {"patterns": added, "fuzzy": merged.get("fuzzy", False)}
+        
+        # Phrases match the same way in the delta engine; a mapped base
+        # still gets a plain token trie, which needs no automaton file
+        delta_class = TokenTrieEngine if isinstance(base, TokenTrieEngine) else type(base)
+        self.delta = delta_class(delta_patterns, regex_budget=base.regex_budget) if delta_patterns else None
+        
+        self.suppressed: FrozenSet[int] = frozenset(
+            indicator for indicator in map(self._base_indicator, overlay.get("suppress", ()))
+            if indicator is not None
+        )
+        
+        delta_indicators = self.delta.indicators if self.delta is not None else ()
+        delta_categories = self.delta.indicator_categories if self.delta is not None else ()
+        self.indicators = ConcatenatedSequence(base.indicators, delta_indicators)
+        self.indicator_categories = ConcatenatedSequence(base.indicator_categories, delta_categories)
+        self.regex_patterns = ConcatenatedSequence(base.regex_patterns, [
+            (indicator + self.offset, compiled) for indicator, compiled in self.delta.regex_patterns
+        ] if self.delta is not None else [])
+        self.fuzzy_categories = frozenset(
+            name for name, config in self.patterns.items() if config.get("fuzzy")
+        )
+        self.fuzzy_indicators = OffsetUnion(
+            base.fuzzy_indicators,
+            self.delta.fuzzy_indicators if self.delta is not None else frozenset(),
+            self.offset
+        )
+        
+        category_sizes = {name: base.registry.category_sizes.get(name, 0) for name in self.patterns}
+        for indicator in self.suppressed:
+            for category in base.indicator_categories[indicator]:
+                category_sizes[category] -= 1
+        if self.delta is not None:
+            for category, size in self.delta.registry.category_sizes.items():
+                category_sizes[category] += size
+        self.registry = OverlayRegistry(
+            list(self.patterns), self.indicators, self.indicator_categories, category_sizes,
+            len(self.indicators) - len(self.suppressed)
+        )
+        
+        logger.info(
+            f"Pattern overlay {self.version} on {base.version}: "
+            f"{len(delta_indicators)} added, {len(self.suppressed)} suppressed indicators"
+        )
+    
+    def _base_indicator(self, pattern: str) -> Optional[int]:
+        """Id of a base indicator, or None if the base engine has no such indicator."""
+        key = indicator_key(pattern)
+        if is_literal(key):
+            return self.base.phrase_ids.get(key)
+        for indicator, _ in self.base.regex_patterns:
+            if self.base.indicators[indicator] == key:
+                return indicator
+        return None
+    
+    def _base_categories(self, pattern: str) -> Tuple[str, ...]:
+        """Categories a base indicator belongs to, empty if there is no such indicator."""
+        indicator = self._base_indicator(pattern)
+        return self.base.indicator_categories[indicator] if indicator is not None else ()
+    
+    def stream_limit(self, buffer: str, start: int) -> int:
+        """Position before which matches of both engines in a growing buffer are final."""
+        limit = self.base.stream_limit(buffer, start)
+        if self.delta is not None:
+            limit = min(limit, self.delta.stream_limit(buffer, start))
+        return limit
+    
+    def scan_end(self, text: str, limit: int) -> int:
+        """Position text must be scanned up to so both engines' matches are complete."""
+        end = self.base.scan_end(text, limit)
+        if self.delta is not None:
+            end = max(end, self.delta.scan_end(text, limit))
+        return end
+    
+    def _merge(self, matched: Set[int], spans: Optional[MatchSpans], fuzzy: Optional[Dict[int, int]],
+               base_spans: Optional[MatchSpans], delta_matched: Set[int],
+               delta_spans: Optional[MatchSpans], delta_fuzzy: Optional[Dict[int, int]]) -> Set[int]:
+        """Drop suppressed base hits and add the delta engine's hits with shifted ids."""
+        suppressed = self.suppressed
+        if suppressed:
+            matched -= suppressed
+            if fuzzy:
+                for indicator in suppressed.intersection(fuzzy):
+                    del fuzzy[indicator]
+            if base_spans is not None:
+                for indicator, start, end, distance in zip(base_spans.indicators, base_spans.starts,
+                                                           base_spans.ends, base_spans.distances):
+                    if indicator not in suppressed:
+                        spans.add(indicator, start, end, distance)
+        
+        offset = self.offset
+        matched.update(indicator + offset for indicator in delta_matched)
+        if delta_fuzzy:
+            fuzzy.update((indicator + offset, distance) for indicator, distance in delta_fuzzy.items())
+        if delta_spans is not None:
+            for indicator, start, end, distance in zip(delta_spans.indicators, delta_spans.starts,
+                                                       delta_spans.ends, delta_spans.distances):
+                spans.add(indicator + offset, start, end, distance)
+        return matched
+    
+    def find_phrases(self, text_lower: str, start: int = 0, end: Optional[int] = None,
+                     spans: Optional[MatchSpans] = None,
+                     fuzzy: Optional[Dict[int, int]] = None) -> Set[int]:
+        """
+        Return every phrase of the base and delta engines the text contains.
+        
+        Args:
+            text_lower: Lowercased input text
+            start: First match start position to consider
+            end: Only consider matches starting before this position
+            spans: Optional span record to append every hit to
+            fuzzy: Optional mapping to record approximate matches in
+        
+        Returns:
+            Set of matched indicator ids
+        """
+        base_spans = MatchSpans() if spans is not None and self.suppressed else spans
+        matched = self.base.find_phrases(text_lower, start, end, base_spans, fuzzy)
+        delta_matched: Set[int] = set()
+        delta_spans = delta_fuzzy = None
+        if self.delta is not None and self.delta.phrase_ids:
+            delta_spans = MatchSpans() if spans is not None else None
+            delta_fuzzy = {} if fuzzy is not None else None
+            delta_matched = self.delta.find_phrases(text_lower, start, end, delta_spans, delta_fuzzy)
+        return self._merge(matched, spans, fuzzy, base_spans if base_spans is not spans else None,
+                           delta_matched, delta_spans, delta_fuzzy)
+    
+    def find_regex(self, text_lower: str, spans: Optional[MatchSpans] = None,
+                   timings: Optional[Dict[int, int]] = None) -> Set[int]:
+        """
+        Return the ids of regex indicators of both engines found in the text.
+        
+        Args:
+            text_lower: Lowercased input text
+            spans: Optional span record to append every hit to
+            timings: Optional mapping to add nanoseconds spent per indicator to
+        
+        Returns:
+            Set of matched indicator ids
+        """
+        base_spans = MatchSpans() if spans is not None and self.suppressed else spans
+        matched = self.base.find_regex(text_lower, base_spans, timings)
+        delta_matched: Set[int] = set()
+        delta_spans = None
+        if self.delta is not None and self.delta.regex_patterns:
+            delta_spans = MatchSpans() if spans is not None else None
+            delta_timings: Optional[Dict[int, int]] = {} if timings is not None else None
+            delta_matched = self.delta.find_regex(text_lower, delta_spans, delta_timings)
+            for indicator, elapsed in (delta_timings or {}).items():
+                timings[indicator + self.offset] = timings.get(indicator + self.offset, 0) + elapsed
+        return self._merge(matched, spans, None, base_spans if base_spans is not spans else None,
+                           delta_matched, delta_spans, None)
+    
+    def aggregate(self, indicators: Set[int],
+                  fuzzy: Optional[Dict[int, int]] = None) -> Dict[str, float]:
+        """
+        Count matched indicators of both engines per category.
+        
+        Args:
+            indicators: Matched indicator ids
+            fuzzy: Approximate matches as indicator id -> edit distance
+        
+        Returns:
+            Mapping of category name to (weighted) number of matched indicators
+        """
+        offset = self.offset
+        counts = self.base.aggregate(
+            {indicator for indicator in indicators if indicator < offset},
+            {indicator: distance for indicator, distance in fuzzy.items() if indicator < offset}
+            if fuzzy else None
+        )
+        if self.delta is not None:
+            delta_counts = self.delta.aggregate(
+                {indicator - offset for indicator in indicators if indicator >= offset},
+                {indicator - offset: distance for indicator, distance in fuzzy.items() if indicator >= offset}
+                if fuzzy else None
+            )
+            for category, count in delta_counts.items():
+                counts[category] = counts.get(category, 0) + count
+        return counts
+
+
+class OverlayPrefilter:
+    """Prefilter of an overlay engine: a text passes if it may match the base or the delta."""
+    
+    def __init__(self, engine: OverlayEngine, base: Prefilter, delta: Optional[Prefilter]):
+        """
+        Combine the prefilters of an overlay's engines.
+        
+        Args:
+            engine: Overlay engine the prefilter is for
+            base: Prefilter of the base engine
+            delta: Prefilter of the delta engine, if the overlay adds indicators
+        """
+        self.version = engine.version
+        self.base = base
+        self.delta = delta
+        # Suppressing indicators only removes matches, so the base
+        # prefilter stays a necessary condition
+        self.enabled = base.enabled and (delta is None or delta.enabled)
+    
+    def may_match(self, text_lower: str) -> bool:
+        """Check whether any indicator of the overlay engine could match a text."""
+        if not self.enabled:
+            return True
+        return self.base.may_match(text_lower) or (
+            self.delta is not None and self.delta.may_match(text_lower)
+        )
@@ -0,0 +1,132 @@
+"""
+Pattern Profiler - Per-indicator Hit and Cost Accounting
+
+Opt-in instrumentation of the pattern engine: counts how often each
+indicator and category matches and how long their evaluation takes, so
+dead or expensive indicators can be pruned from the knowledge base.
+"""
+
+import threading
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, List, Any, Optional, Set
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class PatternProfiler:
+    """
+    Cumulative hit counts and evaluation time per indicator and category.
+    
+    Literal phrases are all matched by one scan, so their cost is only
+    known in total; it is reported as ``phrase_scan_ms`` and apportioned to
+    categories by their share of phrases. Regex indicators are searched
+    individually and timed one by one.
+    
+    Counters are keyed by indicator text, so they carry over knowledge
+    reloads for indicators that did not change. Recording takes a lock once
+    per analyzed text and costs O(number of hits).
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+    
+    def reset(self) -> None:
+        """Clear all counters."""
+        with self._lock:
+            self.started_at = datetime.now()
+            self.texts = 0
+            self.phrase_scan_ns = 0
+            self.indicator_hits: Dict[str, int] = defaultdict(int)
+            self.indicator_fuzzy_hits: Dict[str, int] = defaultdict(int)
+            self.indicator_ns: Dict[str, int] = defaultdict(int)
+            self.category_hits: Dict[str, int] = defaultdict(int)
+    
+    def record(self, engine: Any, matched: Set[int], fuzzy: Optional[Dict[int, int]],
+               match_counts: Dict[str, float], phrase_scan_ns: int,
+               regex_ns: Dict[int, int]) -> None:
+        """
+        Record the scan of one text.
+        
+        Args:
+            engine: Engine that ran the scan
+            matched: Exactly matched indicator ids
+            fuzzy: Approximately matched indicator ids -> edit distance
+            match_counts: Per-category counts of the text
+            phrase_scan_ns: Time spent in the literal phrase scan
+            regex_ns: Time spent per regex indicator id
+        """
+        indicators = engine.indicators
+        with self._lock:
+            self.texts += 1
+            self.phrase_scan_ns += phrase_scan_ns
+            for indicator in matched:
+                self.indicator_hits[indicators[indicator]] += 1
+            for indicator in (fuzzy or {}):
+                if indicator not in matched:
+                    self.indicator_fuzzy_hits[indicators[indicator]] += 1
+            for indicator, elapsed in regex_ns.items():
+                self.indicator_ns[indicators[indicator]] += elapsed
+            for category, count in match_counts.items():
+                if count:
+                    self.category_hits[category] += 1
+    
+    def statistics(self, engine: Any) -> Dict[str, Any]:
+        """
+        Summarize the counters for the indicators of an engine.
+        
+        Args:
+            engine: Engine whose indicators and categories to report
+        
+        Returns:
+            Profile dictionary; indicators are sorted by cost, then hits
+        """
+        with self._lock:
+            regex_ids = {indicator for indicator, _ in engine.regex_patterns}
+            regex_ns = 0
+            
+            indicators: List[Dict[str, Any]] = []
+            category_ns: Dict[str, float] = defaultdict(float)
+            category_phrases: Dict[str, int] = defaultdict(int)
+            for indicator, key in enumerate(engine.indicators):
+                is_regex = indicator in regex_ids
+                elapsed = self.indicator_ns.get(key, 0) if is_regex else 0
+                regex_ns += elapsed
+                for category in engine.indicator_categories[indicator]:
+                    if is_regex:
+                        category_ns[category] += elapsed
+                    else:
+                        category_phrases[category] += 1
+                indicators.append({
+                    "indicator": key,
+                    "categories": list(engine.indicator_categories[indicator]),
+                    "kind": "regex" if is_regex else "phrase",
+                    "hits": self.indicator_hits.get(key, 0),
+                    "fuzzy_hits": self.indicator_fuzzy_hits.get(key, 0),
+                    "time_ms": elapsed / 1e6 if is_regex else None
+                })
+            
+            categories = {}
+            phrase_memberships = max(sum(category_phrases.values()), 1)
+            for category in engine.patterns:
+                share = self.phrase_scan_ns * category_phrases[category] / phrase_memberships
+                categories[category] = {
+                    "hits": self.category_hits.get(category, 0),
+                    "time_ms": (category_ns[category] + share) / 1e6
+                }
+            
+            indicators.sort(key=lambda entry: (-(entry["time_ms"] or 0.0), -entry["hits"]))
+            return {
+                "since": self.started_at.isoformat(),
+                "texts_profiled": self.texts,
+                "phrase_scan_ms": self.phrase_scan_ns / 1e6,
+                "regex_ms": regex_ns / 1e6,
+                "categories": categories,
+                "indicators": indicators,
+                "dead_indicators": [
+                    entry["indicator"] for entry in indicators
+                    if not entry["hits"] and not entry["fuzzy_hits"]
+                ]
+            }
@@ -0,0 +1,229 @@
+"""
+Prefilter - Cheap Rejection of Texts No Indicator Can Match
+
+Reduces every indicator of an engine to character bigrams that any text
+it matches must contain, so short benign messages are turned away after
+a regex search or two instead of being normalized and scanned.
+"""
+
+import operator
+import re
+import threading
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+import logging
+
+from .pattern_engine import PatternEngine, build_trie_regex
+from .regex_guard import required_literals
+from .text_normalizer import TextNormalizer, QUOTE_TRANSLATION
+
+logger = logging.getLogger(__name__)
+
+# Letter and digit runs, the parts of a phrase matched character for character
+WORD_RUN_PATTERN = re.compile(r"[^\W_]+")
+
+# Characters that only match themselves in lowercased text under
+# re.IGNORECASE ("i", "k" and "s" also match dotless i, Kelvin sign, long s)
+CASELESS_CHARACTERS = re.compile(r"[0-9a-hj-rt-z]+")
+
+# English letters and bigrams from most to least frequent, to pick
+# selective bigrams to index requirements by
+LETTER_FREQUENCY = "etaoinshrdlcumwfgypbvkjxqz"
+COMMON_BIGRAMS = (
+    "th he in er an re on at en nd ti es or te of ed is it al ar st to nt ng "
+    "se ha as ou io le ve co me de hi ri ro ic ne ea ra ce li ch ll be ma si "
+    "om ur ca el ta la ns di fo ho pe ec pr no ct us ac ot il tr ly nc et ut "
+    "ss so rs un lo wa ge ie wh ee wi em ad ol rt po we na ul ni ts mo ow pa "
+    "im mi ai sh ir su id os iv ia am fi ci vi pl ig tu ev ld ry mp fe bl ab "
+    "gh ty op wo sa ay ex ke fr oo av ag if ap gr od bo sp rd do uc bu ei ov "
+    "by rm ep tt oc fa ef cu rn sc gi da yo cr cl du ga qu ue ff ba ey ls va"
+).split()
+BIGRAM_RANKS = {bigram: rank for rank, bigram in enumerate(COMMON_BIGRAMS)}
+LETTER_RANKS = {letter: rank for rank, letter in enumerate(LETTER_FREQUENCY)}
+
+# Bigrams of a word one edit can remove: a transposition removes three
+FUZZY_MISSES = 3
+
+# Above this many indicators nearly every text holds some indicator's
+# bigrams, and the requirements would cost more memory than they save
+MAX_INDICATORS = 20000
+
+
+def bigrams(text: str) -> Set[str]:
+    """Set of adjacent character pairs of a text."""
+    return set(map(operator.add, text, text[1:]))
+
+
+def _rarity(bigram: str) -> Tuple[int, int]:
+    """Sort key, higher for bigrams less likely to occur in a text."""
+    rare = len(LETTER_FREQUENCY)
+    return (BIGRAM_RANKS.get(bigram, len(COMMON_BIGRAMS)),
+            LETTER_RANKS.get(bigram[0], rare) + LETTER_RANKS.get(bigram[1], rare))
+
+
+class Prefilter:
+    """
+    Necessary condition for any indicator of an engine to match a text.
+    
+    A literal phrase requires the bigrams inside its letter runs, a regex
+    those inside the literal runs every match contains. The check runs on
+    the raw lowercased text, and normalization never brings such a bigram
+    into the text unless it was there already or comes from a slang
+    expansion: quotes fold to quotes, a collapsed run of letters keeps the
+    letters on both sides of it adjacent, and the expansions of slang
+    words found in the text are added to its bigrams. Words
+    only match when equal to the phrase word with or without apostrophes,
+    and apostrophes are dropped from the text, so they cannot separate a
+    bigram either. Phrases that also match approximately may miss the
+    bigrams one edit removes.
+    
+    Each requirement is indexed by its rarest bigrams, so a text is only
+    tested against the requirements whose index bigrams it contains, and
+    one containing none is rejected after a single regex search.
+    """
+    
+    def __init__(self, engine: PatternEngine, normalizer: Optional[TextNormalizer] = None):
+        """
+        Build the prefilter.
+        
+        Args:
+            engine: Engine whose indicators the prefilter must let through
+            normalizer: Normalizer applied in front of the engine, if any
+        """
+        self.version = engine.version
+        self.translation = QUOTE_TRANSLATION if normalizer is not None else None
+        self.slang: Dict[str, FrozenSet[str]] = {
+            word: frozenset(bigrams(expansion) | bigrams(expansion.replace("'", "")))
+            for word, expansion in (normalizer.slang.items() if normalizer is not None else ())
+        }
+        
+        # (required bigrams, how many of them may be missing)
+        requirements: Set[Tuple[FrozenSet[str], int]] = set()
+        indicator_count = len(engine.phrase_ids) + len(engine.regex_patterns)
+        if indicator_count <= MAX_INDICATORS:
+            for phrase, indicator in engine.phrase_ids.items():
+                misses = FUZZY_MISSES if indicator in engine.fuzzy_indicators else 0
+                required = set()
+                for run in WORD_RUN_PATTERN.findall(phrase.lower()):
+                    required |= bigrams(run)
+                requirements.add((frozenset(required), misses))
+            for _, compiled in engine.regex_patterns:
+                required = set()
+                for literal in required_literals(compiled.pattern):
+                    for run in CASELESS_CHARACTERS.findall(literal.lower()):
+                        required |= bigrams(run)
+                requirements.add((frozenset(required), 0))
+        self.requirement_count = len(requirements)
+        
+        # Any requirement some text trivially meets makes filtering pointless
+        self.enabled = bool(requirements) and all(
+            len(required) > misses for required, misses in requirements
+        )
+        self.index: Dict[str, List[Tuple[FrozenSet[str], int]]] = {}
+        self.index_bigrams: FrozenSet[str] = frozenset()
+        self.index_pattern: Optional[re.Pattern] = None
+        self.slang_pattern = self._word_pattern(self.slang)
+        self.slang_index_pattern: Optional[re.Pattern] = None
+        self.fuzzy = any(misses for _, misses in requirements)
+        if not self.enabled:
+            reason = (f"{indicator_count} indicators" if indicator_count > MAX_INDICATORS
+                      else "an indicator has no required bigrams")
+            logger.info(f"Prefilter disabled for pattern engine {self.version}: {reason}")
+            return
+        
+        # Prefer bigrams slang expansions cannot add, so the index is only
+        # hit through slang when a requirement has nothing else
+        slang_bigrams = frozenset().union(*self.slang.values())
+        rank = {
+            bigram: (bigram not in slang_bigrams, _rarity(bigram))
+            for bigram in frozenset().union(*(required for required, _ in requirements))
+        }
+        for required, misses in requirements:
+            # A text meeting the requirement has at least one of any
+            # ``misses + 1`` of its bigrams
+            ranked = sorted(required, key=rank.__getitem__)
+            for bigram in ranked[-(misses + 1):]:
+                self.index.setdefault(bigram, []).append((required, misses))
+        self.index_bigrams = frozenset(self.index)
+        
+        # Finding any one index bigram is a single search, so texts without
+        # one are rejected before their bigrams are collected
+        self.index_pattern = re.compile(build_trie_regex(sorted(self.index)))
+        self.slang_index_pattern = self._word_pattern([
+            word for word, expansion in self.slang.items()
+            if not self.index_bigrams.isdisjoint(expansion)
+        ])
+    
+    @staticmethod
+    def _word_pattern(words: Iterable[str]) -> Optional[re.Pattern]:
+        """Expression finding the given words where the normalizer expands them."""
+        words = sorted(words, key=len, reverse=True)
+        if not words:
+            return None
+        return re.compile(r"\b(?:" + "|".join(map(re.escape, words)) + r")\b")
+    
+    def may_match(self, text_lower: str) -> bool:
+        """
+        Check whether any indicator could match a text.
+        
+        Args:
+            text_lower: Lowercased input text, before normalization
+        
+        Returns:
+            False only if no indicator can match the text
+        """
+        if not self.enabled:
+            return True
+        
+        folded = text_lower
+        if self.translation is not None and not (folded.isascii() and "`" not in folded):
+            folded = folded.translate(self.translation)
+        apostrophes = "'" in folded
+        letters = folded.replace("'", "") if apostrophes else folded
+        if self.index_pattern.search(letters) is None and (
+                self.slang_index_pattern is None or self.slang_index_pattern.search(folded) is None):
+            return False
+        present = bigrams(letters)
+        
+        words = set(self.slang_pattern.findall(folded)) if self.slang_pattern else ()
+        if words:
+            if apostrophes and self.fuzzy:
+                # An expanded word inside an apostrophe-joined word forms
+                # bigrams with its neighbors that approximate matching
+                # compares but neither the text nor the expansion has
+                return True
+            present.update(*(self.slang[word] for word in words))
+        
+        for bigram in present.intersection(self.index_bigrams):
+            for required, misses in self.index[bigram]:
+                if misses:
+                    if len(required.difference(present)) <= misses:
+                        return True
+                elif required <= present:
+                    return True
+        return False
+
+
+class PrefilterStatistics:
+    """Thread-safe count of texts checked and rejected by the prefilter."""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checked = 0
+        self.rejected = 0
+    
+    def record(self, rejected: bool) -> None:
+        """Count one checked text."""
+        with self._lock:
+            self.checked += 1
+            if rejected:
+                self.rejected += 1
+    
+    def statistics(self) -> Dict[str, float]:
+        """Texts checked, texts rejected and the share rejected."""
+        with self._lock:
+            checked, rejected = self.checked, self.rejected
+        return {
+            "checked": checked,
+            "rejected": rejected,
+            "hit_rate": rejected / checked if checked else 0.0
+        }
@@ -0,0 +1,518 @@
+"""
+Regex Guard - Load-time Checks for Knowledge-file Indicators
+
+Classifies indicators loaded from pattern knowledge as literal phrases or
+regular expressions before they reach the engine. Expressions that only
+spell out text become phrases for the literal matcher; constructs prone
+to catastrophic backtracking are rewritten when an equivalent safe form
+exists and rejected otherwise, and leading repeats, which make searching
+quadratic, are anchored to the start of their run. The literal text every
+match of an expression contains is extracted here as well, for the
+prefilter.
+
+Expressions are analyzed with the parser of the ``re`` module, whose
+modules are private and may change between Python versions. Where they
+cannot be imported, regex indicators are rejected rather than searched
+unchecked, and literal phrases are unaffected.
+"""
+
+import re
+from typing import Callable, Dict, List, Optional, Tuple
+import logging
+
+from .pattern_engine import is_literal
+
+logger = logging.getLogger(__name__)
+
+try:
+    from re import _parser as sre_parse
+    from re import _constants as sre_constants
+    
+    MAXREPEAT = sre_constants.MAXREPEAT
+    BACKTRACKING_REPEATS = (sre_constants.MAX_REPEAT, sre_constants.MIN_REPEAT)
+    REPEATS = BACKTRACKING_REPEATS + (sre_constants.POSSESSIVE_REPEAT,)
+    SINGLE_CHARACTER = (sre_constants.LITERAL, sre_constants.NOT_LITERAL,
+                        sre_constants.ANY, sre_constants.IN)
+    
+    # Character class tests, used to decide whether two sets of possible
+    # next characters can overlap
+    CATEGORY_TESTS: Dict[object, Callable[[str], bool]] = {
+        sre_constants.CATEGORY_DIGIT: str.isdigit,
+        sre_constants.CATEGORY_NOT_DIGIT: lambda ch: not ch.isdigit(),
+        sre_constants.CATEGORY_SPACE: str.isspace,
+        sre_constants.CATEGORY_NOT_SPACE: lambda ch: not ch.isspace(),
+        sre_constants.CATEGORY_WORD: lambda ch: ch.isalnum() or ch == "_",
+        sre_constants.CATEGORY_NOT_WORD: lambda ch: not (ch.isalnum() or ch == "_")
+    }
+    
+    # Escapes and flag letters of parsed items, for rewriting
+    CATEGORY_ESCAPES = {
+        sre_constants.CATEGORY_DIGIT: r"\d",
+        sre_constants.CATEGORY_NOT_DIGIT: r"\D",
+        sre_constants.CATEGORY_SPACE: r"\s",
+        sre_constants.CATEGORY_NOT_SPACE: r"\S",
+        sre_constants.CATEGORY_WORD: r"\w",
+        sre_constants.CATEGORY_NOT_WORD: r"\W"
+    }
+    AT_ESCAPES = {
+        sre_constants.AT_BEGINNING: "^",
+        sre_constants.AT_BEGINNING_STRING: r"\A",
+        sre_constants.AT_END: "$",
+        sre_constants.AT_END_STRING: r"\Z",
+        sre_constants.AT_BOUNDARY: r"\b",
+        sre_constants.AT_NON_BOUNDARY: r"\B"
+    }
+    FLAG_LETTERS = {
+        sre_constants.SRE_FLAG_IGNORECASE: "i",
+        sre_constants.SRE_FLAG_MULTILINE: "m",
+        sre_constants.SRE_FLAG_DOTALL: "s",
+        sre_constants.SRE_FLAG_ASCII: "a"
+    }
+except (ImportError, AttributeError) as e:
+    logger.warning(f"Regex parser internals unavailable ({e}); regex indicators will be rejected")
+    sre_parse = sre_constants = None
+
+# Probe characters covering every character class
+PROBE_CHARACTERS = "aZ_0 \t\n.,!'-é"
+
+# (negated, members) character sets a position can start with
+CharacterSets = List[Tuple[bool, list]]
+
+
+def guard_pattern(pattern: str) -> Optional[str]:
+    """
+    Classify a knowledge-file indicator and make it safe to search with.
+    
+    Args:
+        pattern: Indicator as written in the knowledge file
+    
+    Returns:
+        The indicator to use: a literal phrase, a regex (rewritten if it
+        had a safe equivalent), or None if it is rejected
+    """
+    if is_literal(pattern):
+        return pattern
+    if sre_parse is None:
+        logger.warning(f"Rejecting regex indicator {pattern!r}: it cannot be checked without the regex parser")
+        return None
+    try:
+        parsed = sre_parse.parse(pattern)
+    except re.error:
+        # Left to the registry, which reports patterns that do not compile
+        return pattern
+    
+    if all(op is sre_constants.LITERAL for op, _ in parsed):
+        phrase = "".join(chr(code) for _, code in parsed)
+        if is_literal(phrase):
+            logger.debug(f"Indicator {pattern!r} is the literal phrase {phrase!r}")
+            return phrase
+    
+    risk = backtracking_risk(parsed)
+    if risk is not None and not _collapse_nested_repeats(parsed):
+        logger.warning(f"Rejecting regex indicator {pattern!r}: {risk} can backtrack catastrophically")
+        return None
+    anchored = _anchor_leading_repeat(parsed)
+    if risk is None and not anchored:
+        return pattern
+    
+    try:
+        rewritten = _unparse(parsed, top=True)
+        re.compile(rewritten)
+    except (ValueError, re.error):
+        rewritten = None
+    if rewritten is None or backtracking_risk(sre_parse.parse(rewritten)) is not None:
+        if risk is None:
+            return pattern
+        logger.warning(f"Rejecting regex indicator {pattern!r}: {risk} can backtrack catastrophically")
+        return None
+    
+    logger.info(f"Rewrote regex indicator {pattern!r} as {rewritten!r}" + (f" ({risk})" if risk else ""))
+    return rewritten
+
+
+def backtracking_risk(parsed: "sre_parse.SubPattern") -> Optional[str]:
+    """
+    Find a construct whose backtracking is super-linear in the text length.
+    
+    Flags quantified groups whose iterations can split the same text in
+    several ways (``(a+)+``, ``(\\w+\\s?)+``, ``(.*a){3}``), repeated
+    alternatives that can start alike (``(a|aa)+``) and adjacent
+    quantifiers over overlapping characters (``.*.*``).
+    
+    Args:
+        parsed: Parsed expression
+    
+    Returns:
+        Description of the risky construct, or None if none was found
+    """
+    return _check_sequence(list(parsed), [], False)
+
+
+def required_literals(pattern: str) -> List[str]:
+    """
+    Runs of literal characters every match of a regex contains.
+    
+    Only characters matched unconditionally count: those outside
+    alternations, optional repeats and lookarounds. A run ends wherever
+    anything else comes between two literals.
+    
+    Args:
+        pattern: Regex indicator
+    
+    Returns:
+        Literal runs, empty if none is required, the pattern is invalid or
+        the regex parser is unavailable
+    """
+    if sre_parse is None:
+        return []
+    try:
+        parsed = sre_parse.parse(pattern)
+    except re.error:
+        return []
+    runs = [""]
+    _collect_literals(parsed, runs)
+    return [run for run in runs if run]
+
+
+def _collect_literals(items, runs: List[str]) -> None:
+    """Extend the literal runs with the unconditional literals of a sequence."""
+    for op, av in items:
+        if op is sre_constants.LITERAL:
+            runs[-1] += chr(av)
+            continue
+        runs.append("")
+        if op is sre_constants.SUBPATTERN:
+            _collect_literals(av[3], runs)
+        elif op is sre_constants.ATOMIC_GROUP:
+            _collect_literals(av, runs)
+        elif op in REPEATS and av[0] >= 1:
+            _collect_literals(av[2], runs)
+        else:
+            continue
+        runs.append("")
+
+
+def _check_sequence(items: list, follow: CharacterSets, repeated: bool) -> Optional[str]:
+    """
+    Check a sequence of parsed items.
+    
+    Args:
+        items: Parsed items in order
+        follow: Characters that can come right after the sequence
+        repeated: Whether the sequence is inside a backtracking repeat
+    """
+    for i, (op, av) in enumerate(items):
+        rest = items[i + 1:]
+        after = _first(rest) + (follow if _nullable(rest) else [])
+        
+        if op in REPEATS:
+            low, high, body = av
+            body = list(body)
+            if op is sre_constants.POSSESSIVE_REPEAT:
+                risk = _check_sequence(body, [], False)
+            elif high > 1:
+                if high == MAXREPEAT and repeated and _overlaps(_first(body), after):
+                    return "nested quantifier"
+                risk = _check_sequence(body, _first(body) + after, True)
+            else:
+                risk = _check_sequence(body, after, repeated)
+            if risk:
+                return risk
+            
+            if high == MAXREPEAT and op is not sre_constants.POSSESSIVE_REPEAT:
+                for next_op, next_av in rest:
+                    if (next_op in BACKTRACKING_REPEATS and next_av[1] == MAXREPEAT
+                            and _overlaps(_first(body), _first(list(next_av[2])))):
+                        return "adjacent quantifiers over overlapping characters"
+                    if not _nullable([(next_op, next_av)]):
+                        break
+        
+        elif op is sre_constants.SUBPATTERN:
+            risk = _check_sequence(list(av[3]), after, repeated)
+            if risk:
+                return risk
+        elif op is sre_constants.ATOMIC_GROUP:
+            risk = _check_sequence(list(av), [], repeated)
+            if risk:
+                return risk
+        elif op is sre_constants.BRANCH:
+            branches = [list(branch) for branch in av[1]]
+            if repeated:
+                # Alternatives that can start alike (an empty one starts
+                # like whatever follows) let iterations split text many ways
+                starts = [_first(branch) + (after if _nullable(branch) else []) for branch in branches]
+                if any(_overlaps(starts[i], starts[j])
+                       for i in range(len(starts)) for j in range(i + 1, len(starts))):
+                    return "quantified alternatives that start alike"
+            for branch in branches:
+                risk = _check_sequence(branch, after, repeated)
+                if risk:
+                    return risk
+        elif op in (sre_constants.ASSERT, sre_constants.ASSERT_NOT):
+            risk = _check_sequence(list(av[1]), [], repeated)
+            if risk:
+                return risk
+    return None
+
+
+def _nullable(items: list) -> bool:
+    """Whether a sequence of parsed items can match the empty string."""
+    for op, av in items:
+        if op in REPEATS:
+            if av[0] > 0 and not _nullable(list(av[2])):
+                return False
+        elif op is sre_constants.SUBPATTERN:
+            if not _nullable(list(av[3])):
+                return False
+        elif op is sre_constants.ATOMIC_GROUP:
+            if not _nullable(list(av)):
+                return False
+        elif op is sre_constants.BRANCH:
+            if not any(_nullable(list(branch)) for branch in av[1]):
+                return False
+        elif op not in (sre_constants.AT, sre_constants.ASSERT, sre_constants.ASSERT_NOT):
+            return False
+    return True
+
+
+def _first(items: list) -> CharacterSets:
+    """Characters a sequence of parsed items can start with."""
+    first: CharacterSets = []
+    for op, av in items:
+        if op is sre_constants.LITERAL:
+            first.append((False, [(op, av)]))
+        elif op is sre_constants.NOT_LITERAL:
+            first.append((True, [(sre_constants.LITERAL, av)]))
+        elif op is sre_constants.ANY:
+            first.append((True, []))
+        elif op is sre_constants.IN:
+            negated = bool(av) and av[0][0] is sre_constants.NEGATE
+            first.append((negated, av[1:] if negated else list(av)))
+        elif op in REPEATS:
+            first.extend(_first(list(av[2])))
+        elif op is sre_constants.SUBPATTERN:
+            first.extend(_first(list(av[3])))
+        elif op is sre_constants.ATOMIC_GROUP:
+            first.extend(_first(list(av)))
+        elif op is sre_constants.BRANCH:
+            for branch in av[1]:
+                first.extend(_first(list(branch)))
+        elif op not in (sre_constants.AT, sre_constants.ASSERT, sre_constants.ASSERT_NOT):
+            # Backreferences and the like: anything
+            first.append((True, []))
+        if not _nullable([(op, av)]):
+            break
+    return first
+
+
+def _in_set(ch: str, negated: bool, members: list) -> bool:
+    """Whether a character (in either case) is in a parsed character set."""
+    for candidate in (ch, ch.swapcase()):
+        found = False
+        for op, av in members:
+            if op is sre_constants.LITERAL:
+                found = ord(candidate) == av
+            elif op is sre_constants.RANGE:
+                found = av[0] <= ord(candidate) <= av[1]
+            elif op is sre_constants.CATEGORY:
+                test = CATEGORY_TESTS.get(av)
+                found = test(candidate) if test else True
+            else:
+                found = True
+            if found:
+                break
+        if found != negated:
+            return True
+    return False
+
+
+def _overlaps(first: CharacterSets, other: CharacterSets) -> bool:
+    """Whether two sets of possible next characters share a character."""
+    if not first or not other:
+        return False
+    probes = set(PROBE_CHARACTERS)
+    for _, members in first + other:
+        for op, av in members:
+            if op is sre_constants.LITERAL:
+                probes.add(chr(av))
+            elif op is sre_constants.RANGE:
+                probes.update((chr(av[0]), chr(av[1])))
+    return any(
+        any(_in_set(ch, negated, members) for negated, members in first)
+        and any(_in_set(ch, negated, members) for negated, members in other)
+        for ch in probes
+    )
+
+
+def _collapse_nested_repeats(parsed: "sre_parse.SubPattern") -> bool:
+    """
+    Rewrite ``(x+)+``-style repeats of a repeated single character in place.
+    
+    ``(X{m,})`` repeated ``{n,k}`` times matches exactly the runs of ``X``
+    of length ``m * n`` or more when ``n >= 1`` or ``m <= 1``, so it
+    becomes ``X{m*n,}``. Patterns with backreferences are left alone, as
+    dropping a group renumbers the others.
+    
+    Returns:
+        Whether anything was rewritten
+    """
+    if any(op in (sre_constants.GROUPREF, sre_constants.GROUPREF_EXISTS) for op, _ in _walk(parsed)):
+        return False
+    
+    changed = False
+    for items in _sequences(parsed):
+        for i, (op, av) in enumerate(items):
+            if op is not sre_constants.MAX_REPEAT:
+                continue
+            low, high, body = av
+            inner = list(body)
+            while len(inner) == 1 and inner[0][0] is sre_constants.SUBPATTERN and not any(inner[0][1][1:3]):
+                inner = list(inner[0][1][3])
+            if len(inner) != 1 or inner[0][0] is not sre_constants.MAX_REPEAT:
+                continue
+            inner_low, inner_high, character = inner[0][1]
+            if inner_high != MAXREPEAT or len(character) != 1 or character[0][0] not in SINGLE_CHARACTER:
+                continue
+            if low < 1 and inner_low > 1:
+                continue
+            items[i] = (sre_constants.MAX_REPEAT, (low * inner_low, MAXREPEAT, character))
+            changed = True
+    return changed
+
+
+def _anchor_leading_repeat(parsed: "sre_parse.SubPattern") -> bool:
+    """
+    Prefix a leading ``X+`` with ``(?<!X)`` in place.
+    
+    Searching retries a pattern at every position, so a leading repeat is
+    rematched from every character of a run of ``X``: quadratic in the run
+    length. A leftmost match always starts where the run does, so only
+    trying run starts finds the same matches in linear time.
+    
+    Returns:
+        Whether the pattern was changed
+    """
+    if not parsed.data or parsed.data[0][0] is not sre_constants.MAX_REPEAT:
+        return False
+    low, high, body = parsed.data[0][1]
+    if low < 1 or high != MAXREPEAT or len(body) != 1:
+        return False
+    if body[0][0] not in SINGLE_CHARACTER or body[0][0] is sre_constants.ANY:
+        return False
+    parsed.data.insert(0, (sre_constants.ASSERT_NOT, (-1, list(body))))
+    return True
+
+
+def _walk(parsed) -> list:
+    """Every (op, av) item of a parsed expression, depth first."""
+    found = []
+    for items in _sequences(parsed):
+        found.extend(items)
+    return found
+
+
+def _sequences(parsed) -> list:
+    """Every item sequence (sub-pattern) of a parsed expression, outermost first."""
+    sequences = [parsed]
+    queue = [parsed]
+    while queue:
+        items = queue.pop()
+        for op, av in items:
+            children = []
+            if op in REPEATS:
+                children = [av[2]]
+            elif op is sre_constants.SUBPATTERN:
+                children = [av[3]]
+            elif op is sre_constants.ATOMIC_GROUP:
+                children = [av]
+            elif op is sre_constants.BRANCH:
+                children = list(av[1])
+            elif op in (sre_constants.ASSERT, sre_constants.ASSERT_NOT):
+                children = [av[1]]
+            sequences.extend(children)
+            queue.extend(children)
+    return sequences
+
+
+
+def _unparse(items, top: bool = False) -> str:
+    """
+    Turn a parsed expression back into pattern text.
+    
+    Raises:
+        ValueError: For constructs the rewriter does not reproduce
+    """
+    prefix = ""
+    if top:
+        letters = "".join(letter for flag, letter in FLAG_LETTERS.items() if items.state.flags & flag)
+        prefix = f"(?{letters})" if letters else ""
+    
+    parts = []
+    for op, av in items:
+        if op is sre_constants.LITERAL:
+            parts.append(re.escape(chr(av)))
+        elif op is sre_constants.NOT_LITERAL:
+            parts.append(f"[^{re.escape(chr(av))}]")
+        elif op is sre_constants.ANY:
+            parts.append(".")
+        elif op is sre_constants.AT and av in AT_ESCAPES:
+            parts.append(AT_ESCAPES[av])
+        elif op is sre_constants.IN:
+            parts.append(_unparse_set(av))
+        elif op is sre_constants.BRANCH:
+            parts.append("(?:" + "|".join(_unparse(branch) for branch in av[1]) + ")")
+        elif op is sre_constants.SUBPATTERN:
+            group, add_flags, del_flags, body = av
+            if add_flags or del_flags:
+                raise ValueError("scoped flags")
+            parts.append(("(" if group else "(?:") + _unparse(body) + ")")
+        elif op is sre_constants.ATOMIC_GROUP:
+            parts.append("(?>" + _unparse(av) + ")")
+        elif op in (sre_constants.ASSERT, sre_constants.ASSERT_NOT):
+            direction, body = av
+            kind = ("=" if op is sre_constants.ASSERT else "!")
+            parts.append(("(?<" if direction < 0 else "(?") + kind + _unparse(body) + ")")
+        elif op in REPEATS:
+            low, high, body = av
+            text = _unparse(body)
+            if len(body) != 1 or body[0][0] not in SINGLE_CHARACTER + (sre_constants.SUBPATTERN,):
+                text = "(?:" + text + ")"
+            if (low, high) == (0, MAXREPEAT):
+                quantifier = "*"
+            elif (low, high) == (1, MAXREPEAT):
+                quantifier = "+"
+            elif (low, high) == (0, 1):
+                quantifier = "?"
+            elif high == MAXREPEAT:
+                quantifier = f"{{{low},}}"
+            elif low == high:
+                quantifier = f"{{{low}}}"
+            else:
+                quantifier = f"{{{low},{high}}}"
+            if op is sre_constants.MIN_REPEAT:
+                quantifier += "?"
+            elif op is sre_constants.POSSESSIVE_REPEAT:
+                quantifier += "+"
+            parts.append(text + quantifier)
+        else:
+            raise ValueError(f"unsupported construct {op}")
+    return prefix + "".join(parts)
+
+
+def _unparse_set(members: list) -> str:
+    """Turn a parsed character set back into a bracket expression."""
+    if len(members) == 1 and members[0][0] is sre_constants.CATEGORY and members[0][1] in CATEGORY_ESCAPES:
+        return CATEGORY_ESCAPES[members[0][1]]
+    parts = []
+    for op, av in members:
+        if op is sre_constants.NEGATE:
+            parts.append("^")
+        elif op is sre_constants.LITERAL:
+            parts.append(re.escape(chr(av)))
+        elif op is sre_constants.RANGE:
+            parts.append(f"{re.escape(chr(av[0]))}-{re.escape(chr(av[1]))}")
+        elif op is sre_constants.CATEGORY and av in CATEGORY_ESCAPES:
+            parts.append(CATEGORY_ESCAPES[av])
+        else:
+            raise ValueError(f"unsupported set member {op}")
+    return "[" + "".join(parts) + "]"
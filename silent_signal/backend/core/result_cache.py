@@ -0,0 +1,122 @@
+"""
+Result Cache - Content-addressed Analysis Results
+
+Keeps the responses of recent analyses, so forwarded messages and pasted
+texts that arrive again are answered without another NIM round trip.
+Entries live in memory only and are keyed by a digest of the normalized
+conversation and of everything else the response depends on. Nothing
+from the conversation text is kept: the orchestrator stores responses
+without evidence excerpts, spans or speaker names, and fills those in
+again from the text of each request that hits the cache.
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional, Tuple
+import logging
+
+from ..models.schemas import AnalysisResponse
+
+logger = logging.getLogger(__name__)
+
+
+def cache_key(*parts: str) -> bytes:
+    """Digest of the parts of a cache key, each length-prefixed so none can run into the next."""
+    digest = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        data = part.encode("utf-8", "surrogatepass")
+        digest.update(len(data).to_bytes(8, "little"))
+        digest.update(data)
+    return digest.digest()
+
+
+@dataclass
+class CachedResult:
+    """A cached response, stripped of its evidence, and when it was stored."""
+    response: AnalysisResponse
+    stored_at: float
+
+
+class AnalysisResultCache:
+    """
+    Least recently used analysis responses with a time to live.
+    
+    Thread-safe; counts hits, misses, expirations and evictions.
+    """
+    
+    def __init__(self, max_size: int = 1024, ttl: float = 3600.0,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Initialize the cache.
+        
+        Args:
+            max_size: Most responses kept; the least recently used go first
+            ttl: Seconds a response is served after it was stored, 0 for no limit
+            clock: Monotonic time source
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[bytes, CachedResult]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.expirations = 0
+        self.evictions = 0
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def get(self, key: bytes) -> Optional[Tuple[AnalysisResponse, float]]:
+        """
+        Cached response for a key.
+        
+        Returns:
+            Tuple of (response, seconds since it was stored), or None on a
+            miss or an expired entry, which is dropped
+        """
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self.ttl > 0 and now - entry.stored_at >= self.ttl:
+                del self._entries[key]
+                self.expirations += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry.response, now - entry.stored_at
+    
+    def put(self, key: bytes, response: AnalysisResponse) -> None:
+        """Store a response, evicting the least recently used beyond ``max_size``."""
+        with self._lock:
+            self._entries[key] = CachedResult(response, self._clock())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+    
+    def clear(self) -> None:
+        """Drop every cached response."""
+        with self._lock:
+            self._entries.clear()
+    
+    def statistics(self) -> Dict[str, Any]:
+        """Consistent snapshot of the size and counters."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl_seconds": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "expirations": self.expirations,
+                "evictions": self.evictions
+            }
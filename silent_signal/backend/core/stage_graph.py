@@ -0,0 +1,265 @@
+"""
+Stage Graph - Dependency-driven Workflow Scheduling
+
+Describes the agentic workflow as a graph of stages that each declare the
+values they consume and produce. A stage starts as soon as its inputs
+exist, so stages that only depend on earlier ones run side by side, and
+the timings of a finished run give its critical path: the chain of
+stages that set its end-to-end latency.
+"""
+
+import asyncio
+from concurrent.futures import Executor, FIRST_COMPLETED, wait
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class WorkflowStage:
+    """
+    A stage of the workflow.
+    
+    ``run`` is called with the values named by ``inputs``, in order, and
+    returns the value of the single output or a tuple of the outputs.
+    """
+    name: str
+    run: Callable[..., Any]
+    inputs: Tuple[str, ...]
+    outputs: Tuple[str, ...]
+    blocking: bool = False          # CPU-bound: run in an executor, off the event loop
+    run_async: Optional[Callable[..., Awaitable[Any]]] = None   # used by run_async instead of run
+    skip: Optional[Callable[[Dict[str, Any]], Optional[Any]]] = None    # outputs of a skipped stage, or None to run it
+
+
+class StageGraph:
+    """
+    Scheduler of a set of workflow stages.
+    
+    Progress is reported through ``update_step(name, status, result, error)``
+    of the context passed to ``run``/``run_async``, whose ``steps`` hold
+    the ``name``, ``start_time`` and ``end_time`` of every stage.
+    """
+    
+    def __init__(self, stages: Iterable[WorkflowStage], initial: Iterable[str]):
+        """
+        Initialize and validate the graph.
+        
+        Args:
+            stages: Stages of the workflow, in reporting order
+            initial: Names of the values given to every run
+        
+        Raises:
+            ValueError: If two stages produce the same value, or a stage
+                consumes a value nothing produces (or a cycle needs)
+        """
+        self.stages: List[WorkflowStage] = list(stages)
+        self.initial = tuple(initial)
+        
+        self.producers: Dict[str, str] = {}
+        for stage in self.stages:
+            for output in stage.outputs:
+                if output in self.producers or output in self.initial:
+                    raise ValueError(f"Value '{output}' of stage '{stage.name}' is produced twice")
+                self.producers[output] = stage.name
+        
+        self._needs: Dict[str, frozenset] = {stage.name: frozenset(stage.inputs) for stage in self.stages}
+        
+        # Stages whose outputs each stage consumes
+        self.dependencies: Dict[str, Tuple[str, ...]] = {
+            stage.name: tuple(dict.fromkeys(
+                self.producers[name] for name in stage.inputs if name in self.producers
+            ))
+            for stage in self.stages
+        }
+        
+        available = set(self.initial)
+        remaining = list(self.stages)
+        while remaining:
+            ready = [stage for stage in remaining if available.issuperset(stage.inputs)]
+            if not ready:
+                missing = sorted({name for stage in remaining for name in stage.inputs} - available)
+                raise ValueError(f"Stages {[stage.name for stage in remaining]} wait for {missing}")
+            for stage in ready:
+                remaining.remove(stage)
+                available.update(stage.outputs)
+    
+    @property
+    def names(self) -> Tuple[str, ...]:
+        """Names of the stages, in reporting order."""
+        return tuple(stage.name for stage in self.stages)
+    
+    def run(self, context: Any, values: Dict[str, Any],
+            executor: Optional[Executor] = None) -> Dict[str, Any]:
+        """
+        Run every stage, blocking until all have finished.
+        
+        When several blocking stages are ready at once, all but one go to
+        the executor and the calling thread runs the last; other stages run
+        on the calling thread.
+        
+        Args:
+            context: Workflow context receiving step updates
+            values: Initial values, updated in place with stage outputs
+            executor: Executor for concurrent blocking stages; None runs
+                every stage on the calling thread
+        
+        Returns:
+            All values of the run
+        """
+        pending = list(self.stages)
+        running = {}
+        try:
+            while pending or running:
+                ready = self._take_ready(pending, values)
+                
+                blocking = [stage for stage in ready if stage.blocking] if executor else []
+                for stage in blocking[:-1]:
+                    running[executor.submit(self._run_stage, stage, context, values)] = stage
+                for stage in [stage for stage in ready if stage not in blocking[:-1]]:
+                    self._store(stage, values, self._run_stage(stage, context, values))
+                
+                if running:
+                    done, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        self._store(running.pop(future), values, future.result())
+        finally:
+            if running:
+                wait(running)
+        return values
+    
+    async def run_async(self, context: Any, values: Dict[str, Any],
+                        executor: Optional[Executor] = None) -> Dict[str, Any]:
+        """
+        Run every stage on the running event loop.
+        
+        Blocking stages run in ``executor`` (the loop's default executor
+        if None), stages with ``run_async`` are awaited, and the others run
+        on the loop itself.
+        
+        Args:
+            context: Workflow context receiving step updates
+            values: Initial values, updated in place with stage outputs
+            executor: Executor for blocking stages
+        
+        Returns:
+            All values of the run
+        """
+        loop = asyncio.get_running_loop()
+        pending = list(self.stages)
+        running = {}
+        try:
+            while pending or running:
+                ready = self._take_ready(pending, values)
+                
+                # Start the stages that leave the loop before running the others on it
+                for stage in sorted(ready, key=lambda stage: not (stage.blocking or stage.run_async)):
+                    if stage.run_async is not None:
+                        running[asyncio.ensure_future(self._run_stage_async(stage, context, values))] = stage
+                    elif stage.blocking:
+                        running[loop.run_in_executor(executor, self._run_stage, stage, context, values)] = stage
+                    else:
+                        self._store(stage, values, self._run_stage(stage, context, values))
+                
+                if running:
+                    done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                    for future in done:
+                        self._store(running.pop(future), values, future.result())
+        finally:
+            if running:
+                await asyncio.wait(running)
+        return values
+    
+    def _take_ready(self, pending: List[WorkflowStage], values: Dict[str, Any]) -> List[WorkflowStage]:
+        """Remove and return the pending stages whose inputs all exist."""
+        ready = [stage for stage in pending if values.keys() >= self._needs[stage.name]]
+        for stage in ready:
+            pending.remove(stage)
+        return ready
+    
+    @staticmethod
+    def _skip(stage: WorkflowStage, context: Any, values: Dict[str, Any]) -> Optional[Any]:
+        """Outputs of the stage if it is skipped, marking it so."""
+        if stage.skip is None:
+            return None
+        result = stage.skip(values)
+        if result is not None:
+            context.update_step(stage.name, "skipped", result)
+        return result
+    
+    def _run_stage(self, stage: WorkflowStage, context: Any, values: Dict[str, Any]) -> Any:
+        """Run a stage, reporting its progress; returns its outputs."""
+        skipped = self._skip(stage, context, values)
+        if skipped is not None:
+            return skipped
+        
+        context.update_step(stage.name, "running")
+        try:
+            result = stage.run(*[values[name] for name in stage.inputs])
+        except Exception as e:
+            context.update_step(stage.name, "failed", error=str(e))
+            raise
+        context.update_step(stage.name, "completed", result)
+        return result
+    
+    async def _run_stage_async(self, stage: WorkflowStage, context: Any, values: Dict[str, Any]) -> Any:
+        """Run a stage with ``run_async``, reporting its progress; returns its outputs."""
+        skipped = self._skip(stage, context, values)
+        if skipped is not None:
+            return skipped
+        
+        context.update_step(stage.name, "running")
+        try:
+            result = await stage.run_async(*[values[name] for name in stage.inputs])
+        except Exception as e:
+            context.update_step(stage.name, "failed", error=str(e))
+            raise
+        context.update_step(stage.name, "completed", result)
+        return result
+    
+    @staticmethod
+    def _store(stage: WorkflowStage, values: Dict[str, Any], result: Any) -> None:
+        """Store the outputs of a finished stage."""
+        if len(stage.outputs) == 1:
+            values[stage.outputs[0]] = result
+        else:
+            values.update(zip(stage.outputs, result))
+    
+    def critical_path(self, context: Any, started: float) -> List[Dict[str, Any]]:
+        """
+        Chain of stages that set the latency of a run.
+        
+        Starting from the stage that finished last, each step goes back to
+        the dependency that finished last, i.e. the one the stage waited
+        for. Stages that have not finished are left out.
+        
+        Args:
+            context: Workflow context of the run
+            started: Time the run started
+        
+        Returns:
+            Stages of the path in order, with their duration and the time
+            they waited between their last dependency finishing and starting
+        """
+        steps = {step.name: step for step in context.steps}
+        ends = {name: steps[name].end_time for name in self.names if steps[name].end_time is not None}
+        if not ends:
+            return []
+        
+        path = []
+        current = max(ends, key=ends.get)
+        while current is not None:
+            step = steps[current]
+            previous = max((name for name in self.dependencies[current] if name in ends),
+                           key=ends.get, default=None)
+            ready = ends[previous] if previous is not None else started
+            begin = step.start_time if step.start_time is not None else step.end_time
+            path.append({
+                "name": current,
+                "duration": step.end_time - begin,
+                "wait": max(begin - ready, 0.0)
+            })
+            current = previous
+        return path[::-1]
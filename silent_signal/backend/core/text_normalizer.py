@@ -0,0 +1,215 @@
+"""
+Text Normalizer - Pre-matching Normalization Stage
+
+Folds Unicode quotes, collapses elongated letters and expands chat slang
+before pattern matching, keeping an offset map back to the original text.
+"""
+
+import re
+import json
+from array import array
+from itertools import product
+from typing import Dict, FrozenSet, Iterable, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Typographic quotes and look-alikes folded to their ASCII form
+QUOTE_TRANSLATION = str.maketrans({
+    "‘": "'",  # left single quotation mark
+    "’": "'",  # right single quotation mark
+    "‚": "'",  # single low-9 quotation mark
+    "‛": "'",  # single high-reversed-9 quotation mark
+    "ʼ": "'",  # modifier letter apostrophe
+    "′": "'",  # prime
+    "´": "'",  # acute accent
+    "`": "'",
+    "“": '"',  # left double quotation mark
+    "”": '"',  # right double quotation mark
+    "„": '"',  # double low-9 quotation mark
+    "″": '"',  # double prime
+})
+
+# Chat slang and dropped-apostrophe spellings, expanded to indicator wording.
+# Only spellings with one reading: "ur" is "your" as often as "you're", and
+# expanding it to either would break indicators written with the other.
+DEFAULT_SLANG = {
+    "u": "you",
+    "ya": "you",
+    "youre": "you're",
+    "urself": "yourself",
+    "r": "are",
+    "im": "i'm",
+    "ive": "i've",
+    "dont": "don't",
+    "cant": "can't",
+    "wont": "won't",
+    "didnt": "didn't",
+    "doesnt": "doesn't",
+    "thats": "that's",
+    "theyre": "they're",
+    "youll": "you'll",
+    "luv": "love",
+    "bc": "because",
+    "cuz": "because",
+    "pls": "please",
+    "plz": "please",
+    "ppl": "people",
+    "nvm": "never mind",
+    "idc": "i don't care",
+    "whatevs": "whatever",
+}
+
+# A run of three or more of the same letter, and the letters ending a word
+ELONGATION_PATTERN = re.compile(r"([a-z])\1{2,}")
+WORD_TAIL_PATTERN = re.compile(r"[a-z]*")
+WORD_PATTERN = re.compile(r"[a-z]+")
+
+# Most runs in a word whose single-letter spellings are looked up one by one
+MAX_VOCABULARY_RUNS = 4
+
+
+def phrase_words(phrases: Iterable[str]) -> FrozenSet[str]:
+    """Words of lowercase phrases, the vocabulary elongated words may collapse to."""
+    return frozenset(word for phrase in phrases for word in WORD_PATTERN.findall(phrase))
+
+
+class NormalizedText:
+    """
+    Normalized text with a map back to original character offsets.
+    
+    ``starts[i]``/``ends[i]`` give the original span that produced
+    normalized character ``i``; both are None when nothing changed.
+    """
+    
+    __slots__ = ("text", "starts", "ends")
+    
+    def __init__(self, text: str, starts: Optional[array] = None,
+                 ends: Optional[array] = None):
+        self.text = text
+        self.starts = starts
+        self.ends = ends
+    
+    def original_span(self, start: int, end: int) -> Tuple[int, int]:
+        """Map a normalized span to the original text."""
+        if self.starts is None or end <= start:
+            return start, end
+        return self.starts[start], self.ends[end - 1]
+
+
+class TextNormalizer:
+    """
+    Single-pass normalizer applied in front of the pattern engine.
+    
+    Quotes are folded with a translation table (one character each, so
+    offsets are unchanged); slang words and words with runs of three or
+    more repeated letters are then rewritten in one scan of a precompiled
+    expression. Runs collapse to two letters ("killlll" to "kill"), or to
+    one where only that spelling is in the vocabulary ("stoppppp" to
+    "stop").
+    """
+    
+    def __init__(self, slang_dictionary_path: Optional[str] = None,
+                 vocabulary: Iterable[str] = ()):
+        """
+        Initialize the normalizer.
+        
+        Args:
+            slang_dictionary_path: Optional JSON object of extra slang
+                expansions, merged over the built-in dictionary
+            vocabulary: Lowercase words that elongated words may collapse to
+                with single letters
+        """
+        self.slang = dict(DEFAULT_SLANG)
+        if slang_dictionary_path:
+            self._load_slang_dictionary(slang_dictionary_path)
+        self.vocabulary = frozenset(vocabulary)
+        
+        words = sorted(self.slang, key=len, reverse=True)
+        self.pattern = re.compile(
+            r"\b(?:" + "|".join(map(re.escape, words)) + r")\b|([a-z])\1{2,}"
+        )
+    
+    def _load_slang_dictionary(self, slang_dictionary_path: str) -> None:
+        """Load additional slang expansions from JSON file."""
+        try:
+            with open(slang_dictionary_path, 'r', encoding='utf-8') as f:
+                slang_data = json.load(f)
+            
+            for word, expansion in slang_data.items():
+                self.slang[word.lower()] = expansion.lower()
+        
+        except Exception as e:
+            logger.warning(f"Failed to load slang dictionary from {slang_dictionary_path}: {e}")
+    
+    def normalize(self, text_lower: str) -> NormalizedText:
+        """
+        Normalize lowercased text.
+        
+        Args:
+            text_lower: Lowercased input text
+        
+        Returns:
+            Normalized text with its offset map
+        """
+        folded = text_lower.translate(QUOTE_TRANSLATION)
+        
+        pieces = []
+        starts = array("l")
+        ends = array("l")
+        last = 0
+        
+        for match in self.pattern.finditer(folded):
+            start, end = match.span()
+            if match.group(1):
+                if start < last:
+                    continue    # a later run of a word already collapsed
+                
+                # Collapse the whole word the run is in
+                while start > last and "a" <= folded[start - 1] <= "z":
+                    start -= 1
+                end = WORD_TAIL_PATTERN.match(folded, end).end()
+                replacement = self._collapse(folded[start:end])
+            else:
+                replacement = self.slang[match.group()]
+            
+            if start > last:
+                pieces.append(folded[last:start])
+                starts.extend(range(last, start))
+                ends.extend(range(last + 1, start + 1))
+            pieces.append(replacement)
+            starts.extend([start] * len(replacement))
+            ends.extend([end] * len(replacement))
+            last = end
+        
+        if not pieces:
+            return NormalizedText(folded)
+        
+        if last < len(folded):
+            pieces.append(folded[last:])
+            starts.extend(range(last, len(folded)))
+            ends.extend(range(last + 1, len(folded) + 1))
+        
+        return NormalizedText("".join(pieces), starts, ends)
+    
+    def _collapse(self, word: str) -> str:
+        """
+        Spelling of an elongated word with its runs of letters collapsed.
+        
+        Every run becomes two letters unless a spelling with some runs as
+        single letters is in the vocabulary; the fewest single letters win.
+        """
+        parts = ELONGATION_PATTERN.split(word)
+        doubled = "".join(part * 2 if i % 2 else part for i, part in enumerate(parts))
+        if not self.vocabulary or doubled in self.vocabulary:
+            return doubled
+        
+        runs = len(parts) // 2
+        choices = product((2, 1), repeat=runs) if runs <= MAX_VOCABULARY_RUNS else [(1,) * runs]
+        for counts in choices:
+            candidate = parts[0] + "".join(
+                parts[2 * i + 1] * count + parts[2 * i + 2] for i, count in enumerate(counts)
+            )
+            if candidate in self.vocabulary:
+                return candidate
+        return doubled
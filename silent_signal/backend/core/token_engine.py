@@ -0,0 +1,313 @@
+"""
+Token Engine - Word-boundary-aware Phrase Matcher
+
+Tokenizes text once into integer token ids and walks a token-level trie,
+so indicators only match whole words ("perfect" no longer fires inside
+"perfectly").
+"""
+
+import re
+from typing import Dict, List, Optional, Set, Tuple
+import logging
+
+from .pattern_engine import PatternEngine, MatchSpans
+from .text_normalizer import DEFAULT_SLANG
+
+logger = logging.getLogger(__name__)
+
+# Words, with inner apostrophes kept so "you're" stays one token
+TOKEN_PATTERN = re.compile(r"[^\W_]+(?:'[^\W_]+)*")
+
+# Chat spellings that only drop an apostrophe ("youre", "dont"); spellings
+# that are words of their own ("ill", "well", "were") are not among them
+APOSTROPHE_SLANG = {
+    short: word for short, word in DEFAULT_SLANG.items()
+    if "'" in word and short == word.replace("'", "")
+}
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into word tokens."""
+    return TOKEN_PATTERN.findall(text)
+
+
+class TokenTrieEngine(PatternEngine):
+    """
+    Pattern engine that matches literal phrases as whole-word token sequences.
+    
+    Every distinct phrase token gets an integer id; the chat spellings in
+    ``APOSTROPHE_SLANG`` share the id of their contraction ("youre" =
+    "you're"), other apostrophe-less words do not ("ill", "were"). Text
+    tokens outside the vocabulary map to -1 and can never continue a phrase. Punctuation
+    between words is not significant, so "fine whatever" matches
+    "fine, whatever".
+    
+    Phrases of fuzzy categories also match with one token off by a single
+    character edit (insertion, deletion, substitution or adjacent swap),
+    e.g. "your imagining things". Candidate tokens come from a deletion
+    neighborhood index, a fixed number of dictionary lookups per text token,
+    so the cost stays linear in the message length.
+    """
+    
+    name = "token"
+    
+    # Shortest phrase token that may be matched approximately
+    min_fuzzy_length = 4
+    
+    def _compile_literals(self) -> None:
+        """Build the token vocabulary and the token-level trie."""
+        self.vocabulary: Dict[str, int] = {}
+        
+        # Node 0 is the root; children map token id -> node
+        self.children: List[Dict[int, int]] = [{}]
+        self.terminals: List[Tuple[int, ...]] = [()]
+        self.max_phrase_tokens = 0
+        fuzzy_tokens: Dict[str, Set[int]] = {}
+        
+        for phrase, indicator in self.phrase_ids.items():
+            tokens = tokenize(phrase)
+            if not tokens:
+                continue
+            token_ids = [self._token_id(token) for token in tokens]
+            if indicator in self.fuzzy_indicators:
+                for token, token_id in zip(tokens, token_ids):
+                    fuzzy_tokens.setdefault(token.replace("'", ""), set()).add(token_id)
+            
+            node = 0
+            for token_id in token_ids:
+                child = self.children[node].get(token_id)
+                if child is None:
+                    child = len(self.children)
+                    self.children[node][token_id] = child
+                    self.children.append({})
+                    self.terminals.append(())
+                node = child
+            
+            # Phrases differing only in punctuation end on the same node
+            self.terminals[node] += (indicator,)
+            self.max_phrase_tokens = max(self.max_phrase_tokens, len(tokens))
+        
+        self.first_tokens = frozenset(self.children[0])
+        self._compile_fuzzy(fuzzy_tokens)
+    
+    def _compile_fuzzy(self, fuzzy_tokens: Dict[str, Set[int]]) -> None:
+        """Index the tokens of fuzzy phrases, apostrophes dropped, by their one-edit neighborhoods."""
+        self.fuzzy_terminals: List[Tuple[int, ...]] = [
+            tuple(indicator for indicator in terminals if indicator in self.fuzzy_indicators)
+            for terminals in self.terminals
+        ]
+        
+        # Bare token -> ids, and neighborhood key -> ids. A key is the token
+        # with one letter deleted (text token missing a letter) or replaced
+        # by "\0" (text token with a wrong letter).
+        self.fuzzy_tokens: Dict[str, Tuple[int, ...]] = {}
+        self.fuzzy_neighbors: Dict[str, Tuple[int, ...]] = {}
+        for token, token_ids in fuzzy_tokens.items():
+            if len(token) < self.min_fuzzy_length:
+                continue
+            self.fuzzy_tokens[token] = tuple(sorted(token_ids))
+            for i in range(len(token)):
+                for key in (token[:i] + token[i + 1:], token[:i] + "\0" + token[i + 1:]):
+                    for token_id in token_ids:
+                        if token_id not in self.fuzzy_neighbors.get(key, ()):
+                            self.fuzzy_neighbors[key] = self.fuzzy_neighbors.get(key, ()) + (token_id,)
+        
+        self.max_fuzzy_length = max(map(len, self.fuzzy_tokens), default=0)
+        
+        # Text token -> candidates; cleared when full so memory stays bounded
+        self._fuzzy_cache: Dict[str, Tuple[int, ...]] = {}
+        self.fuzzy_cache_size = 65536
+    
+    def _token_id(self, token: str) -> int:
+        """Return the id of a phrase token, registering it and its chat spelling, if any."""
+        token_id = self.vocabulary.get(token)
+        if token_id is None:
+            bare = token.replace("'", "")
+            if APOSTROPHE_SLANG.get(bare) == token:
+                token_id = self.vocabulary.setdefault(bare, len(self.vocabulary))
+            else:
+                token_id = len(self.vocabulary)
+            self.vocabulary[token] = token_id
+        return token_id
+    
+    def _fuzzy_candidates(self, token: str) -> Tuple[int, ...]:
+        """Ids of fuzzy phrase tokens exactly one edit away from a text token."""
+        cached = self._fuzzy_cache.get(token)
+        if cached is not None:
+            return cached
+        
+        bare = token.replace("'", "")
+        length = len(bare)
+        if length < self.min_fuzzy_length - 1 or length > self.max_fuzzy_length + 1:
+            return ()
+        
+        fuzzy_tokens = self.fuzzy_tokens
+        neighbors = self.fuzzy_neighbors
+        candidates = set(neighbors.get(bare, ()))
+        for i in range(length):
+            candidates.update(neighbors.get(bare[:i] + "\0" + bare[i + 1:], ()))
+            candidates.update(fuzzy_tokens.get(bare[:i] + bare[i + 1:], ()))
+            if i + 1 < length and bare[i] != bare[i + 1]:
+                candidates.update(fuzzy_tokens.get(bare[:i] + bare[i + 1] + bare[i] + bare[i + 2:], ()))
+        
+        candidates.discard(self.vocabulary.get(token, -1))
+        
+        if len(self._fuzzy_cache) >= self.fuzzy_cache_size:
+            self._fuzzy_cache.clear()
+        cached = self._fuzzy_cache[token] = tuple(candidates)
+        return cached
+    
+    def find_phrases(self, text_lower: str, start: int = 0, end: Optional[int] = None,
+                     spans: Optional[MatchSpans] = None,
+                     fuzzy: Optional[Dict[int, int]] = None) -> Set[int]:
+        """
+        Tokenize lowercased text once and return every phrase it contains.
+        
+        Args:
+            text_lower: Lowercased input text
+            start: Position to start tokenizing at; must be a token boundary
+            end: Only consider matches whose first token starts before this position
+            spans: Optional span record to append every hit to
+            fuzzy: Optional mapping to record approximate matches of fuzzy
+                phrases in, as indicator id -> edit distance
+        
+        Returns:
+            Set of matched indicator ids
+        """
+        matched: Set[int] = set()
+        vocabulary = self.vocabulary
+        
+        if spans is None and start == 0 and end is None:
+            tokens = TOKEN_PATTERN.findall(text_lower)
+            positions = None
+        else:
+            found = list(TOKEN_PATTERN.finditer(text_lower, start))
+            tokens = [token.group() for token in found]
+            positions = [token.span() for token in found]
+        token_ids = [vocabulary.get(token, -1) for token in tokens]
+        
+        children = self.children
+        terminals = self.terminals
+        first_tokens = self.first_tokens
+        count = len(token_ids)
+        
+        for i in range(count):
+            if token_ids[i] not in first_tokens:
+                continue
+            if end is not None and positions[i][0] >= end:
+                break
+            
+            node = 0
+            j = i
+            while j < count:
+                node = children[node].get(token_ids[j])
+                if node is None:
+                    break
+                for indicator in terminals[node]:
+                    matched.add(indicator)
+                    if spans is not None:
+                        spans.add(indicator, positions[i][0], positions[j][1])
+                j += 1
+        
+        if fuzzy is not None and self.fuzzy_tokens:
+            self._find_fuzzy(tokens, token_ids, positions, end, spans, fuzzy)
+        return matched
+    
+    def _find_fuzzy(self, tokens: List[str], token_ids: List[int],
+                    positions: Optional[List[Tuple[int, int]]], end: Optional[int],
+                    spans: Optional[MatchSpans], fuzzy: Dict[int, int]) -> None:
+        """
+        Walk the trie allowing one edited token per phrase.
+        
+        Each walk holds the exact path plus at most one branch per edited
+        token, and stops after ``max_phrase_tokens`` tokens.
+        """
+        children = self.children
+        fuzzy_terminals = self.fuzzy_terminals
+        count = len(tokens)
+        candidates: List[Optional[Tuple[int, ...]]] = [None] * count
+        
+        for i in range(count):
+            if end is not None and positions[i][0] >= end:
+                break
+            
+            # (node, edited) pairs still inside the trie
+            states = [(0, False)]
+            j = i
+            while states and j < count:
+                if candidates[j] is None:
+                    candidates[j] = self._fuzzy_candidates(tokens[j])
+                
+                advanced = []
+                for node, edited in states:
+                    child = children[node].get(token_ids[j])
+                    if child is not None:
+                        advanced.append((child, edited))
+                    if not edited:
+                        for token_id in candidates[j]:
+                            child = children[node].get(token_id)
+                            if child is not None:
+                                advanced.append((child, True))
+                
+                for node, edited in advanced:
+                    if not edited:
+                        continue
+                    for indicator in fuzzy_terminals[node]:
+                        fuzzy[indicator] = 1
+                        if spans is not None:
+                            spans.add(indicator, positions[i][0], positions[j][1], 1)
+                
+                states = advanced
+                j += 1
+    
+    def stream_limit(self, buffer: str, start: int) -> int:
+        """
+        Position before which phrase matches in a growing buffer are final.
+        
+        A match is final once its longest possible continuation of
+        ``max_phrase_tokens`` tokens is complete; a token touching the end of
+        the buffer may still grow. The limit is always a token start (or the
+        buffer end), so the next scan can begin there.
+        
+        Args:
+            buffer: Lowercased text received so far (possibly truncated)
+            start: First position not yet accepted, a token boundary
+        
+        Returns:
+            Limit position, at least ``start``
+        """
+        tokens = list(TOKEN_PATTERN.finditer(buffer, start))
+        token_starts = [token.start() for token in tokens]
+        complete = len(tokens)
+        
+        # The last token may still grow if it reaches the end of the buffer,
+        # directly or through a trailing apostrophe ("you'" + "re")
+        if tokens and not buffer[tokens[-1].end():].strip("'"):
+            complete -= 1
+        
+        accepted = complete - max(self.max_phrase_tokens, 1) + 1
+        if accepted <= 0:
+            return start
+        if accepted < len(token_starts):
+            return token_starts[accepted]
+        return len(buffer)
+    
+    def scan_end(self, text: str, limit: int) -> int:
+        """
+        Position text must be scanned up to so matches starting before ``limit`` are complete.
+        
+        A match starting before ``limit``, a token boundary, spans at most
+        ``max_phrase_tokens - 1`` tokens after it, so the text is cut at the
+        start of the next one.
+        
+        Args:
+            text: Lowercased text
+            limit: End of the chunk of match starts being scanned
+        
+        Returns:
+            Scan end position, at most ``len(text)``
+        """
+        for count, token in enumerate(TOKEN_PATTERN.finditer(text, limit), 1):
+            if count >= self.max_phrase_tokens:
+                return token.start()
+        return len(text)
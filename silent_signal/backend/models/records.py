@@ -0,0 +1,83 @@
+"""
+Internal result records for SilentSignal.
+
+Slotted dataclasses passed between pipeline stages in place of the
+Pydantic response models, which are only built once for the API response.
+"""
+
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Union
+
+from .schemas import PatternInfo, EvidenceSpan
+
+
+@dataclass(slots=True)
+class EvidenceRecord:
+    """Location of one indicator hit in the analyzed conversation."""
+    indicator: str
+    start: int
+    end: int
+    line: int
+    speaker: Optional[str] = None
+    edit_distance: int = 0
+    
+    def to_model(self) -> EvidenceSpan:
+        """Build the response model."""
+        return EvidenceSpan.model_construct(
+            indicator=self.indicator,
+            start=self.start,
+            end=self.end,
+            line=self.line,
+            speaker=self.speaker,
+            edit_distance=self.edit_distance
+        )
+
+
+@dataclass(slots=True)
+class PatternRecord:
+    """Information about a detected pattern."""
+    name: str
+    severity: str
+    description: str
+    confidence: float
+    evidence: Optional[str] = None
+    spans: Optional[List[EvidenceRecord]] = None
+    
+    def to_model(self, converted: Optional[Dict[int, EvidenceSpan]] = None) -> PatternInfo:
+        """
+        Build the response model, validating the pattern fields.
+        
+        Args:
+            converted: Span models already built, by record id; a hit shared
+                by several categories then stays one shared model
+        
+        Returns:
+            PatternInfo for the API response
+        """
+        spans = None
+        if self.spans is not None:
+            if converted is None:
+                converted = {}
+            spans = []
+            for span in self.spans:
+                model = converted.get(id(span))
+                if model is None:
+                    model = converted[id(span)] = span.to_model()
+                spans.append(model)
+        return PatternInfo(
+            name=self.name,
+            severity=self.severity,
+            description=self.description,
+            confidence=self.confidence,
+            evidence=self.evidence,
+            spans=spans
+        )
+
+
+def to_pattern_models(patterns: Sequence[Union[PatternRecord, PatternInfo]]) -> List[PatternInfo]:
+    """Convert pattern records to response models, passing models through."""
+    converted: Dict[int, EvidenceSpan] = {}
+    return [
+        pattern.to_model(converted) if isinstance(pattern, PatternRecord) else pattern
+        for pattern in patterns
+    ]
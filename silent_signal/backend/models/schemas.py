@@ -20,6 +20,17 @@ class AnalysisRequest(BaseModel):
     """Request model for conversation analysis."""
     conversation: str = Field(..., description="The conversation text to analyze")
     user_id: Optional[str] = Field(None, description="Optional user identifier")
+    tenant_id: Optional[str] = Field(None, description="Partner organization whose pattern overlay applies")
+
+
+class EvidenceSpan(BaseModel):
+    """Location of one indicator hit in the analyzed conversation."""
+    indicator: str = Field(..., description="Indicator phrase or pattern that matched")
+    start: int = Field(..., description="Start character offset in the conversation")
+    end: int = Field(..., description="End character offset in the conversation")
+    line: int = Field(..., description="Line number of the hit (1-based)")
+    speaker: Optional[str] = Field(None, description="Speaker of the line, if labelled")
+    edit_distance: int = Field(0, description="Character edits between the indicator and the text (0 for exact hits)")
 
 
 class PatternInfo(BaseModel):
@@ -29,6 +40,7 @@ class PatternInfo(BaseModel):
     description: str = Field(..., description="Pattern description")
     confidence: float = Field(..., description="Confidence score (0-1)")
     evidence: Optional[str] = Field(None, description="Specific words or phrases that triggered this pattern")
+    spans: Optional[List[EvidenceSpan]] = Field(None, description="Locations of rule-based indicator hits")
 
 
 class AnalysisResponse(BaseModel):
@@ -41,6 +53,7 @@ class AnalysisResponse(BaseModel):
     resources: List[str] = Field(..., description="Available resources")
     analysis_details: Dict[str, Any] = Field(..., description="Detailed analysis information")
     reasoning: str = Field(..., description="AI reasoning for the analysis")
+    partial: bool = Field(False, description="Analysis stopped early once the risk level was final")
 
 
 class HealthResponse(BaseModel):
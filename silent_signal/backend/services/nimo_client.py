@@ -6,16 +6,39 @@ Production-quality implementation with comprehensive error handling.
 """
 
 import requests
+import httpx
 import json
 import os
-from typing import Dict, List, Any, Optional
+import asyncio
+import threading
+from typing import Dict, List, Any, Optional, Tuple
 import logging
-from openai import OpenAI
+from openai import OpenAI, AsyncOpenAI
 
 from ...config.settings import settings
 
 logger = logging.getLogger(__name__)
 
+# Connections per asynchronous HTTP client; the HTTP pool rescans all its
+# connections for every request it hands out or takes back, so large
+# connection counts are split over several small clients
+ASYNC_SHARD_CONNECTIONS = 16
+
+# Red flag types the model is asked to choose from
+RED_FLAG_TYPES = (
+    "gaslighting", "guilt_tripping", "threats", "emotional_manipulation",
+    "self_harm_coercion", "isolation", "control", "intimidation"
+)
+
+
+class AsyncShard:
+    """Asynchronous HTTP client (and SDK client on top of it) with its load."""
+    
+    def __init__(self, http_client: httpx.AsyncClient, openai_client: Optional[AsyncOpenAI]):
+        self.http_client = http_client
+        self.openai_client = openai_client
+        self.in_flight = 0
+
 
 class NimoClient:
     """
@@ -34,6 +57,7 @@ class NimoClient:
         self.use_openai_sdk = settings.nim_use_openai_sdk
         self.reasoning_min = settings.nim_reasoning_min
         self.reasoning_max = settings.nim_reasoning_max
+        self.max_connections = settings.nim_max_connections
         
         # Initialize OpenAI client if using SDK
         self.openai_client = None
@@ -48,6 +72,10 @@ class NimoClient:
                 logger.warning(f"Failed to initialize OpenAI SDK: {e}")
                 self.use_openai_sdk = False
         
+        # Asynchronous clients and connection slots of each event loop using them
+        self._async_lock = threading.Lock()
+        self._async_clients: Dict[asyncio.AbstractEventLoop, Tuple[List[AsyncShard], asyncio.Semaphore]] = {}
+        
         # Validate configuration
         self._validate_configuration()
     
@@ -87,19 +115,112 @@ class NimoClient:
             else:
                 response = self._call_nim_api(prompt)
             
-            # Parse and validate response
-            parsed_response = self._parse_response(response)
+            return self._complete_analysis(response, context)
+            
+        except Exception as e:
+            logger.error(f"NIM analysis error: {e}")
+            return self._get_fallback_response(str(e))
+    
+    async def analyze_conversation_async(self, context: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Analyze conversation like ``analyze_conversation``, awaiting the NIM call.
+        
+        The request goes through asynchronous HTTP clients, so waiting for
+        NIM blocks neither the event loop nor a thread.
+        
+        Args:
+            context: Analysis context containing conversation, patterns, and RAG data
+            
+        Returns:
+            Structured analysis result with confidence scores and reasoning
+        """
+        try:
+            conversation_text = context.get("conversation", "")
+            if not conversation_text.strip():
+                return self._get_fallback_response("Empty conversation text")
+            
+            prompt = self._create_enriched_prompt(context)
             
-            # Enhance with confidence scoring
-            enhanced_response = self._enhance_with_confidence(parsed_response, context)
+            # Wait for a free connection here rather than in an HTTP pool,
+            # then send the request through the least loaded client
+            shards, slots = self._get_async_shards()
+            async with slots:
+                shard = min(shards, key=lambda candidate: candidate.in_flight)
+                shard.in_flight += 1
+                try:
+                    if self.use_openai_sdk and shard.openai_client:
+                        response = await self._call_nim_api_openai_async(shard.openai_client, prompt)
+                    else:
+                        response = await self._call_nim_api_async(shard.http_client, prompt)
+                finally:
+                    shard.in_flight -= 1
             
-            logger.info("NIM analysis completed successfully")
-            return enhanced_response
+            return self._complete_analysis(response, context)
             
         except Exception as e:
             logger.error(f"NIM analysis error: {e}")
             return self._get_fallback_response(str(e))
     
+    def _complete_analysis(self, response: Dict[str, Any], context: Dict[str, Any]) -> Dict[str, Any]:
+        """Parse a NIM response and enhance it with confidence scoring."""
+        # Parse and validate response
+        parsed_response = self._parse_response(response)
+        
+        # Enhance with confidence scoring
+        enhanced_response = self._enhance_with_confidence(parsed_response, context)
+        
+        logger.info("NIM analysis completed successfully")
+        return enhanced_response
+    
+    def _get_async_shards(self) -> Tuple[List[AsyncShard], asyncio.Semaphore]:
+        """
+        Asynchronous clients for the running event loop, ``max_connections``
+        connections in all, and the semaphore limiting requests to them.
+        
+        Pooled connections belong to the loop they were opened on, so every
+        loop gets clients of its own, kept until ``aclose`` is awaited on it.
+        Clients of loops closed without that can no longer be closed
+        through them and are dropped, which closes their sockets.
+        """
+        loop = asyncio.get_running_loop()
+        with self._async_lock:
+            for closed in [other for other in self._async_clients if other.is_closed()]:
+                logger.warning("Dropping asynchronous NIM clients of a closed event loop")
+                del self._async_clients[closed]
+            clients = self._async_clients.get(loop)
+        if clients is None:
+            shards = []
+            ssl_context = httpx.create_ssl_context()
+            remaining = max(self.max_connections, 1)
+            while remaining > 0:
+                connections = min(remaining, ASYNC_SHARD_CONNECTIONS)
+                remaining -= connections
+                http_client = httpx.AsyncClient(
+                    verify=ssl_context,
+                    timeout=self.timeout,
+                    limits=httpx.Limits(max_connections=connections,
+                                        max_keepalive_connections=connections)
+                )
+                openai_client = None
+                if self.openai_client is not None:
+                    openai_client = AsyncOpenAI(
+                        api_key=self.api_key,
+                        base_url=self.base_url,
+                        http_client=http_client
+                    )
+                shards.append(AsyncShard(http_client, openai_client))
+            clients = (shards, asyncio.Semaphore(max(self.max_connections, 1)))
+            with self._async_lock:
+                self._async_clients[loop] = clients
+        return clients
+    
+    async def aclose(self) -> None:
+        """Close the running event loop's asynchronous HTTP clients and their pooled connections."""
+        with self._async_lock:
+            shards, _ = self._async_clients.pop(asyncio.get_running_loop(), ([], None))
+        for shard in shards:
+            await shard.http_client.aclose()
+    
     def _create_enriched_prompt(self, context: Dict[str, Any]) -> str:
         """Create enriched prompt with RAG context and pattern information."""
         conversation = context.get("conversation", "")
@@ -120,6 +241,7 @@ class NimoClient:
             context_info.append(f"Available pattern categories: {rag_data.get('total_patterns', 0)}")
         
         context_str = "\n".join(context_info) if context_info else "No additional context available"
+        red_flag_types = "|".join(RED_FLAG_TYPES)
         
         prompt = f"""
 You are an expert psychologist specializing in emotional abuse detection in digital communication. You excel at understanding modern chat language, slang, abbreviations, and subtle manipulation tactics used in text messages and online conversations.
@@ -144,7 +266,7 @@ Analyze this conversation for emotional abuse patterns and provide your assessme
     "reasoning": "Detailed explanation of your analysis including specific language patterns detected",
     "red_flags": [
         {{
-            "type": "gaslighting|guilt_tripping|threats|emotional_manipulation|self_harm_coercion|isolation|control|intimidation",
+            "type": "{red_flag_types}",
             "severity": "low|medium|high|critical",
             "description": "What specific behavior or language was detected",
             "explanation": "Why this is concerning and how it affects the recipient",
@@ -168,40 +290,82 @@ Be thorough in understanding context, slang, and modern communication patterns.
         
         return prompt.strip()
     
+    def _openai_request_params(self, prompt: str) -> Dict[str, Any]:
+        """Chat completion parameters for the OpenAI SDK."""
+        request_params = {
+            "model": self.model,
+            "messages": [
+                {"role": "system", "content": "You are an expert in emotional abuse detection and psychological safety."},
+                {"role": "user", "content": prompt}
+            ],
+            "temperature": 0.1,
+            "max_tokens": 2000,
+            "timeout": self.timeout
+        }
+        
+        # Add reasoning parameters if configured
+        if self.reasoning_min > 0 or self.reasoning_max > 0:
+            # Note: reasoning tokens are not supported in standard OpenAI SDK
+            # These parameters are specific to Nemotron-3 and may need custom handling
+            pass
+        
+        return request_params
+    
+    @staticmethod
+    def _openai_result(response: Any) -> Dict[str, Any]:
+        """Content, reasoning and usage of an OpenAI SDK chat completion."""
+        content = response.choices[0].message.content
+        reasoning = getattr(response.choices[0].message, 'reasoning', None)
+        
+        return {
+            "content": content,
+            "reasoning": reasoning,
+            "usage": response.usage.__dict__ if response.usage else {},
+            "model": response.model
+        }
+    
+    def _http_request(self, prompt: str) -> Tuple[str, Dict[str, str], Dict[str, Any]]:
+        """URL, headers and JSON payload of a direct HTTP chat completion request."""
+        headers = {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json"
+        }
+        
+        payload = {
+            "model": self.model,
+            "messages": [
+                {"role": "system", "content": "You are an expert in emotional abuse detection."},
+                {"role": "user", "content": prompt}
+            ],
+            "temperature": 0.1,
+            "max_tokens": 2000
+        }
+        
+        # Add reasoning parameters if configured
+        if self.reasoning_min > 0 or self.reasoning_max > 0:
+            # Note: reasoning tokens are not supported in standard OpenAI SDK
+            # These parameters are specific to Nemotron-3 and may need custom handling
+            pass
+        
+        return f"{self.base_url}/chat/completions", headers, payload
+    
     def _call_nim_api_openai(self, prompt: str) -> Dict[str, Any]:
         """Call NIM API using OpenAI SDK."""
         try:
-            # Prepare request parameters
-            request_params = {
-                "model": self.model,
-                "messages": [
-                    {"role": "system", "content": "You are an expert in emotional abuse detection and psychological safety."},
-                    {"role": "user", "content": prompt}
-                ],
-                "temperature": 0.1,
-                "max_tokens": 2000,
-                "timeout": self.timeout
-            }
-            
-            # Add reasoning parameters if configured
-            if self.reasoning_min > 0 or self.reasoning_max > 0:
-                # Note: reasoning tokens are not supported in standard OpenAI SDK
-                # These parameters are specific to Nemotron-3 and may need custom handling
-                pass
-            
-            # Make API call
-            response = self.openai_client.chat.completions.create(**request_params)
-            
-            # Extract content
-            content = response.choices[0].message.content
-            reasoning = getattr(response.choices[0].message, 'reasoning', None)
+            response = self.openai_client.chat.completions.create(**self._openai_request_params(prompt))
+            return self._openai_result(response)
             
-            return {
-                "content": content,
-                "reasoning": reasoning,
-                "usage": response.usage.__dict__ if response.usage else {},
-                "model": response.model
-            }
+        except Exception as e:
+            logger.error(f"OpenAI SDK NIM call failed: {e}")
+            raise
+    
+    async def _call_nim_api_openai_async(self, client: AsyncOpenAI, prompt: str) -> Dict[str, Any]:
+        """Call NIM API using an asynchronous OpenAI SDK client."""
+        try:
+            response = await client.chat.completions.create(
+                **self._openai_request_params(prompt)
+            )
+            return self._openai_result(response)
             
         except Exception as e:
             logger.error(f"OpenAI SDK NIM call failed: {e}")
@@ -210,29 +374,9 @@ Be thorough in understanding context, slang, and modern communication patterns.
     def _call_nim_api(self, prompt: str) -> Dict[str, Any]:
         """Call NIM API using direct HTTP requests."""
         try:
-            headers = {
-                "Authorization": f"Bearer {self.api_key}",
-                "Content-Type": "application/json"
-            }
-            
-            payload = {
-                "model": self.model,
-                "messages": [
-                    {"role": "system", "content": "You are an expert in emotional abuse detection."},
-                    {"role": "user", "content": prompt}
-                ],
-                "temperature": 0.1,
-                "max_tokens": 2000
-            }
-            
-            # Add reasoning parameters if configured
-            if self.reasoning_min > 0 or self.reasoning_max > 0:
-                # Note: reasoning tokens are not supported in standard OpenAI SDK
-                # These parameters are specific to Nemotron-3 and may need custom handling
-                pass
-            
+            url, headers, payload = self._http_request(prompt)
             response = requests.post(
-                f"{self.base_url}/chat/completions",
+                url,
                 headers=headers,
                 json=payload,
                 timeout=self.timeout
@@ -248,6 +392,22 @@ Be thorough in understanding context, slang, and modern communication patterns.
             logger.error(f"Unexpected NIM call error: {e}")
             raise
     
+    async def _call_nim_api_async(self, client: httpx.AsyncClient, prompt: str) -> Dict[str, Any]:
+        """Call NIM API using asynchronous HTTP requests."""
+        try:
+            url, headers, payload = self._http_request(prompt)
+            response = await client.post(url, headers=headers, json=payload)
+            
+            response.raise_for_status()
+            return response.json()
+            
+        except httpx.HTTPError as e:
+            logger.error(f"HTTP NIM call failed: {e}")
+            raise
+        except Exception as e:
+            logger.error(f"Unexpected NIM call error: {e}")
+            raise
+    
     def _parse_response(self, response: Dict[str, Any]) -> Dict[str, Any]:
         """Parse and extract analysis from NIM response."""
         try:
@@ -24,6 +24,7 @@ class Settings(BaseSettings):
     nim_use_openai_sdk: bool = True
     nim_reasoning_min: int = 1024
     nim_reasoning_max: int = 2048
+    nim_max_connections: int = 256  # Concurrent connections of the async NIM client
     
     # Twilio Configuration
     twilio_account_sid: Optional[str] = None
@@ -33,6 +34,27 @@ class Settings(BaseSettings):
     allow_persist: bool = False
     max_conversation_length: int = 10000
     analysis_timeout: int = 30
+    analysis_cache_size: int = 0  # Analysis responses kept for texts seen again (LRU), 0 disables the cache
+    analysis_cache_ttl: float = 3600.0  # Seconds a cached analysis response is served, 0 for no limit
+    
+    # Pattern Knowledge
+    pattern_matcher: str = "regex"  # "regex" (legacy substring matching), "token" (whole words) or "mapped" (token over a shared mmap file)
+    text_normalization: bool = True  # Fold quotes, elongation and slang before matching
+    slang_dictionary_path: Optional[str] = None  # Extra slang expansions (JSON object)
+    fuzzy_categories: str = ""  # Comma-separated categories that also match one-letter typos
+    pattern_profiling: bool = False  # Per-indicator hit and cost counters, shown by /admin/patterns
+    pattern_prefilter: bool = True  # Skip scanning short messages no indicator can match, hit rate shown by /admin/patterns
+    pattern_automaton_dir: Optional[str] = None  # Automaton files of the "mapped" matcher, a temp dir if unset
+    pattern_cache: bool = True  # Load compiled engines from disk when patterns and code are unchanged
+    pattern_cache_dir: Optional[str] = None  # Compiled engine cache, private to the user; ~/.cache/silent_signal/engines if unset
+    pattern_language_packs: int = 4  # pattern_knowledge.<lang>.json packs kept compiled at once, 0 disables them
+    tenant_overlays_path: Optional[str] = None  # Per-tenant indicator additions, suppressions and severities (JSON)
+    whatsapp_triage: bool = False  # Opt-in: stop WhatsApp analyses once the risk level is final; faster, but partial and without AI analysis
+    detection_workers: int = 1  # Forked processes for very long transcripts, 1 scans serially
+    regex_time_budget_ms: float = 0.0  # Regex indicator search time per message, 0 for no limit; a limit trades hits on a loaded host for latency
+    conversation_index_size: int = 256  # Threads whose per-message hits are kept for re-submissions, 0 disables
+    pattern_reload_interval: float = 0.0  # Seconds between knowledge file checks, 0 disables
+    admin_token: Optional[str] = None  # Required by admin endpoints, which are disabled without it
     
     # Email Configuration
     email_alerts: bool = False
@@ -41,6 +41,43 @@ def test_imports():
         print(f"❌ Import failed: {e}")
         return False
 
+def test_engine_equivalence():
+    """Test that every engine differs from the original re.search loop only as allowed."""
+    print("\nTesting engine equivalence...")
+    
+    import tempfile
+    from benchmarks.differential_benchmark import (
+        check, engine_analyze, generate_conversations, legacy_analyze
+    )
+    from silent_signal.backend.core.pattern_detector import PatternDetector, MATCHERS
+    
+    knowledge_path = "silent_signal/data/pattern_knowledge.json"
+    reference = PatternDetector(knowledge_path, normalize_text=False)
+    patterns = reference.patterns
+    weights = reference.severity_weights
+    conversations = generate_conversations(patterns, 150, seed=11)
+    legacy = [legacy_analyze(patterns, weights, conversation) for conversation in conversations]
+    
+    with tempfile.TemporaryDirectory() as automaton_dir:
+        for matcher in MATCHERS:
+            for normalize in (False, True):
+                detector = PatternDetector(knowledge_path, normalize_text=normalize, matcher=matcher,
+                                           automaton_dir=automaton_dir)
+                changed = 0
+                for conversation, original in zip(conversations, legacy):
+                    text_lower = conversation.lower()
+                    normalized = detector.normalizer.normalize(text_lower).text if normalize else None
+                    reasons, unexplained = check(engine_analyze(detector, conversation), original,
+                                                 patterns, weights, text_lower, normalized, matcher)
+                    assert not unexplained, f"{matcher} differs on {conversation!r}: {unexplained}"
+                    changed += bool(reasons)
+                if matcher == "regex" and not normalize:
+                    assert not changed, "Default engine differs from the re.search loop"
+                print(f"✅ {matcher}{' + normalizer' if normalize else ''}: "
+                      f"{changed} conversations differ, all as allowed")
+    
+    return True
+
 def test_data_files():
     """Test that data files exist."""
     print("\nTesting data files...")
@@ -106,6 +143,813 @@ def test_configuration():
         print(f"❌ Configuration failed: {e}")
         return False
 
+def test_text_normalization():
+    """Test that elongated words collapse to their spelling."""
+    print("\nTesting text normalization...")
+    
+    from silent_signal.backend.core.pattern_detector import PatternDetector
+    from silent_signal.backend.core.text_normalizer import TextNormalizer
+    
+    normalizer = TextNormalizer(vocabulary={"kill", "sorry", "stop"})
+    cases = {
+        "killlll you": "kill you",
+        "sorrrry": "sorry",
+        "stoppppp": "stop",
+        "alllll": "all",
+        "sooooorrrrry": "sorry"
+    }
+    failures = []
+    for text, expected in cases.items():
+        normalized = normalizer.normalize(text).text
+        if normalized == expected:
+            print(f"✅ {text!r} -> {normalized!r}")
+        else:
+            print(f"❌ {text!r} -> {normalized!r}, expected {expected!r}")
+            failures.append(text)
+    assert not failures, f"Wrong normalization of {failures}"
+    assert normalizer.normalize("prove ur love").text == "prove ur love", "Ambiguous slang expanded"
+    
+    detector = PatternDetector("silent_signal/data/pattern_knowledge.json")
+    patterns, _ = detector.analyze_text("Leave and you'll be sorrrry")
+    assert patterns, "Elongated threat not detected"
+    print(f"✅ Elongated threat detected: {[pattern.name for pattern in patterns]}")
+    
+    return True
+
+def test_result_cache_privacy():
+    """Test that a cached analysis never returns text of an earlier submission."""
+    print("\nTesting result cache privacy...")
+    
+    from silent_signal.config.settings import settings
+    from silent_signal.backend.core.mcp_orchestrator import MCPOrchestrator
+    
+    cache_size = settings.analysis_cache_size
+    settings.analysis_cache_size = 8
+    try:
+        orchestrator = MCPOrchestrator("silent_signal/data/pattern_knowledge.json")
+    finally:
+        settings.analysis_cache_size = cache_size
+    nimo_client = orchestrator.nimo_client
+    
+    def analyze_conversation(context):
+        # Offline stand-in for NIM that quotes the conversation it was sent
+        # in every text field
+        quote = context["conversation"][:40]
+        response = nimo_client._get_fallback_response("test")
+        response.update(risk_level="concerning", confidence=0.7, analysis_metadata={
+            "model_used": nimo_client.model
+        }, reasoning=f"The sender says {quote}", emotional_impact=f"Hurtful: {quote}",
+            recommendations=[f"Do not reply to {quote}"])
+        if "Jordan" in context["conversation"]:
+            response["red_flags"] = [{
+                "type": "gaslighting",
+                "severity": "high",
+                "description": f"Denies shared events: {quote}",
+                "explanation": f"Saying {quote} makes the recipient doubt themselves",
+                "evidence": quote
+            }, {
+                "type": f"dismissal ({quote})",
+                "severity": quote,
+                "description": quote,
+                "evidence": quote
+            }]
+        return response
+    nimo_client.analyze_conversation = analyze_conversation
+    
+    for speaker in ("Alex", "Jordan"):
+        first = f"{speaker}: You're crazy. That never happened. You're imagining things."
+        again = f"  {first.upper()}\n"
+        orchestrator.analyze_conversation(first)
+        response = orchestrator.analyze_conversation(again)
+        
+        assert response.analysis_details.get("cache", {}).get("hit"), f"{speaker}: resubmission missed the cache"
+        dumped = response.model_dump_json()
+        assert speaker not in dumped and "You're" not in dumped, f"{speaker}: cached response quotes the first submission"
+        for pattern in response.patterns_detected:
+            for span in pattern.spans or []:
+                assert again.strip()[span.start:span.end].lower() == span.indicator, f"{speaker}: span off the resubmission"
+            if pattern.name in orchestrator.pattern_detector.patterns:
+                assert pattern.description == orchestrator.pattern_detector.patterns[pattern.name]["description"]
+        print(f"✅ {speaker}: cache hit quotes only the resubmitted text")
+    
+    return True
+
+def test_tenant_overlays():
+    """Test that tenant overlays apply to their own tenant only."""
+    print("\nTesting tenant overlays...")
+    
+    import json
+    import tempfile
+    from silent_signal.config.settings import settings
+    from silent_signal.backend.core.mcp_orchestrator import MCPOrchestrator
+    
+    overlays = {
+        "acme": {"patterns": {
+            "gaslighting": {"severity": "critical", "patterns": ["purple monkey dishwasher"]},
+            "wire_fraud": {"severity": "high", "patterns": ["wire me the money"]}
+        }},
+        "globex": {"suppress": ["that never happened"]}
+    }
+    with tempfile.TemporaryDirectory() as directory:
+        overlays_path = os.path.join(directory, "tenants.json")
+        with open(overlays_path, "w", encoding="utf-8") as f:
+            json.dump(overlays, f)
+        
+        overlays_setting = settings.tenant_overlays_path
+        settings.tenant_overlays_path = overlays_path
+        try:
+            orchestrator = MCPOrchestrator("silent_signal/data/pattern_knowledge.json")
+        finally:
+            settings.tenant_overlays_path = overlays_setting
+    detector = orchestrator.pattern_detector
+    
+    def detected(text, tenant_id=None):
+        patterns, _ = detector.analyze_text(text, detector.engine_for(text, tenant_id))
+        return {pattern.name: pattern.severity for pattern in patterns}
+    
+    assert detected("That never happened.") == {"gaslighting": "high"}, "Base detection changed"
+    assert detected("That never happened.", "acme") == {"gaslighting": "critical"}, "Severity not overridden"
+    assert "gaslighting" in detected("Purple monkey dishwasher", "acme"), "Added indicator not matched"
+    assert detected("Wire me the money", "acme") == {"wire_fraud": "high"}, "Added category not matched"
+    assert detected("That never happened.", "globex") == {}, "Suppressed indicator matched"
+    print("✅ Overlays add indicators and categories, change severity and suppress")
+    
+    for tenant_id in (None, "globex"):
+        assert not detected("Purple monkey dishwasher. Wire me the money", tenant_id), \
+            f"{tenant_id}: matched another tenant's indicators"
+    assert detected("That never happened.") == {"gaslighting": "high"}, "Overlay leaked into the shared engine"
+    print("✅ Other tenants and the shared engine are unaffected")
+    
+    nimo_client = orchestrator.nimo_client
+    nimo_client.analyze_conversation = lambda context: nimo_client._get_fallback_response("offline")
+    response = orchestrator.analyze_conversation("That never happened.", tenant_id="acme")
+    dumped = response.model_dump_json()
+    assert "globex" not in dumped and "acme" not in dumped, "Analysis names configured tenants"
+    assert detector.get_detector_statistics()["tenant_overlays"]["configured"] == ["acme", "globex"]
+    print("✅ Tenants are listed for administrators only")
+    
+    return True
+
+def test_language_packs():
+    """Test that a language pack adds to the English indicators rather than replacing them."""
+    print("\nTesting language packs...")
+    
+    from silent_signal.backend.core.pattern_detector import PatternDetector
+    
+    detector = PatternDetector("silent_signal/data/pattern_knowledge.json", language_packs=4)
+    chat = ("Alex: eso nunca pasó, te lo estás imaginando\n"
+            "Alex: If you leave, I'll hurt myself. That never happened.")
+    assert detector.language_detector.detect(chat) == "es", "Mixed chat not detected as Spanish"
+    
+    engine = detector.engine_for(chat)
+    assert engine is not detector.engine, "Spanish pack not used"
+    for category, size in detector.engine.registry.category_sizes.items():
+        assert engine.registry.category_sizes[category] >= size, f"{category}: pack dropped English indicators"
+    
+    patterns, _ = detector.analyze_text(chat)
+    detected = {pattern.name: {span.indicator for span in pattern.spans} for pattern in patterns}
+    assert {"eso nunca pasó", "that never happened"} <= detected.get("gaslighting", set()), \
+        f"Gaslighting not matched in both languages: {detected}"
+    assert "i'll hurt myself" in detected.get("threats", set()), f"English threat missed: {detected}"
+    print(f"✅ Mixed English/Spanish chat matched in both languages: {sorted(detected)}")
+    
+    return True
+
+def test_triage():
+    """Test that triage reaches the risk level of the full analysis."""
+    print("\nTesting triage...")
+    
+    import json
+    from silent_signal.backend.core.pattern_detector import PatternDetector
+    from silent_signal.backend.core.pattern_engine import is_literal
+    
+    # One indicator of every category reaches the highest risk level
+    with open("silent_signal/data/pattern_knowledge.json", encoding="utf-8") as f:
+        knowledge = json.load(f)
+    abusive = "".join(
+        f"Alex: {next(p for p in config['patterns'] if is_literal(p))}.\n" for config in knowledge.values()
+    )
+    texts = [
+        "Sam: See you at dinner, love you",
+        "Alex: That never happened.",
+        abusive,
+        "Sam: ok see you later\n" * 200 + abusive,
+        abusive * 50 + "Sam: ok see you later\n" * 200
+    ]
+    for matcher in ("regex", "token"):
+        detector = PatternDetector("silent_signal/data/pattern_knowledge.json", matcher=matcher)
+        detector.triage_chunk = 256
+        partial = 0
+        for text in texts:
+            patterns, score = detector.analyze_text(text)
+            triage = detector.triage_text(text)
+            assert triage.risk_level == detector.get_risk_level(score, len(patterns)), \
+                f"{matcher}: triage rated {triage.risk_level} a {len(text)} character text"
+            if triage.partial:
+                partial += 1
+            else:
+                assert (triage.patterns, triage.score) == (patterns, score), \
+                    f"{matcher}: complete triage differs from the full analysis"
+        assert partial, f"{matcher}: triage never stopped early"
+        print(f"✅ {matcher}: triage risk levels match the full analysis ({partial} stopped early)")
+    
+    return True
+
+def test_reload():
+    """Test that a reload swaps the engine, normalizer and prefilter together."""
+    print("\nTesting knowledge reload...")
+    
+    import json
+    import tempfile
+    import threading
+    from silent_signal.backend.core.pattern_detector import PatternDetector
+    
+    with open("silent_signal/data/pattern_knowledge.json", encoding="utf-8") as f:
+        knowledge = json.load(f)
+    extended = json.loads(json.dumps(knowledge))
+    extended["threats"]["patterns"].append("zap you")
+    
+    with tempfile.TemporaryDirectory() as directory:
+        knowledge_path = os.path.join(directory, "pattern_knowledge.json")
+        
+        def write(content):
+            with open(knowledge_path, "w", encoding="utf-8") as f:
+                json.dump(content, f)
+        
+        write(knowledge)
+        detector = PatternDetector(knowledge_path)
+        before = detector.state
+        assert detector.canonical_text("I'll zaaaap you") == "i'll zaap you"
+        assert "threats" not in {p.name for p in detector.analyze_text("I'll zaaaap you")[0]}
+        
+        # The vocabulary of elongated words follows the reloaded indicators
+        write(extended)
+        detector.reload()
+        assert detector.state is not before and before.engine.version != detector.engine.version
+        assert detector.canonical_text("I'll zaaaap you") == "i'll zap you", "Normalizer not rebuilt"
+        assert "threats" in {p.name for p in detector.analyze_text("I'll zaaaap you")[0]}
+        assert before.normalizer.normalize("zaaaap").text == "zaap", "Published state changed"
+        print("✅ Reload rebuilds the normalizer vocabulary")
+        
+        # Readers never see an engine with another version's normalizer or prefilter
+        done = threading.Event()
+        mixed = []
+        
+        def read():
+            while not done.is_set():
+                state = detector.state
+                if state.normalizer.vocabulary != state.engine.words() \
+                        or state.prefilter.version != state.engine.version:
+                    mixed.append(state)
+        
+        reader = threading.Thread(target=read)
+        reader.start()
+        try:
+            for content in [knowledge, extended] * 5:
+                write(content)
+                detector.reload()
+        finally:
+            done.set()
+            reader.join()
+        assert not mixed, f"{len(mixed)} states mixed engine versions"
+        print("✅ Engine, normalizer and prefilter are swapped as one state")
+    
+    return True
+
+def test_engine_cache():
+    """Test that cached engines are reused only while nothing they are built from changed."""
+    print("\nTesting the compiled engine cache...")
+    
+    import json
+    import stat
+    import tempfile
+    import importlib.util
+    from silent_signal.backend.core.pattern_detector import PatternDetector
+    from silent_signal.backend.core.engine_cache import EngineCache
+    
+    with open("silent_signal/data/pattern_knowledge.json", encoding="utf-8") as f:
+        knowledge = json.load(f)
+    
+    with tempfile.TemporaryDirectory() as directory:
+        knowledge_path = os.path.join(directory, "pattern_knowledge.json")
+        cache_dir = os.path.join(directory, "engines")
+        with open(knowledge_path, "w", encoding="utf-8") as f:
+            json.dump(knowledge, f)
+        
+        def entries():
+            # Loading keeps an entry's file, storing replaces it
+            return {name: os.stat(os.path.join(cache_dir, name)).st_ino for name in os.listdir(cache_dir)}
+        
+        version = PatternDetector(knowledge_path, cache=True, cache_dir=cache_dir).engine.version
+        assert stat.S_IMODE(os.stat(cache_dir).st_mode) == 0o700, "Cache directory not private"
+        cached = entries()
+        assert PatternDetector(knowledge_path, cache=True, cache_dir=cache_dir).engine.version == version
+        assert entries() == cached, "Unchanged engine compiled again"
+        print("✅ Unchanged engines are loaded from the cache")
+        
+        knowledge["threats"]["patterns"].append("zap you")
+        with open(knowledge_path, "w", encoding="utf-8") as f:
+            json.dump(knowledge, f)
+        assert PatternDetector(knowledge_path, cache=True, cache_dir=cache_dir).engine.version != version
+        assert len(entries()) > len(cached), "Changed patterns loaded from the cache"
+        
+        module_path = os.path.join(directory, "cache_probe.py")
+        keys = []
+        for source in ("class Probe:\n    pass\n", "class Probe:\n    limit = 1\n"):
+            with open(module_path, "w", encoding="utf-8") as f:
+                f.write(source)
+            spec = importlib.util.spec_from_file_location("cache_probe", module_path)
+            module = importlib.util.module_from_spec(spec)
+            sys.modules["cache_probe"] = module
+            spec.loader.exec_module(module)
+            keys.append(EngineCache.key([module.Probe], {}))
+        del sys.modules["cache_probe"]
+        assert keys[0] != keys[1], "Code change kept the cache key"
+        print("✅ Pattern and code changes miss the cache")
+        
+        if hasattr(os, "getuid"):
+            cache_dir = os.path.join(directory, "shared")
+            PatternDetector(knowledge_path, cache=True, cache_dir=cache_dir)
+            cached = entries()
+            for name in cached:
+                os.chmod(os.path.join(cache_dir, name), 0o666)
+            PatternDetector(knowledge_path, cache=True, cache_dir=cache_dir)
+            replaced = entries()
+            assert all(replaced[name] != inode for name, inode in cached.items()), "World-writable entry loaded"
+            os.chmod(cache_dir, 0o777)
+            assert EngineCache(cache_dir).load(next(iter(replaced)).rsplit(".", 1)[0]) is None, \
+                "World-writable cache directory read"
+            print("✅ Entries others can write to are never loaded")
+    
+    return True
+
+def test_regex_guard():
+    """Test that regex indicators prone to catastrophic backtracking are rewritten or rejected."""
+    print("\nTesting the regex guard...")
+    
+    import re
+    from unittest import mock
+    from silent_signal.backend.core import regex_guard
+    from silent_signal.backend.core.regex_guard import guard_pattern, backtracking_risk, required_literals
+    
+    catastrophic = [r"(?:a|aa)+b", r"(\w+\s?)+$", r"(.*a){12}", r".*.*=.*", r"(x+x+)+y", r"((ab)*)+c"]
+    for pattern in catastrophic:
+        assert guard_pattern(pattern) is None, f"{pattern!r} accepted"
+    print(f"✅ {len(catastrophic)} catastrophic patterns rejected")
+    
+    samples = ["aaaa!", "aaab", "a a!", "!", "xaaa", "aaaaaaaa", "ab aab@", "AAb"]
+    for pattern in [r"(a+)+$", r"(\w+)*!", r"(?i)(a*)*b", r"(?:[a-z]+)+@"]:
+        rewritten = guard_pattern(pattern)
+        assert rewritten not in (None, pattern), f"{pattern!r} not rewritten"
+        assert backtracking_risk(regex_guard.sre_parse.parse(rewritten)) is None, f"{rewritten!r} still risky"
+        for sample in samples:
+            expected = re.search(pattern, sample)
+            found = re.search(rewritten, sample)
+            assert (expected and expected.span()) == (found and found.span()), \
+                f"{rewritten!r} matches {sample!r} unlike {pattern!r}"
+    for pattern in [r"\bnever\b", r"you (always|never) do this", r"(\d{1,3}\.){3}\d{1,3}"]:
+        assert guard_pattern(pattern) == pattern, f"Safe pattern {pattern!r} changed"
+    assert guard_pattern(r"you\'re crazy") == "you're crazy", "Literal regex not turned into a phrase"
+    print("✅ Risky patterns rewritten to equivalent safe ones, safe patterns kept")
+    
+    # Without the private parser modules, regexes cannot be checked and are rejected
+    with mock.patch.object(regex_guard, "sre_parse", None):
+        assert guard_pattern(r"\bnever\b") is None, "Unchecked regex accepted"
+        assert guard_pattern("that never happened") == "that never happened", "Literal rejected"
+        assert required_literals(r"\bsend (me )?money\b") == []
+    print("✅ Regex indicators rejected when the regex parser is unavailable")
+    
+    return True
+
+def test_streaming():
+    """Test that streamed text gets the one-shot result wherever chunks are cut."""
+    print("\nTesting streaming detection...")
+    
+    import json
+    import random
+    import tempfile
+    from silent_signal.backend.core.pattern_detector import PatternDetector, MATCHERS
+    
+    with open("silent_signal/data/pattern_knowledge.json", encoding="utf-8") as f:
+        knowledge = json.load(f)
+    knowledge["threats"]["patterns"].append(r"i will \w+ you")
+    
+    texts = [
+        "Alex: You’re imagining things. That’s not what I said!!",
+        "Alex: you're crazy and you're making that up",
+        "Sam: youre crazyyyy, that neverrrr happened\nAlex: I WILL find you",
+        "Jordan: u r so dramatic... you'll regret this, i'm done",
+        "Taylor: if you loved me you would, after everything i've done for you"
+    ]
+    rng = random.Random(5)
+    with tempfile.TemporaryDirectory() as directory:
+        knowledge_path = os.path.join(directory, "pattern_knowledge.json")
+        with open(knowledge_path, "w", encoding="utf-8") as f:
+            json.dump(knowledge, f)
+        
+        for matcher in MATCHERS:
+            for normalize in (False, True):
+                detector = PatternDetector(knowledge_path, matcher=matcher, normalize_text=normalize,
+                                           automaton_dir=directory)
+                for text in texts:
+                    patterns, score = detector.analyze_text(text)
+                    expected = ([(p.name, p.severity, p.confidence) for p in patterns], score)
+                    
+                    # Every single cut, then random multi-chunk splits and single characters
+                    splits = [[text[:cut], text[cut:]] for cut in range(len(text) + 1)]
+                    for _ in range(20):
+                        cuts = sorted(rng.sample(range(len(text)), rng.randint(2, 12)))
+                        splits.append([text[a:b] for a, b in zip([0] + cuts, cuts + [len(text)])])
+                    splits.append(list(text))
+                    
+                    for chunks in splits:
+                        patterns, score = detector.analyze_stream(iter(chunks))
+                        assert ([(p.name, p.severity, p.confidence) for p in patterns], score) == expected, \
+                            f"{matcher}: stream of {chunks!r} differs from one-shot"
+                print(f"✅ {matcher}{' + normalizer' if normalize else ''}: streams match one-shot results")
+    
+    return True
+
+def test_evidence_spans():
+    """Test that evidence spans point at the hits in the original text."""
+    print("\nTesting evidence spans...")
+    
+    import re
+    import tempfile
+    from silent_signal.backend.core.pattern_detector import PatternDetector, MATCHERS
+    from silent_signal.backend.core.pattern_engine import is_literal
+    from silent_signal.backend.core.token_engine import APOSTROPHE_SLANG, tokenize
+    
+    conversation = "\n".join([
+        "Alex: You’re CRAZY. That neverrrr happened!",
+        "Sam: what?",
+        "Alex: youre imagining things... after everything i've done for you",
+        "no label here, you're confused",
+        "Jordan: I will make you pay"
+    ])
+    
+    with tempfile.TemporaryDirectory() as automaton_dir:
+        for matcher in MATCHERS:
+            for normalize in (False, True):
+                detector = PatternDetector("silent_signal/data/pattern_knowledge.json", matcher=matcher,
+                                           normalize_text=normalize, automaton_dir=automaton_dir)
+                patterns, _ = detector.analyze_text(conversation)
+                spans = [span for pattern in patterns for span in pattern.spans]
+                assert spans, f"{matcher}: no evidence"
+                for span in spans:
+                    quoted = conversation[span.start:span.end]
+                    seen = detector.canonical_text(quoted)
+                    if not is_literal(span.indicator):
+                        assert re.fullmatch(span.indicator, seen, re.IGNORECASE), f"{matcher}: {quoted!r}"
+                    elif matcher == "regex":
+                        assert seen == span.indicator, f"{matcher}: {quoted!r} is not {span.indicator!r}"
+                    else:
+                        words = [APOSTROPHE_SLANG.get(word, word) for word in tokenize(seen)]
+                        assert words == tokenize(span.indicator), f"{matcher}: {quoted!r} is not {span.indicator!r}"
+                    
+                    line = conversation[:span.start].count("\n")
+                    label = conversation.split("\n")[line].split(":", 1)[0]
+                    assert span.line == line + 1, f"{matcher}: {quoted!r} not on line {span.line}"
+                    assert span.speaker == (label if label in ("Alex", "Sam", "Jordan") else None), \
+                        f"{matcher}: {quoted!r} attributed to {span.speaker}"
+                for pattern in patterns:
+                    for quote in re.findall(r'"([^"]*)"', pattern.evidence or ""):
+                        assert quote in conversation, f"{matcher}: evidence {quote!r} not in the text"
+                print(f"✅ {matcher}{' + normalizer' if normalize else ''}: {len(spans)} spans point at their hits")
+    
+    return True
+
+def test_indicator_dedup():
+    """Test that shared phrases are matched once and counted once per category."""
+    print("\nTesting indicator deduplication...")
+    
+    import json
+    import tempfile
+    from silent_signal.backend.core.pattern_detector import PatternDetector, MATCHERS
+    
+    # Categories of their own, since the file is merged over the built-in knowledge
+    knowledge = {
+        "test_denial": {
+            "patterns": ["you're crazy", "You're crazy", "you're crazy", "that never happened"],
+            "severity": "high",
+            "description": "Reality denial"
+        },
+        "test_leverage": {
+            "patterns": ["you're crazy", "nobody else would love you", "you owe me"],
+            "severity": "medium",
+            "description": "Emotional leverage"
+        }
+    }
+    
+    with tempfile.TemporaryDirectory() as directory:
+        knowledge_path = os.path.join(directory, "pattern_knowledge.json")
+        with open(knowledge_path, "w", encoding="utf-8") as f:
+            json.dump(knowledge, f)
+        
+        for matcher in MATCHERS:
+            detector = PatternDetector(knowledge_path, matcher=matcher, automaton_dir=directory)
+            registry = detector.engine.registry
+            assert registry.category_sizes["test_denial"] == 2, f"{matcher}: {registry.category_sizes}"
+            assert registry.category_sizes["test_leverage"] == 3, f"{matcher}: {registry.category_sizes}"
+            shared = [i for i, key in enumerate(registry.indicators) if key == "you're crazy"]
+            assert len(shared) == 1, f"{matcher}: shared phrase registered {len(shared)} times"
+            assert {"test_denial", "test_leverage"} <= set(registry.indicator_categories[shared[0]])
+            
+            # One hit of the shared phrase fans out to both categories, counted once in each
+            patterns, _ = detector.analyze_text("Alex: you're crazy. you're crazy!")
+            confidences = {p.name: p.confidence for p in patterns if p.name.startswith("test_")}
+            assert confidences == {"test_denial": 1 / 2, "test_leverage": 1 / 3}, f"{matcher}: {confidences}"
+            
+            patterns, _ = detector.analyze_text("you're crazy, that never happened")
+            confidences = {p.name: p.confidence for p in patterns if p.name.startswith("test_")}
+            assert confidences == {"test_denial": 1.0, "test_leverage": 1 / 3}, f"{matcher}: {confidences}"
+            print(f"✅ {matcher}: shared phrases counted once, denominators use unique indicators")
+    
+    return True
+
+def test_fuzzy_categories():
+    """Test that typos only match in fuzzy categories, and count for less."""
+    print("\nTesting fuzzy categories...")
+    
+    import json
+    import tempfile
+    from silent_signal.backend.core.pattern_detector import PatternDetector, MATCHERS
+    
+    knowledge = {
+        "test_denial": {
+            "patterns": ["you're imagining things", "that never happened"],
+            "severity": "high",
+            "description": "Reality denial"
+        },
+        "test_exact": {
+            "patterns": ["you're imagining things", "you owe me"],
+            "severity": "high",
+            "description": "Exact wording only"
+        }
+    }
+    typo = "Alex: you're imagineing things"
+    
+    with tempfile.TemporaryDirectory() as directory:
+        knowledge_path = os.path.join(directory, "pattern_knowledge.json")
+        with open(knowledge_path, "w", encoding="utf-8") as f:
+            json.dump(knowledge, f)
+        
+        for matcher in MATCHERS:
+            detector = PatternDetector(knowledge_path, matcher=matcher, automaton_dir=directory,
+                                       fuzzy_categories=["test_denial"])
+            engine = detector.engine
+            
+            patterns, _ = detector.analyze_text("Alex: you're imagining things")
+            confidences = {p.name: p.confidence for p in patterns if p.name.startswith("test_")}
+            assert confidences == {"test_denial": 1 / 2, "test_exact": 1 / 2}, f"{matcher}: {confidences}"
+            
+            patterns, _ = detector.analyze_text(typo)
+            found = {p.name: p for p in patterns if p.name.startswith("test_")}
+            assert "test_exact" not in found, f"{matcher}: typo matched a category without fuzzy matching"
+            if matcher != "token":
+                assert not found, f"{matcher}: typo matched without fuzzy support"
+                continue
+            
+            pattern = found["test_denial"]
+            expected = (1 - engine.fuzzy_penalty) / 2
+            assert abs(pattern.confidence - expected) < 1e-9, f"{matcher}: confidence {pattern.confidence}"
+            assert [span.edit_distance for span in pattern.spans] == [1], f"{matcher}: {pattern.spans}"
+            span = pattern.spans[0]
+            assert typo[span.start:span.end] == "you're imagineing things", f"{matcher}: {span}"
+            
+            # A typo never costs more than the exact phrase is worth
+            patterns, _ = detector.analyze_text(typo + ", you're imagining things")
+            confidences = {p.name: p.confidence for p in patterns if p.name.startswith("test_")}
+            assert confidences == {"test_denial": 1 / 2, "test_exact": 1 / 2}, f"{matcher}: {confidences}"
+        print("✅ Typos match only in fuzzy categories, with the edit-distance penalty")
+    
+    return True
+
+def test_parallel_analysis():
+    """Test that worker processes give the serial results."""
+    print("\nTesting parallel analysis...")
+    
+    import glob
+    import random
+    import tempfile
+    import numpy as np
+    from silent_signal.backend.core.pattern_detector import PatternDetector, MATCHERS
+    
+    examples = []
+    for path in sorted(glob.glob("silent_signal/data/examples/*.txt")):
+        with open(path, encoding="utf-8") as f:
+            examples.append(f.read())
+    examples.append("Alex: you're imagineing things. I'll mkae you pay\nSam: fine, whatever. perfectly amazing of course")
+    rng = random.Random(3)
+    transcript = "\n".join(rng.choice(examples) for _ in range(300))
+    texts = [rng.choice(examples) for _ in range(600)] + ["", "  "]
+    
+    with tempfile.TemporaryDirectory() as automaton_dir:
+        for matcher in MATCHERS:
+            for normalize in (False, True):
+                detector = PatternDetector("silent_signal/data/pattern_knowledge.json", matcher=matcher,
+                                           normalize_text=normalize, fuzzy_categories=["gaslighting"],
+                                           automaton_dir=automaton_dir)
+                detector.parallel_min_chunk = 1000
+                detector.parallel_min_batch = 16
+                label = f"{matcher}{' + normalizer' if normalize else ''}"
+                assert len(detector._chunk_bounds(detector.engine, transcript.lower(), 7)) > 1, \
+                    f"{label}: transcript not split"
+                
+                # Long transcripts are cut into chunks; hits on the cuts must not be lost or doubled
+                assert detector.analyze_text(transcript, workers=7) == detector.analyze_text(transcript), \
+                    f"{label}: parallel transcript differs from serial"
+                
+                serial = detector.analyze_texts(texts)
+                parallel = detector.analyze_texts(texts, workers=4)
+                for field in ("hit_counts", "confidence", "scores", "pattern_counts", "risk_levels"):
+                    assert np.array_equal(getattr(parallel, field), getattr(serial, field)), \
+                        f"{label}: parallel batch {field} differs from serial"
+                print(f"✅ {label}: parallel transcript and batch match serial results")
+    
+    return True
+
+def test_conversation_index():
+    """Test that re-submitted conversations get the one-shot result."""
+    print("\nTesting conversation index...")
+    
+    import glob
+    import random
+    import tempfile
+    from silent_signal.backend.core.pattern_detector import PatternDetector, MATCHERS
+    
+    lines = []
+    for path in sorted(glob.glob("silent_signal/data/examples/*.txt")):
+        with open(path, encoding="utf-8") as f:
+            lines += [line for line in f.read().split("\n") if line.strip()]
+    lines += ["Alex: you're imagineing things", "Sam: you always do this, that never",
+              "happened", "Alex: if you really\nloved me you would", "Sam: I WILL"]
+    rng = random.Random(1)
+    
+    with tempfile.TemporaryDirectory() as automaton_dir:
+        for matcher in MATCHERS:
+            for normalize in (False, True):
+                detector = PatternDetector("silent_signal/data/pattern_knowledge.json", matcher=matcher,
+                                           normalize_text=normalize, fuzzy_categories=["gaslighting"],
+                                           automaton_dir=automaton_dir, index_size=8)
+                label = f"{matcher}{' + normalizer' if normalize else ''}"
+                for _ in range(10):
+                    conversation = []
+                    for _ in range(8):
+                        # Grow the thread; sometimes edit an earlier message instead
+                        if conversation and rng.random() < 0.2:
+                            conversation[rng.randrange(len(conversation))] = rng.choice(lines)
+                        conversation += rng.sample(lines, rng.randint(1, 4))
+                        text = "\n".join(conversation) + ("\n" if rng.random() < 0.3 else "")
+                        assert detector.analyze_conversation(text) == detector.analyze_text(text), \
+                            f"{label}: indexed analysis of {text!r} differs from one-shot"
+                assert len(detector.conversation_indexes), f"{label}: nothing indexed"
+                print(f"✅ {label}: growing threads match one-shot analysis")
+    
+    return True
+
+def test_prefilter():
+    """Test that the prefilter never skips text that has hits."""
+    print("\nTesting prefilter...")
+    
+    import dataclasses
+    import json
+    import random
+    import tempfile
+    from silent_signal.backend.core.pattern_detector import PatternDetector, MATCHERS
+    from silent_signal.backend.core.text_normalizer import DEFAULT_SLANG
+    
+    with open("silent_signal/data/pattern_knowledge.json", encoding="utf-8") as f:
+        knowledge = json.load(f)
+    knowledge["test_money"] = {
+        "patterns": [r"\bsend (me )?money\b", r"(?:wire|pay)\s+\d+ dollars", r"you\s+(?:always|never)\s+lie"],
+        "severity": "low",
+        "description": "Money demands"
+    }
+    rng = random.Random(7)
+    words = ("hey ok lol dinner tonight home movie late sorry the a to is it we see you at 7 maybe "
+             "sure thanks love money send pay wire dollars always never lie").split()
+    slang = list(DEFAULT_SLANG) + list(DEFAULT_SLANG.values())
+    
+    def mutate(phrase):
+        # A typo, a Unicode quote or an elongated letter
+        chars = list(phrase)
+        i = rng.randrange(len(chars))
+        edit = rng.randrange(5)
+        if edit == 0:
+            chars[i] = rng.choice("abcdeilmnorstuy")
+        elif edit == 1:
+            del chars[i]
+        elif edit == 2 and i + 1 < len(chars):
+            chars[i], chars[i + 1] = chars[i + 1], chars[i]
+        elif edit == 3:
+            chars.insert(i, rng.choice("'’‘ʼ`´"))
+        else:
+            chars[i] *= rng.randrange(3, 6)
+        return "".join(chars)
+    
+    def message(phrases):
+        parts = []
+        for _ in range(rng.randrange(1, 9)):
+            draw = rng.random()
+            if draw < 0.25:
+                part = rng.choice(phrases)
+                for _ in range(rng.randrange(3)):
+                    part = mutate(part)
+            elif draw < 0.45:
+                part = rng.choice(slang)
+            else:
+                part = rng.choice(words)
+            parts.append(part)
+        text = " ".join(parts)
+        return text.upper() if rng.random() < 0.3 else text
+    
+    with tempfile.TemporaryDirectory() as directory:
+        knowledge_path = os.path.join(directory, "pattern_knowledge.json")
+        with open(knowledge_path, "w", encoding="utf-8") as f:
+            json.dump(knowledge, f)
+        
+        for matcher in MATCHERS:
+            for normalize in (False, True):
+                detector = PatternDetector(knowledge_path, matcher=matcher, normalize_text=normalize,
+                                           fuzzy_categories=list(knowledge), automaton_dir=directory)
+                label = f"{matcher}{' + normalizer' if normalize else ''}"
+                assert detector.prefilter is not None, f"{label}: no prefilter"
+                unfiltered = dataclasses.replace(detector.state, prefilter=None)
+                phrases = list(detector.engine.phrase_ids) + ["send money", "pay 20 dollars", "you always lie"]
+                
+                rejected = 0
+                for _ in range(2000):
+                    text = message(phrases)
+                    if detector.prefilter.may_match(text.lower()):
+                        continue
+                    rejected += 1
+                    filtered_state = detector.state
+                    detector.state = unfiltered
+                    try:
+                        patterns, _ = detector.analyze_text(text)
+                    finally:
+                        detector.state = filtered_state
+                    assert not patterns, f"{label}: prefilter skipped {text!r} with {[p.name for p in patterns]}"
+                assert rejected, f"{label}: prefilter rejected nothing"
+                print(f"✅ {label}: {rejected} texts skipped by the prefilter, none with hits")
+    
+    return True
+
+def test_workflow_isolation():
+    """Test that concurrent analyses keep their own workflow state."""
+    print("\nTesting concurrent workflow isolation...")
+    
+    import asyncio
+    import time
+    from concurrent.futures import ThreadPoolExecutor
+    from silent_signal.backend.core.mcp_orchestrator import MCPOrchestrator
+    
+    orchestrator = MCPOrchestrator("silent_signal/data/pattern_knowledge.json")
+    nimo_client = orchestrator.nimo_client
+    
+    # Offline NIM whose red flag quotes the conversation it was given
+    def analyze(context):
+        time.sleep(0.01)
+        response = nimo_client._get_fallback_response("offline")
+        response["red_flags"] = [{"type": "echo", "severity": "low", "evidence": context["conversation"]}]
+        return response
+    
+    async def analyze_async(context):
+        await asyncio.sleep(0.01)
+        return analyze(context)
+    
+    nimo_client.analyze_conversation = analyze
+    nimo_client.analyze_conversation_async = analyze_async
+    
+    texts = [f"Alex: That never happened, message {i}" if i % 2 else f"Sam: see you at {i}, love you"
+             for i in range(16)]
+    
+    def outcome(response):
+        steps = response.analysis_details["workflow_steps"]
+        assert [step["status"] for step in steps] == ["completed"] * 5 + ["running"], \
+            f"Workflow steps of another analysis: {steps}"
+        return (response.risk_level, response.risk_score,
+                [(pattern.name, pattern.evidence) for pattern in response.patterns_detected])
+    
+    serial = [outcome(orchestrator.analyze_conversation(text)) for text in texts]
+    assert all(evidence == [("echo", text)] for text, (_, _, evidence) in zip(texts, serial))
+    
+    with ThreadPoolExecutor(8) as executor:
+        threaded = [outcome(response) for response in executor.map(orchestrator.analyze_conversation, texts)]
+    assert threaded == serial, "Threaded analyses differ from serial ones"
+    print("✅ Threaded analyses match serial ones")
+    
+    async def gather():
+        return await asyncio.gather(*map(orchestrator.analyze_conversation_async, texts))
+    
+    assert [outcome(response) for response in asyncio.run(gather())] == serial, \
+        "Asynchronous analyses differ from serial ones"
+    assert not orchestrator._active_workflows, "Finished workflows still active"
+    print("✅ Asynchronous analyses match serial ones")
+    
+    return True
+
 def main():
     """Run all tests."""
     print("🧪 Testing SilentSignal New Structure")
@@ -115,15 +959,35 @@ def main():
         test_imports,
         test_data_files,
         test_configuration,
-        test_pattern_detection
+        test_pattern_detection,
+        test_engine_equivalence,
+        test_text_normalization,
+        test_streaming,
+        test_evidence_spans,
+        test_indicator_dedup,
+        test_fuzzy_categories,
+        test_parallel_analysis,
+        test_conversation_index,
+        test_prefilter,
+        test_result_cache_privacy,
+        test_tenant_overlays,
+        test_language_packs,
+        test_triage,
+        test_reload,
+        test_engine_cache,
+        test_regex_guard,
+        test_workflow_isolation
     ]
     
     passed = 0
     total = len(tests)
     
     for test in tests:
-        if test():
-            passed += 1
+        try:
+            if test():
+                passed += 1
+        except AssertionError as e:
+            print(f"❌ {e}")
         print()
     
     print("=" * 50)